@@ -0,0 +1,245 @@
+"""Page Archive - Packed single-file output with an offset index and mmap reader"""
+import gzip
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Tuple
+from agents.interning import deduplicate, resolve, shared_table
+from agents.output_writer import make_serializer
+from agents.records import json_default
+
+try:
+    import zstandard
+except ImportError:  # optional dependency; gzip and uncompressed always work
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Layout: header | records (u32 length + payload)* | JSON index | footer,
+# where the index is {"products": {id: {page: [offset, length]}}, "shared": {ref: value}}
+MAGIC = b"KPAK"
+VERSION = 1
+_HEADER = struct.Struct("<4sBB2x")        # magic, version, codec
+_RECORD = struct.Struct("<I")             # payload length
+_FOOTER = struct.Struct("<QQ4s")          # index offset, index length, magic
+
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}
+
+
+def _compressor(codec: str):
+    """Return a bytes -> bytes compression function for ``codec``."""
+    if codec == "none":
+        return lambda data: data
+    if codec == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("The 'zstd' archive codec requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3).compress
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+def _decompressor(codec_id: int):
+    """Return a bytes -> bytes decompression function for a stored codec id."""
+    if codec_id == CODECS["none"]:
+        return bytes
+    if codec_id == CODECS["gzip"]:
+        return gzip.decompress
+    if codec_id == CODECS["zstd"]:
+        if zstandard is None:
+            raise ImportError("Reading a zstd archive requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unknown archive codec id: {codec_id}")
+
+
+class ArchiveWriter:
+    """
+    Writes all generated pages of a run into one append-only archive file.
+
+    Responsibility: Replace three small files per product with length-prefixed
+    records in a single file, each record one page serialized as compact JSON
+    and optionally compressed on its own (so any page can be read without
+    touching its neighbours). An offset index mapping product id and page
+    filename to its record is appended on ``close``, followed by a fixed-size
+    footer locating the index.
+
+    With ``shared_refs=True``, interned static structures are stored once in
+    the index trailer and referenced from pages by id; PageArchive resolves
+    them transparently on read.
+
+    The archive is built under a temporary name and renamed into place on
+    close, so readers never see a half-written archive; leaving the context
+    manager with an exception discards it instead. Usable as a context
+    manager; exposes the same ``write(product_id, pages)`` interface as
+    PageWriter.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        codec: str = "none",
+        backend: str = "auto",
+        shared_refs: bool = False,
+    ):
+        """
+        Create the archive.
+
+        Args:
+            path: Destination archive path
+            codec: Per-record compression: ``"none"``, ``"gzip"`` or ``"zstd"``
+            backend: JSON serializer backend (see ``make_serializer``)
+            shared_refs: Store interned static structures once, referenced by id
+        """
+        self.path = Path(path)
+        self.codec = codec
+        self.compress = _compressor(codec)
+        self.serialize = make_serializer(pretty=False, backend=backend)
+        self.index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self.shared_refs = shared_refs
+        self._shared_used: Dict[str, Any] = {}
+        self.pages_written = 0
+        self.bytes_written = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, CODECS[codec]))
+        self._offset = _HEADER.size
+
+    def write(self, product_id: str, pages: Dict[str, Any]) -> None:
+        """
+        Append one product's pages as records and index them.
+
+        Raises:
+            ValueError: If the archive already holds pages for ``product_id``
+        """
+        if product_id in self.index:
+            raise ValueError(f"Duplicate product id in archive: {product_id}")
+        entries = self.index[product_id] = {}
+        chunks: List[bytes] = []
+        for filename, page in pages.items():
+            if self.shared_refs:
+                page = deduplicate(page, self._shared_used)
+            payload = self.compress(self.serialize(page))
+            record_offset = self._offset + _RECORD.size
+            entries[filename] = (record_offset, len(payload))
+            chunks.append(_RECORD.pack(len(payload)))
+            chunks.append(payload)
+            self._offset = record_offset + len(payload)
+            self.pages_written += 1
+            self.bytes_written += len(payload)
+        self._file.write(b"".join(chunks))
+
+    def close(self) -> None:
+        """Append the index and footer, then move the archive into place."""
+        if self._file.closed:
+            return
+        index = json.dumps(
+            {"products": self.index, "shared": shared_table(self._shared_used)},
+            separators=(",", ":"),
+            default=json_default,
+        ).encode("utf-8")
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(self._offset, len(index), MAGIC))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        """Close and delete the partial archive, leaving any existing one in place."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.unlink(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class PageArchive:
+    """
+    Read-only random access to an archive written by ArchiveWriter.
+
+    The file is memory-mapped and only the offset index (plus any shared
+    structures) is parsed up front; ``get(product_id, filename)`` is then a
+    dict lookup plus one slice of the mapping, so reading a page costs the
+    same for the first product as for the millionth and never loads the rest
+    of the archive.
+    """
+
+    def __init__(self, path: str | Path):
+        """Open and map the archive, validating its header and footer."""
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size + _FOOTER.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a page archive")
+        magic, version, codec_id = _HEADER.unpack_from(self._map, 0)
+        index_offset, index_length, tail = _FOOTER.unpack_from(
+            self._map, len(self._map) - _FOOTER.size
+        )
+        if magic != MAGIC or tail != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a page archive")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported page archive version {version} in {self.path}")
+        self.codec = next(name for name, value in CODECS.items() if value == codec_id)
+        self._decompress = _decompressor(codec_id)
+        self._loads = orjson.loads if orjson is not None else json.loads
+        trailer = json.loads(self._map[index_offset:index_offset + index_length])
+        self.index: Dict[str, Dict[str, List[int]]] = trailer["products"]
+        self.shared: Dict[str, Any] = trailer["shared"]
+
+    def raw(self, product_id: str, filename: str) -> bytes:
+        """
+        Return one page's serialized JSON bytes.
+
+        Raises:
+            KeyError: If the product or page is not in the archive
+        """
+        offset, length = self.index[product_id][filename]
+        return self._decompress(self._map[offset:offset + length])
+
+    def get(self, product_id: str, filename: str) -> Dict[str, Any]:
+        """Return one page as a dict (``KeyError`` if absent)."""
+        page = self._loads(self.raw(product_id, filename))
+        return resolve(page, self.shared) if self.shared else page
+
+    def pages(self, product_id: str) -> Dict[str, Any]:
+        """Return all pages of one product."""
+        return {filename: self.get(product_id, filename) for filename in self.index[product_id]}
+
+    def products(self) -> Iterator[str]:
+        """Iterate over product ids in write order."""
+        return iter(self.index)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        """Unmap and close the archive file."""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,343 @@
+"""Caches - Content-addressed memoization for workflow stages and generation responses"""
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Any, Callable, Tuple
+from agents.records import Record, json_default
+
+# Bump when a stage's output format or logic changes in a way its inputs do
+# not capture, so stale persistent cache entries stop matching
+CACHE_VERSION = 1
+
+
+def _hash_default(value: Any) -> Any:
+    """Dict view for records, ``str`` for anything else JSON cannot encode."""
+    return json_default(value) if isinstance(value, Record) else str(value)
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Compute a stable content hash of a JSON-like value.
+
+    Dict keys are sorted so logically equal inputs hash identically across
+    runs and processes; records hash like their dict views.
+    """
+    payload = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_hash_default
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SqliteStore:
+    """
+    Persistent key/value store for cached stage outputs, backed by SQLite.
+
+    Values are stored as pickled blobs keyed by ``(stage, key)``, so the cache
+    survives across runs and can be shared by processes on one host. Writes
+    are buffered and committed in groups of ``commit_every`` to avoid one
+    fsync per entry; each group is written in one short transaction, so no
+    process holds the database's write lock between groups.
+    """
+
+    def __init__(self, path: str | Path, commit_every: int = 512):
+        """Open (or create) the SQLite database at ``path``."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = Path(path)
+        self.commit_every = max(1, commit_every)
+        self._pending: Dict[Tuple[str, str], bytes] = {}
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stage_cache ("
+            "stage TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (stage, key))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, stage: str, key: str) -> bytes | None:
+        """Return the stored blob, or None if absent."""
+        with self._lock:
+            blob = self._pending.get((stage, key))
+            if blob is not None:
+                return blob
+            row = self._conn.execute(
+                "SELECT value FROM stage_cache WHERE stage = ? AND key = ?", (stage, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, stage: str, key: str, blob: bytes) -> None:
+        """Store a blob, replacing any previous value."""
+        with self._lock:
+            self._pending[(stage, key)] = blob
+            if len(self._pending) >= self.commit_every:
+                self._write()
+
+    def flush(self) -> None:
+        """Commit any pending writes."""
+        with self._lock:
+            self._write()
+
+    def close(self) -> None:
+        """Commit pending writes and close the underlying connection."""
+        with self._lock:
+            self._write()
+            self._conn.close()
+
+    def _write(self) -> None:
+        """Write the buffered entries in one transaction (caller holds the lock)."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stage_cache (stage, key, value) VALUES (?, ?, ?)",
+                [(stage, key, blob) for (stage, key), blob in self._pending.items()],
+            )
+        self._pending.clear()
+
+
+class StageCache:
+    """
+    Per-stage memoization cache keyed by a stable hash of each stage's input.
+
+    Responsibility: Let unchanged products and unchanged intermediate outputs
+    skip their workflow stages entirely.
+
+    Entries live in an in-memory LRU bounded by total serialized size, with an
+    optional persistent store behind it. Values are kept serialized, so a hit
+    always returns a fresh copy that callers may mutate freely. Hit/miss
+    counters are tracked per stage.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, store: SqliteStore | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound on the in-memory LRU's total serialized size
+            store: Optional persistent store consulted on in-memory misses
+        """
+        self.max_bytes = max_bytes
+        self.store = store
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, stage: str, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached stage output.
+
+        Returns:
+            ``(True, value)`` on a hit, ``(False, None)`` on a miss
+        """
+        with self._lock:
+            counters = self._counters.setdefault(stage, {"hits": 0, "misses": 0})
+            blob = self._entries.get((stage, key))
+            if blob is not None:
+                self._entries.move_to_end((stage, key))
+        if blob is None and self.store is not None:
+            blob = self.store.get(stage, key)
+            if blob is not None:
+                self._remember(stage, key, blob)
+        with self._lock:
+            counters["hits" if blob is not None else "misses"] += 1
+        if blob is None:
+            return False, None
+        return True, pickle.loads(blob)
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        """Cache a stage output in memory and in the persistent store, if any."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(stage, key, blob)
+        if self.store is not None:
+            self.store.put(stage, key, blob)
+
+    def memoize(
+        self, stage: str, fn: Callable[..., Any], version: Callable[[], str] | None = None
+    ) -> Callable[..., Any]:
+        """
+        Wrap a stage callable so identical inputs reuse the cached output.
+
+        Every key mixes in ``CACHE_VERSION`` and the token returned by
+        ``version`` (e.g. a hash of the templates and agent configuration the
+        stage runs with), so entries written under other code, templates or
+        settings are never returned.
+
+        Args:
+            stage: Stage name used to namespace keys and counters
+            fn: Stage callable taking JSON-like arguments
+            version: Optional callable returning the stage's version token
+
+        Returns:
+            Memoized callable with the same signature
+        """
+
+        @wraps(fn)
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            token = (CACHE_VERSION, version() if version is not None else "")
+            key = stable_hash((token, args, kwargs))
+            hit, value = self.get(stage, key)
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            self.put(stage, key, value)
+            return value
+
+        return cached
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return ``{stage: {"hits": n, "misses": m}}`` counters."""
+        with self._lock:
+            return {stage: dict(counters) for stage, counters in self._counters.items()}
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+            self.current_bytes = 0
+
+    def _remember(self, stage: str, key: str, blob: bytes) -> None:
+        """Insert into the LRU and evict least-recently-used entries over budget."""
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((stage, key), None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[(stage, key)] = blob
+            self.current_bytes += len(blob)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+
+def prompt_key(template: str, variables: Dict[str, Any], backend: str = "") -> str:
+    """
+    Cache key for a generation request: backend, normalized template and variable hash.
+
+    ``backend`` identifies the backend configuration (see
+    ``GenerationBackend.identity``), so responses are never shared between
+    models or sampling settings. Whitespace in the template is collapsed, so
+    cosmetic edits to a prompt template do not invalidate cached responses.
+    """
+    normalized = " ".join(template.split())
+    template_hash = hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{backend}:{template_hash}:{stable_hash(variables)}"
+
+
+class ResponseCache:
+    """
+    Persistent cache of generation responses with TTL and LRU eviction.
+
+    Responsibility: Return a stored completion for a previously seen
+    (template, variables) pair so repeated prompts never reach the backend.
+
+    Entries live in SQLite (``":memory:"`` when no path is given). Entries
+    older than ``ttl`` seconds are treated as misses; once more than
+    ``max_entries`` are stored, the least recently used tenth is evicted.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = 100_000,
+        ttl: float | None = None,
+        commit_every: int = 256,
+    ):
+        """Open (or create) the cache database."""
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.commit_every = max(1, commit_every)
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> str | None:
+        """Return the cached completion, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count -= 1
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                self._maybe_commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.stats["hits"] += 1
+            self._maybe_commit()
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        """Store a completion, evicting least-recently-used entries over capacity."""
+        now = time.time()
+        with self._lock:
+            existed = self._conn.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if not existed:
+                self._count += 1
+            if self._count > self.max_entries:
+                evict = max(1, self.max_entries // 10)
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (evict,),
+                )
+                self._count -= evict
+                self.stats["evicted"] += evict
+            self._maybe_commit()
+
+    def flush(self) -> None:
+        """Commit any pending writes."""
+        with self._lock:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commit pending writes and close the underlying connection."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def _maybe_commit(self) -> None:
+        """Commit once enough writes have accumulated (caller holds the lock)."""
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.commit()
+            self._uncommitted = 0
@@ -0,0 +1,223 @@
+"""Catalog helpers - Loads product records and derives stable product identifiers"""
+import hashlib
+import json
+import re
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, List, Iterator, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agents.data_parser import DataParserAgent
+    from agents.records import Product
+
+
+def product_id(raw_product: Dict[str, Any], index: int) -> str:
+    """
+    Derive a stable, filesystem-safe identifier for a product record.
+
+    Prefers an explicit ``sku`` or ``id`` field, then falls back to a slug of
+    the product name, and finally to the record's position in the catalog.
+    Values that are not already safe are sanitized and given a short hash of
+    the original, so distinct values never share an identifier and an id is
+    never empty, ``.`` or ``..``.
+
+    Args:
+        raw_product: Raw product JSON
+        index: Position of the record in its catalog
+
+    Returns:
+        Identifier string suitable for use as a directory or key name
+    """
+    for key in ("sku", "id"):
+        value = raw_product.get(key)
+        if value not in (None, ""):
+            value = str(value)
+            return _safe_id(value, re.sub(r"[^A-Za-z0-9._-]+", "-", value).strip("-."))
+    name = str(raw_product.get("name", ""))
+    if name:
+        return _safe_id(name, re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-"))
+    return f"product-{index}"
+
+
+def duplicate_entry(index: int, record: Any, pid: str, first_index: int) -> Dict[str, Any]:
+    """
+    Quarantine entry for a valid row whose product id an earlier row already took.
+
+    Two products with the same ``sku``, ``id`` or name would share one output
+    directory (or archive key), so only the first is generated.
+    """
+    return {
+        "index": index,
+        "record": record,
+        "errors": [{
+            "loc": [],
+            "msg": f"Duplicate product id {pid!r} (first used by row {first_index})",
+            "type": "duplicate_id",
+        }],
+    }
+
+
+def _safe_id(value: str, sanitized: str) -> str:
+    """``sanitized`` as is when it equals ``value``, else suffixed with a hash of ``value``."""
+    if sanitized == value:
+        return value
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{sanitized}-{digest}" if sanitized else digest
+
+
+def load_catalog(path: str | Path) -> List[Dict[str, Any]]:
+    """
+    Load product records from a JSON or JSONL catalog file.
+
+    A ``.jsonl`` file holds one product per line. A ``.json`` file may hold a
+    single product object or a list of products.
+
+    Args:
+        path: Path to the catalog file
+
+    Returns:
+        List of raw product dictionaries in file order
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def iter_catalog(
+    source: str | Path, on_error: Callable[[int, str, ValueError], None] | None = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield product records from a JSONL file or stdin.
+
+    Only one line is held in memory at a time, so arbitrarily large catalogs
+    can be streamed through the workflow.
+
+    Args:
+        source: Path to a ``.jsonl`` catalog, or ``"-"`` to read from stdin
+        on_error: Optional callback receiving ``(line number, line, error)``
+            for lines that are not valid JSON, which are then skipped
+            (without it, such a line raises)
+
+    Yields:
+        Raw product dictionaries in input order
+    """
+    if str(source) == "-":
+        yield from _decode_lines(sys.stdin, on_error)
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        yield from _decode_lines(f, on_error)
+
+
+def _decode_lines(
+    lines: Iterable[str], on_error: Callable[[int, str, ValueError], None] | None
+) -> Iterator[Dict[str, Any]]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if on_error is None:
+            yield json.loads(line)
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            on_error(number, line.rstrip("\n"), exc)
+
+
+class Quarantine:
+    """
+    JSONL file collecting malformed catalog rows.
+
+    The file is created (replacing any earlier one) on the first rejected
+    row, so clean runs leave no file behind; ``count`` is the number of rows
+    written so far.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.count = 0
+
+    def add(self, entries: List[Dict[str, Any]]) -> None:
+        """Append quarantined entries (e.g. from ``DataParserAgent.validate_many``)."""
+        if not entries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a" if self.count else "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        self.count += len(entries)
+
+    def add_undecodable(self, line_number: int, line: str, error: ValueError) -> None:
+        """``iter_catalog`` error callback: quarantine a line that is not valid JSON."""
+        self.add([{
+            "line": line_number,
+            "record": line,
+            "errors": [{"loc": [], "msg": str(error), "type": "json_invalid"}],
+        }])
+
+
+def validate_chunks(
+    rows: Iterable[Dict[str, Any]],
+    parser: "DataParserAgent",
+    chunk_size: int,
+    quarantine: Quarantine,
+    ready: Callable[[], bool] | None = None,
+) -> Iterator[Tuple[int, str, Dict[str, Any], "Product"]]:
+    """
+    Validate a lazy stream of rows in chunks, quarantining malformed ones.
+
+    Each chunk is checked with one ``validate_many`` call, so a bad row costs
+    a quarantine entry instead of the run, and memory stays bounded by
+    ``chunk_size``. A valid row whose ``product_id`` an earlier valid row
+    already took is quarantined as a duplicate.
+
+    Args:
+        rows: Raw product records (may be lazy)
+        parser: Agent whose ``validate_many`` checks each chunk
+        chunk_size: Maximum rows per chunk
+        quarantine: Receives malformed and duplicate rows
+        ready: Optional check that another row can be read without
+            blocking (e.g. on a slow stdin); when it fails, the rows read so
+            far are validated and yielded instead of waiting for a full chunk
+
+    Yields:
+        ``(row index, product id, raw row, normalized product)`` for every
+        valid row, in order
+    """
+    rows = iter(rows)
+    offset = 0
+    first_rows: Dict[str, int] = {}
+    while chunk := _next_chunk(rows, max(1, chunk_size), ready):
+        valid, rejected = parser.validate_many(chunk)
+        for entry in rejected:
+            entry["index"] += offset
+        quarantine.add(rejected)
+        skip = {entry["index"] for entry in rejected}
+        products = iter(valid)
+        for index, row in enumerate(chunk, offset):
+            if index in skip:
+                continue
+            product = next(products)
+            pid = product_id(row, index)
+            first = first_rows.setdefault(pid, index)
+            if first != index:
+                quarantine.add([duplicate_entry(index, row, pid, first)])
+                continue
+            yield index, pid, row, product
+        offset += len(chunk)
+
+
+def _next_chunk(
+    rows: Iterator[Dict[str, Any]], size: int, ready: Callable[[], bool] | None
+) -> List[Dict[str, Any]]:
+    if ready is None:
+        return list(islice(rows, size))
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size or not ready():
+            break
+    return chunk
@@ -0,0 +1,75 @@
+"""Columnar Batches - Arrow-style column layout of parsed products for batch execution"""
+from array import array
+from itertools import accumulate, chain
+from typing import Iterator, List, Sequence, Tuple
+from agents.records import Product
+
+
+class ListColumn:
+    """
+    A column of string lists stored as flat values plus offsets.
+
+    Follows the Arrow list layout: the items of row ``i`` are
+    ``values[offsets[i]:offsets[i + 1]]``. Batch code transforms ``values``
+    in one pass and slices the results back into rows, instead of looping
+    over each row's small list.
+    """
+
+    __slots__ = ("offsets", "values")
+
+    def __init__(self, offsets: Sequence[int], values: List[str]):
+        """Wrap existing offsets (length rows + 1) and flat values."""
+        self.offsets = offsets
+        self.values = values
+
+    @classmethod
+    def from_lists(cls, lists: Sequence[Sequence[str]]) -> "ListColumn":
+        """Build a column from one sequence of strings per row."""
+        offsets = array("q", [0])
+        offsets.extend(accumulate(map(len, lists)))
+        return cls(offsets, list(chain.from_iterable(lists)))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def bounds(self) -> Iterator[Tuple[int, int]]:
+        """``(start, end)`` of each row's slice of ``values``."""
+        offsets = self.offsets
+        return zip(offsets, offsets[1:])
+
+    def split(self, flat: Sequence) -> List[tuple]:
+        """Cut a sequence aligned with ``values`` back into one tuple per row."""
+        return [tuple(flat[start:end]) for start, end in self.bounds()]
+
+
+class ProductColumns:
+    """
+    A batch of parsed products transposed into columns.
+
+    Scalar fields are plain lists with one entry per product; list fields
+    (benefits, ingredients, competitor names) are ListColumns. Only the
+    fields the batch content-block builders read are materialized.
+    """
+
+    __slots__ = (
+        "size",
+        "product_name",
+        "usage_instructions",
+        "benefits",
+        "ingredients",
+        "competitors",
+    )
+
+    def __init__(self, parsed_products: Sequence[Product]):
+        """Transpose a batch of Product records."""
+        self.size = len(parsed_products)
+        self.product_name = [parsed.product_name for parsed in parsed_products]
+        self.usage_instructions = [parsed.usage_instructions for parsed in parsed_products]
+        self.benefits = ListColumn.from_lists([parsed.benefits for parsed in parsed_products])
+        self.ingredients = ListColumn.from_lists([parsed.ingredients for parsed in parsed_products])
+        self.competitors = ListColumn.from_lists(
+            [tuple(parsed.competitor_products) for parsed in parsed_products]
+        )
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,119 @@
+"""Competitor Index - Catalog-wide competitor profiles for comparison pages"""
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from statistics import median
+from typing import Dict, Any, Iterable, Iterator, List, Tuple, TYPE_CHECKING
+from agents.catalog import iter_catalog, load_catalog
+from agents.interning import intern
+from agents.records import CompetitorProfile, Product
+
+if TYPE_CHECKING:
+    from agents.data_parser import DataParserAgent
+
+
+class CompetitorIndex:
+    """
+    Precomputed index from each competitor to the catalog products that reference it.
+
+    Responsibility: Scan the parsed catalog once per run and keep, for every
+    competitor named in any product's ``competitor_products``, the names of
+    the referencing products and a CompetitorProfile summarizing them (count,
+    notes, median parsed price). Comparison pages then look competitors up in
+    O(1) instead of rescanning the catalog for every product.
+
+    Autonomy: Read-only after construction and picklable, so one index can be
+    built by the parent process and shipped to every worker.
+    """
+
+    def __init__(self, profiles: Dict[str, CompetitorProfile], references: Dict[str, Tuple[str, ...]]):
+        """
+        Wrap prebuilt profiles; use ``from_products`` to build an index.
+
+        Args:
+            profiles: Competitor name -> CompetitorProfile
+            references: Competitor name -> names of the products referencing it
+        """
+        self.profiles = profiles
+        self.references = references
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "CompetitorIndex":
+        """
+        Build the index in one pass over parsed products.
+
+        Args:
+            products: Normalized products (e.g. the valid rows of ``validate_many``)
+
+        Returns:
+            The competitor index for that catalog
+        """
+        notes: Dict[str, Counter] = {}
+        prices: Dict[str, List[Tuple[float, str | None]]] = {}
+        references: Dict[str, List[str]] = {}
+        for product in products:
+            for name, note in product.competitor_products.items():
+                if name not in references:
+                    notes[name], prices[name], references[name] = Counter(), [], []
+                references[name].append(product.product_name)
+                notes[name][note] += 1
+                if product.price_value is not None:
+                    prices[name].append((product.price_value, product.price_currency))
+
+        profiles = {}
+        for name, referencing in references.items():
+            currency, price = None, None
+            if prices[name]:
+                currency = Counter(code for _, code in prices[name]).most_common(1)[0][0]
+                price = median(value for value, code in prices[name] if code == currency)
+            # Interned: every product comparing against this competitor shares one profile
+            profiles[name] = intern(CompetitorProfile(
+                name,
+                len(referencing),
+                tuple(note for note, _ in notes[name].most_common()),
+                price,
+                currency,
+            ))
+        return cls(profiles, {name: tuple(referencing) for name, referencing in references.items()})
+
+    def lookup(self, names: Iterable[str]) -> Tuple[CompetitorProfile, ...]:
+        """Profiles of the given competitors, in order; names not in the catalog are skipped."""
+        profiles = self.profiles
+        return tuple(profiles[name] for name in names if name in profiles)
+
+    def referencing(self, name: str) -> Tuple[str, ...]:
+        """Names of the catalog products that compare themselves against ``name``."""
+        return self.references.get(name, ())
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary counters for run reports."""
+        return {
+            "competitors": len(self.profiles),
+            "references": sum(profile.products for profile in self.profiles.values()),
+        }
+
+
+def index_catalog(path: str | Path, parser: "DataParserAgent", chunk_size: int = 1000) -> CompetitorIndex:
+    """
+    Build the competitor index of a whole catalog file.
+
+    Rows are read lazily and validated in chunks, so a shard can index the
+    full catalog without holding it in memory; malformed rows, and JSONL
+    lines that are not valid JSON, are skipped (the run that generates the
+    pages quarantines them).
+    """
+    path = Path(path)
+    rows = (
+        iter_catalog(path, on_error=lambda number, line, error: None)
+        if path.suffix == ".jsonl"
+        else iter(load_catalog(path))
+    )
+
+    def valid_products() -> Iterator[Product]:
+        while chunk := list(islice(rows, chunk_size)):
+            yield from parser.validate_many(chunk)[0]
+
+    return CompetitorIndex.from_products(valid_products())
@@ -1,5 +1,25 @@
 """Content Blocker Agent - Creates reusable content blocks from product data"""
-from typing import Dict, Any, List
+from typing import Dict, Any, List, FrozenSet, Iterable, Sequence, Set, Tuple, TYPE_CHECKING
+from agents.columnar import ProductColumns
+from agents.records import BenefitItem, BenefitsBlock, Product, Question, Record
+from logic_blocks import LogicBlock, registered_blocks
+
+if TYPE_CHECKING:
+    from agents.generation import GenerationClient
+
+# Prompt used to describe each benefit with a generation backend (async mode)
+DESCRIPTION_PROMPT = (
+    "Write a one-sentence description of this skincare benefit for a product page.\n"
+    "Product: {product_name}\n"
+    "Benefit: {benefit}"
+)
+
+
+def _block_context(block: LogicBlock, context: Dict[str, Any] | None) -> Dict[str, Any]:
+    """The subset of ``context`` a block declares, as keyword arguments."""
+    if not context or not block.context:
+        return {}
+    return {key: context[key] for key in block.context if key in context}
 
 
 class ContentBlockAgent:
@@ -12,102 +32,146 @@ class ContentBlockAgent:
     
     Autonomy: Operates independently. Receives parsed product and FAQ questions,
     outputs content blocks with no side effects.
+
+    The blocks themselves are plugins in ``logic_blocks`` (see
+    ``logic_blocks.register_block``); the agent only selects and runs them.
     """
 
     def __init__(self, config: Dict[str, Any] | None = None):
-        """Initialize the ContentBlock agent."""
+        """Initialize the ContentBlock agent over the registered logic blocks."""
         self.config = config or {}
+        self.blocks = registered_blocks()
+
+        # Normalized fields (plus the "questions" list) each block is built from,
+        # so callers can rebuild only the blocks whose inputs changed
+        self.block_fields = {name: block.fields for name, block in self.blocks.items()}
+        self._plans: Dict[FrozenSet[str] | None, Tuple[LogicBlock, ...]] = {}
+
+    def plan(self, blocks: Iterable[str] | None = None) -> Tuple[LogicBlock, ...]:
+        """
+        The registered blocks to build for a requested subset, in registry order.
+
+        Plans are computed once per distinct subset and reused, so selecting
+        blocks costs a dict lookup per call. Unknown names are ignored.
+        """
+        key = None if blocks is None else frozenset(blocks)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = tuple(
+                block for name, block in self.blocks.items() if key is None or name in key
+            )
+        return plan
 
     def execute(
-        self, parsed: Dict[str, Any], questions: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
+        self,
+        parsed: Product,
+        questions: List[Question],
+        blocks: Iterable[str] | None = None,
+        context: Dict[str, Any] | None = None,
+    ) -> Dict[str, Record]:
         """
         Create reusable content blocks from product data and FAQs.
         
         Args:
             parsed: Normalized product data from DataParserAgent
             questions: FAQ questions from QuestionGeneratorAgent
+            blocks: Optional subset of block names to build (default: all)
+            context: Optional run-wide context (e.g. ``"competitors"`` profiles),
+                passed to the blocks that declare those keys
             
         Returns:
-            Dictionary of content blocks:
+            Dictionary of content block records:
             - benefits_block: Product benefits structured
             - ingredients_block: Ingredient information
             - usage_block: Usage instructions structured
             - comparison_block: Competitive comparison info
             - faq_blocks: FAQ questions organized by category
         """
-        product_name = parsed.get("product_name", "Product")
-        benefits = parsed.get("benefits", [])
-        ingredients = parsed.get("ingredients", [])
-        usage = parsed.get("usage_instructions", "")
-        competitors = parsed.get("competitor_products", {})
-
-        # Create Benefits Block
-        benefits_block = {
-            "type": "benefits",
-            "title": f"Why Choose {product_name}?",
-            "items": [
-                {"benefit": benefit, "description": f"{benefit} tailored for your skin"}
-                for benefit in benefits
-            ],
+        if not context:
+            return {block.name: block.build(parsed, questions) for block in self.plan(blocks)}
+        return {
+            block.name: block.build(parsed, questions, **_block_context(block, context))
+            for block in self.plan(blocks)
         }
 
-        # Create Ingredients Block
-        ingredients_block = {
-            "type": "ingredients",
-            "title": "Key Ingredients",
-            "items": [
-                {"name": ingredient, "type": "Natural Extract"}
-                for ingredient in ingredients
-            ],
-        }
+    def execute_columnar(
+        self,
+        columns: ProductColumns,
+        questions_batch: Sequence[List[Question]],
+        blocks: Iterable[str] | None = None,
+        context: Dict[str, Sequence[Any]] | None = None,
+    ) -> List[Dict[str, Record]]:
+        """
+        Create content blocks for a whole batch of products at once.
 
-        # Create Usage Block
-        usage_block = {
-            "type": "usage",
-            "title": "How to Use",
-            "steps": [
-                {"step": 1, "instruction": "Cleanse your skin thoroughly"},
-                {"step": 2, "instruction": "Apply a small amount of serum"},
-                {"step": 3, "instruction": f"{usage if usage else 'Massage gently until absorbed'}"},
-                {"step": 4, "instruction": "Follow with your regular moisturizer"},
-            ],
-        }
+        Each list field is transformed in one pass over its flat values
+        (descriptions, items, usage steps) and sliced back per product, and
+        all FAQs of the batch are grouped by category in a single pass. The
+        result equals ``execute`` applied to every product.
+
+        Args:
+            columns: The batch's parsed products in columnar layout
+            questions_batch: FAQ questions of each product, aligned with ``columns``
+            blocks: Optional subset of block names to build (default: all)
+            context: Optional run-wide context, one value per product for each key
 
-        # Create Comparison Block
-        comparison_block = {
-            "type": "comparison",
-            "title": "How We Compare",
-            "our_product": product_name,
-            "competitors": list(competitors.keys()) if competitors else [],
-            "advantages": [
-                "Natural ingredients",
-                "Clinically tested",
-                "Cruelty-free",
-                "Fast-absorbing formula",
-            ],
+        Returns:
+            One dictionary of content block records per product
+        """
+        built = {
+            block.name: block.build_batch(columns, questions_batch, **_block_context(block, context))
+            for block in self.plan(blocks)
         }
+        if not built:
+            return [{} for _ in range(len(columns))]
+        return [dict(zip(built, row)) for row in zip(*built.values())]
 
-        # Create FAQ Blocks organized by category
-        faq_by_category = {}
-        for question in questions:
-            category = question.get("category", "General")
-            if category not in faq_by_category:
-                faq_by_category[category] = []
-            faq_by_category[category].append(
-                {"question": question.get("question"), "id": question.get("id")}
-            )
+    def execute_batch(
+        self,
+        parsed_batch: Sequence[Product],
+        questions_batch: Sequence[List[Question]],
+        blocks: Iterable[str] | None = None,
+        context: Dict[str, Sequence[Any]] | None = None,
+    ) -> List[Dict[str, Record]]:
+        """Create content blocks for a batch of parsed products (``execute_columnar`` over them)."""
+        return self.execute_columnar(ProductColumns(parsed_batch), questions_batch, blocks, context)
 
-        faq_blocks = {
-            "type": "faqs",
-            "title": "Frequently Asked Questions",
-            "categories": faq_by_category,
-        }
+    async def execute_async(
+        self,
+        parsed: Product,
+        questions: List[Question],
+        client: "GenerationClient",
+        blocks: Iterable[str] | None = None,
+        context: Dict[str, Any] | None = None,
+    ) -> Dict[str, Record]:
+        """
+        Create content blocks, writing benefit descriptions with a generation backend.
+
+        Same as ``execute``, except each benefits item's ``description`` is
+        generated by ``client`` instead of the fixed template.
+        """
+        content_blocks = self.execute(parsed, questions, blocks, context)
+        benefits_block = content_blocks.get("benefits_block")
+        if benefits_block and benefits_block.items:
+            descriptions = await client.generate_many(
+                DESCRIPTION_PROMPT,
+                [
+                    {"product_name": parsed.product_name, "benefit": item.benefit}
+                    for item in benefits_block.items
+                ],
+            )
+            content_blocks["benefits_block"] = BenefitsBlock(
+                benefits_block.title,
+                tuple(
+                    BenefitItem(item.benefit, description)
+                    for item, description in zip(benefits_block.items, descriptions)
+                ),
+            )
+        return content_blocks
 
+    def affected_blocks(self, changed_fields: Iterable[str]) -> Set[str]:
+        """Names of the blocks that read any of the given fields."""
+        changed = set(changed_fields)
         return {
-            "benefits_block": benefits_block,
-            "ingredients_block": ingredients_block,
-            "usage_block": usage_block,
-            "comparison_block": comparison_block,
-            "faq_blocks": faq_blocks,
+            name for name, fields in self.block_fields.items() if changed.intersection(fields)
         }
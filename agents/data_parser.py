@@ -1,16 +1,145 @@
 """Data Parser Agent - Parses and normalizes raw product data"""
-from pydantic import BaseModel
-import json
-from typing import Dict, Any, List
+import re
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, NotRequired, Tuple
+from typing_extensions import TypedDict
+from agents.interning import FrozenDict
+from agents.records import Product
+
+# Currency symbols/codes recognised at the start or end of a price string
+CURRENCY_SYMBOLS = {
+    "$": "USD",
+    "₹": "INR",
+    "€": "EUR",
+    "£": "GBP",
+    "¥": "JPY",
+    "Rs.": "INR",
+    "Rs": "INR",
+    "INR": "INR",
+    "USD": "USD",
+    "EUR": "EUR",
+    "GBP": "GBP",
+}
+
+_PRICE_PATTERN = re.compile(
+    r"^\s*(?P<prefix>[^\d\s-]*)\s*(?P<amount>-?\d[\d,]*(?:\.\d+)?)\s*(?P<suffix>[^\d\s]*)\s*$"
+)
+
+
+def parse_price(price: str | int | float) -> Tuple[float | None, str | None]:
+    """
+    Split a price into a numeric value and an ISO currency code.
+
+    ``"$699"`` -> ``(699.0, "USD")``, ``"₹1,299"`` -> ``(1299.0, "INR")``,
+    ``699`` -> ``(699.0, None)``. Unparseable prices yield ``(None, None)``.
+    """
+    if isinstance(price, (int, float)):
+        return float(price), None
+    match = _PRICE_PATTERN.match(price)
+    if not match:
+        return None, None
+    symbol = match.group("prefix") or match.group("suffix")
+    currency = CURRENCY_SYMBOLS.get(symbol) if symbol else None
+    if symbol and currency is None:
+        return None, None
+    return float(match.group("amount").replace(",", "")), currency
+
+
+class ProductRecord(TypedDict):
+    """
+    Strict schema for one raw catalog row.
+
+    Types are checked without coercion (a number where a list is expected is
+    rejected) and unknown keys such as ``sku`` are ignored. Every field is
+    optional; the agent fills in its usual defaults when normalizing. A
+    TypedDict validates to a plain dict, which is several times faster than
+    building a model instance per row.
+    """
+
+    __pydantic_config__ = {"strict": True, "extra": "ignore"}
+
+    name: NotRequired[str]
+    concentration: NotRequired[str]
+    skin_type: NotRequired[List[str]]
+    ingredients: NotRequired[List[str]]
+    benefits: NotRequired[List[str]]
+    usage: NotRequired[str]
+    side_effects: NotRequired[str]
+    price: NotRequired[str | int | float]
+    competitor_products: NotRequired[Dict[str, str]]
+
+
+@lru_cache(maxsize=None)
+def _adapters() -> Tuple[Any, Any]:
+    """
+    Pydantic adapters for one row and for a list of rows, built on first use.
+
+    pydantic is imported here rather than at module load: rows that pass
+    ``_conforms`` never need it, so a clean catalog (or CLI start-up) does not
+    pay its import cost. Validating a whole list is a single call into
+    pydantic-core.
+    """
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(ProductRecord), TypeAdapter(List[ProductRecord])
+
+
+def _is_str(value: Any) -> bool:
+    return type(value) is str
+
+
+def _is_str_list(value: Any) -> bool:
+    return type(value) is list and all(type(item) is str for item in value)
+
+
+def _is_str_dict(value: Any) -> bool:
+    return type(value) is dict and all(
+        type(key) is str and type(item) is str for key, item in value.items()
+    )
+
+
+def _is_price(value: Any) -> bool:
+    return type(value) in (str, int, float)
+
+
+_FIELD_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "name": _is_str,
+    "concentration": _is_str,
+    "skin_type": _is_str_list,
+    "ingredients": _is_str_list,
+    "benefits": _is_str_list,
+    "usage": _is_str,
+    "side_effects": _is_str,
+    "price": _is_price,
+    "competitor_products": _is_str_dict,
+}
+
+
+def _conforms(record: Any) -> bool:
+    """
+    Fast pure-Python check that a row matches ProductRecord.
+
+    Stricter than the schema (exact builtin types only), so a row that passes
+    is certainly valid and can be normalized as is. Any other row goes to
+    pydantic, which makes the final decision and reports the errors.
+    """
+    if type(record) is not dict:
+        return False
+    for key, check in _FIELD_CHECKS.items():
+        if key in record and not check(record[key]):
+            return False
+    return True
 
 
 class DataParserAgent:
     """
     Agent responsible for parsing and normalizing raw product JSON data.
-    
+
     Responsibility: Transform raw unstructured product data into a normalized,
     standardized internal format that other agents can reliably consume.
-    
+    Rows are validated against ProductRecord, so malformed data is rejected
+    here instead of failing far downstream.
+
     Autonomy: Operates independently with no global state. Input and output
     are well-defined dictionaries, making the agent testable and reusable.
     """
@@ -19,15 +148,15 @@ class DataParserAgent:
         """Initialize the DataParser agent with optional configuration."""
         self.config = config or {}
 
-    def execute(self, raw_product_data: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(self, raw_product_data: Dict[str, Any]) -> Product:
         """
         Parse and normalize raw product data.
-        
+
         Args:
             raw_product_data: Raw product JSON from input source
-            
+
         Returns:
-            Normalized product dictionary with standardized keys:
+            Normalized Product record with standardized fields:
             - product_name
             - concentration
             - skin_type
@@ -36,17 +165,81 @@ class DataParserAgent:
             - usage_instructions
             - side_effects
             - price
+            - price_value
+            - price_currency
             - competitor_products
+
+        Raises:
+            pydantic.ValidationError: If the record does not match ProductRecord
+        """
+        if _conforms(raw_product_data):
+            return self._normalize(raw_product_data)
+        record_adapter, _ = _adapters()
+        return self._normalize(record_adapter.validate_python(raw_product_data))
+
+    def validate_many(
+        self, raw_products: List[Dict[str, Any]]
+    ) -> Tuple[List[Product], List[Dict[str, Any]]]:
         """
-        normalized = {
-            "product_name": raw_product_data.get("name", "Unknown Product"),
-            "concentration": raw_product_data.get("concentration", ""),
-            "skin_type": raw_product_data.get("skin_type", []),
-            "ingredients": raw_product_data.get("ingredients", []),
-            "benefits": raw_product_data.get("benefits", []),
-            "usage_instructions": raw_product_data.get("usage", ""),
-            "side_effects": raw_product_data.get("side_effects", ""),
-            "price": raw_product_data.get("price", ""),
-            "competitor_products": raw_product_data.get("competitor_products", {}),
-        }
-        return normalized
+        Validate and normalize a batch of records, quarantining bad ones in bulk.
+
+        If every row passes the fast ``_conforms`` check, rows are normalized
+        directly and pydantic is never loaded. Otherwise the whole batch is
+        validated in one pydantic call; if any rows fail, their indices are
+        read from the single aggregated error. Every other row already passed
+        that same strict (non-coercing) validation, so it is normalized
+        directly without a second pass or per-record exceptions.
+
+        Args:
+            raw_products: Raw product JSON records
+
+        Returns:
+            Tuple of (normalized valid products in input order, quarantined
+            entries as ``{"index", "record", "errors"}`` dicts)
+        """
+        raw_products = list(raw_products)
+        if all(map(_conforms, raw_products)):
+            return [self._normalize(record) for record in raw_products], []
+
+        from pydantic import ValidationError
+
+        _, catalog_adapter = _adapters()
+        try:
+            records = catalog_adapter.validate_python(raw_products)
+            return [self._normalize(record) for record in records], []
+        except ValidationError as exc:
+            errors_by_index: Dict[int, List[Dict[str, Any]]] = {}
+            for error in exc.errors(include_url=False, include_input=False):
+                index, *location = error["loc"]
+                errors_by_index.setdefault(index, []).append(
+                    {"loc": location, "msg": error["msg"], "type": error["type"]}
+                )
+
+        quarantined = [
+            {"index": index, "record": raw_products[index], "errors": errors}
+            for index, errors in sorted(errors_by_index.items())
+        ]
+        valid = [
+            self._normalize(record)
+            for index, record in enumerate(raw_products)
+            if index not in errors_by_index
+        ]
+        return valid, quarantined
+
+    def _normalize(self, record: Dict[str, Any]) -> Product:
+        """Map a validated record onto the normalized internal format."""
+        price = record.get("price", "")
+        price_value, price_currency = parse_price(price)
+        return Product(
+            product_name=record.get("name", "Unknown Product"),
+            concentration=record.get("concentration", ""),
+            skin_type=tuple(record.get("skin_type", ())),
+            ingredients=tuple(record.get("ingredients", ())),
+            benefits=tuple(record.get("benefits", ())),
+            usage_instructions=record.get("usage", ""),
+            side_effects=record.get("side_effects", ""),
+            price=price,
+            price_value=price_value,
+            price_currency=price_currency,
+            competitor_products=FrozenDict(record.get("competitor_products", {})),
+        )
@@ -0,0 +1,275 @@
+"""Generation Backends - Pluggable text-generation backends and a batching async client"""
+import abc
+import asyncio
+import hashlib
+from typing import Dict, Any, List, Set, Tuple
+from agents.cache import ResponseCache, prompt_key, stable_hash
+
+
+class GenerationBackend(abc.ABC):
+    """
+    Interface for text-generation backends.
+
+    Backends receive already-rendered prompts in batches and return one
+    completion per prompt, in order. Subclasses must implement
+    ``generate_batch``; one that does not cannot be instantiated.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Return one completion per prompt, in order."""
+
+    def identity(self) -> Dict[str, Any]:
+        """
+        Everything besides the prompt that determines a completion.
+
+        Part of every response cache key, so switching backend, model or
+        sampling parameters never returns another configuration's answers.
+        Subclasses with such settings extend it.
+        """
+        return {"backend": f"{type(self).__module__}.{type(self).__qualname__}"}
+
+
+class StubBackend(GenerationBackend):
+    """
+    Deterministic local backend for offline runs and tests.
+
+    The completion is the prompt's last line (the most specific input, e.g.
+    the question context) tagged with a short hash of the full prompt, so the
+    same prompt always yields the same text. An optional artificial latency
+    simulates a remote model.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        """Initialize the stub with an optional per-batch latency in seconds."""
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Return deterministic completions derived from each prompt."""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        completions = []
+        for prompt in prompts:
+            digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=4).hexdigest()
+            last_line = prompt.rstrip().rsplit("\n", 1)[-1].split(": ", 1)[-1]
+            completions.append(f"{last_line} [stub:{digest}]")
+        return completions
+
+
+# ChatOpenAI settings that do not change completions (kept out of cache keys)
+_CLIENT_SETTINGS = frozenset({"api_key", "openai_api_key", "base_url", "timeout", "max_retries", "http_client"})
+
+
+class LangChainBackend(GenerationBackend):
+    """
+    Backend calling an OpenAI chat model through ``langchain-openai``.
+
+    The dependency is imported only when this backend is constructed, so the
+    rest of the system runs without it installed.
+    """
+
+    name = "openai"
+
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.2, **kwargs: Any):
+        """Create the chat model; extra kwargs are passed to ``ChatOpenAI``."""
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError as exc:
+            raise ImportError(
+                "LangChainBackend requires the 'langchain-openai' package "
+                "(pip install -r requirements.txt)"
+            ) from exc
+        self.model_name = model
+        self.sampling = {"temperature": temperature, **kwargs}
+        self.model = ChatOpenAI(model=model, temperature=temperature, **kwargs)
+
+    def identity(self) -> Dict[str, Any]:
+        """Backend class plus model name and sampling parameters."""
+        return {
+            **super().identity(),
+            "model": self.model_name,
+            "sampling": {key: value for key, value in self.sampling.items() if key not in _CLIENT_SETTINGS},
+        }
+
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Send the prompts as one batched request and return message contents."""
+        messages = await self.model.abatch(prompts)
+        return [message.content for message in messages]
+
+
+class GenerationClient:
+    """
+    Async client that batches, bounds, times out and retries generation calls.
+
+    Responsibility: Let thousands of concurrent callers ``await generate(...)``
+    while the backend sees at most ``max_concurrency`` in-flight batches of up
+    to ``batch_size`` prompts. Requests arriving within ``batch_wait`` seconds
+    of each other are coalesced into one backend call. Each call is bounded
+    by ``timeout`` and retried up to ``retries`` times with exponential backoff.
+
+    Prompts are described as a template plus variables, so callers and any
+    caching layer see the stable template separately from per-product values.
+    With a ResponseCache, previously answered prompts skip the backend, and
+    concurrent identical requests (from any agent) always share one call.
+
+    The client binds its queue to the running event loop on first use and
+    rebinds transparently if later used from a different loop.
+    """
+
+    def __init__(
+        self,
+        backend: GenerationBackend | None = None,
+        max_concurrency: int = 8,
+        batch_size: int = 32,
+        batch_wait: float = 0.005,
+        timeout: float = 30.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        cache: ResponseCache | None = None,
+    ):
+        """Configure the client; defaults to the offline StubBackend."""
+        self.backend = backend or StubBackend()
+        self.cache = cache
+        self._backend_key = stable_hash(self.backend.identity())
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "deduplicated": 0,
+            "batches": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        # Strong references to running batches: the event loop only keeps weak ones
+        self._batches: Set[asyncio.Task] = set()
+
+    async def generate(self, template: str, variables: Dict[str, Any]) -> str:
+        """
+        Render ``template`` with ``variables`` and return the backend's completion.
+
+        Raises:
+            Exception: The backend's last error once all retries are exhausted
+        """
+        self._bind_loop()
+        self.stats["requests"] += 1
+        key = prompt_key(template, variables, self._backend_key)
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.stats["deduplicated"] += 1
+            return await asyncio.shield(in_flight)
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        future = self._loop.create_future()
+        self._in_flight[key] = future
+        future.add_done_callback(lambda done: self._settle(key, done))
+        await self._queue.put((template.format(**variables), future))
+        return await asyncio.shield(future)
+
+    async def generate_many(self, template: str, variables_list: List[Dict[str, Any]]) -> List[str]:
+        """Generate completions for many variable sets concurrently, in order."""
+        return list(
+            await asyncio.gather(*(self.generate(template, variables) for variables in variables_list))
+        )
+
+    def _settle(self, key: str, future: asyncio.Future) -> None:
+        """Drop a finished request from the in-flight map and cache its result."""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if self.cache is not None and not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    async def aclose(self) -> None:
+        """Stop the background dispatcher and wait for the batches already sent."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        self._dispatcher = None
+        self._loop = None
+
+    def _bind_loop(self) -> None:
+        """Create the queue and dispatcher for the currently running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._dispatcher is not None and not self._dispatcher.done():
+            return
+        self._loop = loop
+        self._in_flight = {}
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._batches = set()
+        self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """Collect queued prompts into batches and launch them under the concurrency bound."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._semaphore.acquire()
+            task = self._loop.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Call the backend for one batch with timeout and retries, resolving futures."""
+        try:
+            prompts = [prompt for prompt, _ in batch]
+            error: BaseException | None = None
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                try:
+                    self.stats["batches"] += 1
+                    completions = await asyncio.wait_for(
+                        self.backend.generate_batch(prompts), self.timeout
+                    )
+                    if len(completions) != len(prompts):
+                        raise ValueError(
+                            f"Backend returned {len(completions)} completions for {len(prompts)} prompts"
+                        )
+                    for (_, future), completion in zip(batch, completions):
+                        if not future.done():
+                            future.set_result(completion)
+                    return
+                except (asyncio.TimeoutError, Exception) as exc:
+                    error = exc
+            self.stats["failures"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            self._semaphore.release()
@@ -0,0 +1,141 @@
+"""Incremental Regenerator - Rebuilds only the blocks and pages whose inputs changed"""
+import json
+from pathlib import Path
+from typing import Dict, Any, Set, Tuple
+from agents.output_writer import atomic_write
+from agents.records import PagePlan, Question, to_dict
+
+# Bump when the snapshot layout changes; older snapshots trigger a full run
+SNAPSHOT_VERSION = 1
+
+
+class IncrementalRegenerator:
+    """
+    Re-runs the workflow for a product against a snapshot of its previous run.
+
+    Responsibility: Compare the newly normalized product with the previous
+    one, then use the field dependencies declared by the agents
+    (``QuestionGeneratorAgent.input_fields``, ``ContentBlockAgent.block_fields``,
+    ``TemplateEngineAgent.page_blocks``, ``PageAssemblerAgent.page_sources``)
+    to regenerate questions and content blocks only where their inputs changed
+    and to report which output files actually need rewriting.
+
+    Autonomy: Runs the orchestrator's workflow nodes, so the stage cache and
+    observers apply as in a full run; unchanged questions and content blocks
+    are pre-seeded into the state from the snapshot, and nodes whose outputs
+    are seeded are skipped. The snapshot is a plain JSON-serializable dict
+    (dict views of the records, tagged with ``SNAPSHOT_VERSION`` and the
+    orchestrator's ``cache_version``, so a template or configuration change
+    regenerates every page) that the caller persists between runs.
+    """
+
+    def __init__(self, orchestrator):
+        """Bind to an orchestrator's workflow graph and agent instances."""
+        self.workflow_graph = orchestrator.workflow_graph
+        self.question_gen = orchestrator.question_gen
+        self.content_blocker = orchestrator.content_blocker
+        self.template_engine = orchestrator.template_engine
+        self.page_assembler = orchestrator.page_assembler
+        self.pipeline_version = orchestrator.cache_version()
+
+    def affected_pages(self, changed: Set[str]) -> Set[str]:
+        """
+        Output files depending on any changed field, question list or block.
+
+        Args:
+            changed: Names of changed normalized fields, ``"questions"`` and blocks
+        """
+        changed_blocks = self.content_blocker.affected_blocks(changed) | changed
+        changed_templates = {
+            page
+            for page, blocks in self.template_engine.page_blocks.items()
+            if changed_blocks.intersection(blocks)
+        }
+        sources = changed_templates | ({"questions"} & changed)
+        return {
+            filename
+            for filename, page_sources in self.page_assembler.page_sources.items()
+            if sources.intersection(page_sources)
+        }
+
+    def run(
+        self, raw_product_json: Dict[str, Any], snapshot: Dict[str, Any] | None = None
+    ) -> Tuple[Dict[str, Any], Set[str], Dict[str, Any]]:
+        """
+        Regenerate a product's pages, reusing everything unaffected by its changes.
+
+        Args:
+            raw_product_json: Raw product data JSON
+            snapshot: Snapshot returned by the previous run, or None for a full
+                run (as is a snapshot of another ``SNAPSHOT_VERSION`` or one
+                taken with other templates or agent configuration)
+
+        Returns:
+            Tuple of (final pages, names of pages that changed, new snapshot)
+        """
+        graph = self.workflow_graph
+        state: Dict[str, Any] = {"raw_product": raw_product_json}
+
+        if (
+            not snapshot
+            or snapshot.get("version") != SNAPSHOT_VERSION
+            or snapshot.get("pipeline") != self.pipeline_version
+        ):
+            graph.run(state)
+            changed_pages = set(self.page_assembler.page_sources)
+        else:
+            graph.nodes["parse_data"].run(state)
+            current, previous = to_dict(state["parsed_product"]), snapshot["parsed_product"]
+            changed = {
+                key
+                for key in set(current) | set(previous)
+                if current.get(key) != previous.get(key)
+            }
+
+            questions = [Question(**question) for question in snapshot["questions"]]
+            if changed.intersection(self.question_gen.input_fields):
+                graph.nodes["generate_questions"].run(state)
+                if state["questions"] != questions:
+                    changed.add("questions")
+            else:
+                state["questions"] = questions
+
+            # Rebuild only the blocks whose inputs changed, keep the rest: the
+            # content block node runs under a plan naming just those blocks
+            content_blocks = dict(snapshot["content_blocks"])
+            affected = self.content_blocker.affected_blocks(changed)
+            if affected:
+                blocks = tuple(block for block in self.content_blocker.block_fields if block in affected)
+                plan = PagePlan((), (), blocks, True)
+                content_blocks.update(
+                    graph.nodes["create_content_blocks"].compute({**state, "page_plan": plan})["content_blocks"]
+                )
+            state["content_blocks"] = content_blocks
+            graph.run(state)
+            changed_pages = self.affected_pages(changed)
+
+        new_snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "pipeline": self.pipeline_version,
+            "parsed_product": to_dict(state["parsed_product"]),
+            "questions": to_dict(state["questions"]),
+            "content_blocks": to_dict(state["content_blocks"]),
+        }
+        return state["final_pages"], changed_pages, new_snapshot
+
+
+def load_snapshot(path: str | Path) -> Dict[str, Any] | None:
+    """Read a previously saved snapshot, or None if there is none."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_snapshot(path: str | Path, snapshot: Dict[str, Any]) -> None:
+    """Persist a snapshot next to the generated pages (atomically)."""
+    atomic_write(
+        Path(path),
+        json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
@@ -0,0 +1,168 @@
+"""Instrumentation - Per-node timing, allocation and size tracing for the workflow graph"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict, Any, List
+from agents.records import json_default
+
+
+def _json_size(value: Any) -> int:
+    """Approximate payload size as the length of its compact JSON encoding."""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=json_default))
+    except (TypeError, ValueError):
+        return 0
+
+
+class StageProfiler:
+    """
+    Workflow observer recording per-node wall time, CPU time, allocations and sizes.
+
+    Responsibility: Attach to a WorkflowGraph (``Orchestrator.add_observer``)
+    and record one span per node execution, keeping running per-node totals.
+    Spans can be exported as structured log records, a Prometheus text dump
+    or Chrome trace-event JSON (load in chrome://tracing or Perfetto).
+
+    Nothing is measured while the profiler is detached; the workflow only
+    pays for the optional measurements that are enabled here.
+    """
+
+    def __init__(
+        self,
+        track_allocations: bool = False,
+        measure_sizes: bool = True,
+        logger: logging.Logger | None = None,
+        max_spans: int = 100_000,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            track_allocations: Record net allocated bytes per node via tracemalloc
+            measure_sizes: Record input/output sizes (compact JSON length)
+            logger: If given, every span is logged as a JSON structured record
+            max_spans: Cap on retained spans for trace export (totals are unbounded)
+        """
+        self.track_allocations = track_allocations
+        # Kept after ``close`` so exports still include the recorded allocations
+        self.allocations_recorded = track_allocations
+        self.measure_sizes = measure_sizes
+        self.logger = logger
+        self.max_spans = max_spans
+        self.spans: List[Dict[str, Any]] = []
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._epoch_ns = time.perf_counter_ns()
+        # Only a tracemalloc session started here is stopped by ``close``
+        self._owns_tracemalloc = track_allocations and not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+
+    def close(self) -> None:
+        """
+        Stop allocation tracking once profiling is over.
+
+        tracemalloc slows every allocation in the process, so it is stopped
+        here if this profiler started it. Recorded spans and totals remain
+        available for export.
+        """
+        self.track_allocations = False
+        if self._owns_tracemalloc:
+            self._owns_tracemalloc = False
+            tracemalloc.stop()
+
+    def on_node_start(self, node, state: Dict[str, Any]) -> tuple:
+        """Capture clocks (and heap usage) before the node runs."""
+        allocated = tracemalloc.get_traced_memory()[0] if self.track_allocations else 0
+        return (time.perf_counter_ns(), time.thread_time_ns(), allocated)
+
+    def on_node_end(self, node, state, outputs, error, token) -> None:
+        """Record a span for the finished node."""
+        end_ns = time.perf_counter_ns()
+        cpu_ns = time.thread_time_ns() - token[1]
+        span = {
+            "node": node.name,
+            "start_us": (token[0] - self._epoch_ns) / 1000,
+            "wall_ms": (end_ns - token[0]) / 1e6,
+            "cpu_ms": cpu_ns / 1e6,
+            "thread": threading.get_ident(),
+            "ok": error is None,
+        }
+        if self.track_allocations:
+            span["alloc_bytes"] = tracemalloc.get_traced_memory()[0] - token[2]
+        if self.measure_sizes:
+            span["input_bytes"] = sum(_json_size(state.get(key)) for key in node.inputs)
+            span["output_bytes"] = _json_size(outputs) if outputs is not None else 0
+
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            totals = self.totals.setdefault(
+                node.name,
+                {"calls": 0, "errors": 0, "wall_ms": 0.0, "cpu_ms": 0.0,
+                 "alloc_bytes": 0, "input_bytes": 0, "output_bytes": 0},
+            )
+            totals["calls"] += 1
+            totals["errors"] += 0 if span["ok"] else 1
+            for key in ("wall_ms", "cpu_ms", "alloc_bytes", "input_bytes", "output_bytes"):
+                totals[key] += span.get(key, 0)
+
+        if self.logger is not None:
+            self.logger.info(json.dumps({"event": "workflow_node", **span}))
+
+    def to_log_records(self) -> List[Dict[str, Any]]:
+        """Retained spans as structured records."""
+        with self._lock:
+            return [dict(span) for span in self.spans]
+
+    def to_prometheus(self, prefix: str = "kasparro_node") -> str:
+        """Per-node totals in the Prometheus text exposition format."""
+        metrics = [
+            ("calls", "calls_total", "Workflow node executions", 1),
+            ("errors", "errors_total", "Workflow node executions that raised", 1),
+            ("wall_ms", "wall_seconds_total", "Wall-clock time spent in the node", 1e-3),
+            ("cpu_ms", "cpu_seconds_total", "Thread CPU time spent in the node", 1e-3),
+        ]
+        if self.allocations_recorded:
+            metrics.append(("alloc_bytes", "alloc_bytes_total", "Net bytes allocated by the node", 1))
+        if self.measure_sizes:
+            metrics.append(("input_bytes", "input_bytes_total", "JSON size of node inputs", 1))
+            metrics.append(("output_bytes", "output_bytes_total", "JSON size of node outputs", 1))
+
+        with self._lock:
+            totals = {name: dict(values) for name, values in self.totals.items()}
+        lines = []
+        for key, suffix, help_text, scale in metrics:
+            metric = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, values in totals.items():
+                lines.append(f'{metric}{{node="{name}"}} {values[key] * scale:g}')
+        return "\n".join(lines) + "\n"
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Retained spans as Chrome trace-event JSON (complete ``"X"`` events)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": span["node"],
+                "cat": "workflow",
+                "ph": "X",
+                "ts": span["start_us"],
+                "dur": span["wall_ms"] * 1000,
+                "pid": pid,
+                "tid": span["thread"],
+                "args": {
+                    key: value
+                    for key, value in span.items()
+                    if key not in ("node", "start_us", "wall_ms", "thread")
+                },
+            }
+            for span in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,155 @@
+"""Interning - Shared immutable instances of static page structures"""
+import hashlib
+import json
+import threading
+import weakref
+from typing import Dict, Any
+
+_lock = threading.RLock()
+# Canonical JSON -> shared instance, and identity -> shared id. Entries are
+# weak: a structure leaves the registry once nothing else holds it, so
+# long-running processes (e.g. GenerationService rebuilding its
+# CompetitorIndex) do not accumulate every structure ever interned.
+_by_json: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+_by_id: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+_ids: Dict[int, str] = {}
+
+REF_KEY = "$ref"
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable and cannot be modified")
+
+
+class FrozenList(list):
+    """
+    Immutable list used for interned structures.
+
+    Subclassing ``list`` keeps it transparent to both JSON backends and to
+    equality checks against ordinary lists; every mutating method raises.
+    Instances that were not interned (e.g. record fields) unpickle as plain
+    frozen copies.
+    """
+
+    __slots__ = ("__weakref__",)
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        ref = _ids.get(id(self))
+        if ref is None:
+            return type(self), (list(self),)
+        return _restore, (ref, list(self))
+
+
+class FrozenDict(dict):
+    """Immutable dict used for interned structures and record fields (see FrozenList)."""
+
+    __slots__ = ("__weakref__",)
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    pop = popitem = clear = update = setdefault = _immutable
+
+    def __reduce__(self):
+        ref = _ids.get(id(self))
+        if ref is None:
+            return type(self), (dict(self),)
+        return _restore, (ref, dict(self))
+
+
+def _fields(value: Any) -> Dict[str, Any] | None:
+    """Shallow field view of a dataclass record (see ``agents.records``), else None."""
+    names = getattr(type(value), "__dataclass_fields__", None)
+    return None if names is None else {name: getattr(value, name) for name in names}
+
+
+def _freeze(value: Any) -> Any:
+    """Build a frozen container whose nested structures are interned too."""
+    if isinstance(value, dict):
+        return FrozenDict((key, intern(item)) for key, item in value.items())
+    return FrozenList(intern(item) for item in value)
+
+
+def intern(value: Any) -> Any:
+    """
+    Return the shared immutable instance equal to ``value``.
+
+    Structures are identified by their JSON content, so the same value yields
+    the same instance (and the same id) in every process and every run.
+    Immutable records are shared as they are; scalars are returned unchanged.
+    The registry holds shared instances weakly: callers keep what they intern
+    alive for as long as they need it.
+    """
+    record = _fields(value) is not None
+    if not (record or isinstance(value, (dict, list))):
+        return value
+    key = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_fields)
+    if record:
+        key = f"{type(value).__qualname__}:{key}"
+    shared = _by_json.get(key)
+    if shared is not None:
+        return shared
+    with _lock:
+        shared = _by_json.get(key)
+        if shared is None:
+            shared = value if record else _freeze(value)
+            ref = "s" + hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+            _by_id[ref] = shared
+            _ids[id(shared)] = ref
+            weakref.finalize(shared, _ids.pop, id(shared), None)
+            _by_json[key] = shared
+    return shared
+
+
+def _restore(ref: str | None, value: Any) -> Any:
+    """Unpickle an interned structure back onto this process's shared instance."""
+    shared = _by_id.get(ref) if ref is not None else None
+    return shared if shared is not None else intern(value)
+
+
+def shared_id(value: Any) -> str | None:
+    """Id of an interned instance, or None for any other object."""
+    return _ids.get(id(value))
+
+
+def shared_value(ref: str) -> Any:
+    """Interned instance for an id (``KeyError`` if unknown or no longer alive in this process)."""
+    return _by_id[ref]
+
+
+def deduplicate(value: Any, used: Dict[str, Any]) -> Any:
+    """
+    Replace interned sub-structures of ``value`` with ``{"$ref": <id>}``.
+
+    The replaced structures are recorded in ``used`` by id, so a writer can
+    emit each shared structure once (see ``shared_table``) even after the
+    pages referencing it are gone. The input is not modified; containers
+    without shared parts are copied shallowly.
+    """
+    ref = _ids.get(id(value))
+    if ref is not None:
+        used[ref] = value
+        return {REF_KEY: ref}
+    fields = _fields(value)
+    if fields is not None:
+        value = fields
+    if isinstance(value, dict):
+        return {key: deduplicate(item, used) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [deduplicate(item, used) for item in value]
+    return value
+
+
+def shared_table(used: Dict[str, Any]) -> Dict[str, Any]:
+    """The structures collected by ``deduplicate``, sorted by id."""
+    return {ref: used[ref] for ref in sorted(used)}
+
+
+def resolve(value: Any, table: Dict[str, Any]) -> Any:
+    """Expand ``{"$ref": <id>}`` markers produced by ``deduplicate`` using ``table``."""
+    if isinstance(value, dict):
+        if len(value) == 1 and REF_KEY in value:
+            return table[value[REF_KEY]]
+        return {key: resolve(item, table) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, table) for item in value]
+    return value
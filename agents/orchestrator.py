@@ -1,10 +1,109 @@
 """Orchestrator Agent - Central coordinator for multi-agent workflow"""
-from typing import Dict, Any, List
-from agents.data_parser import DataParserAgent
-from agents.question_generator import QuestionGeneratorAgent
-from agents.content_blocker import ContentBlockAgent
-from agents.template_engine import TemplateEngineAgent
-from agents.page_assembler import PageAssemblerAgent
+import importlib
+import os
+from functools import partial
+from typing import Dict, Any, FrozenSet, List, Awaitable, Callable, Iterable, Iterator, Sequence, Tuple, TYPE_CHECKING
+from agents.records import CompetitorProfile, PagePlan, Product, Question
+from agents.workflow import WorkflowGraph, WorkflowNode
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from agents.cache import StageCache
+    from agents.competitors import CompetitorIndex
+    from agents.content_blocker import ContentBlockAgent
+    from agents.data_parser import DataParserAgent
+    from agents.generation import GenerationClient
+    from agents.page_assembler import PageAssemblerAgent
+    from agents.question_generator import QuestionGeneratorAgent
+    from agents.template_engine import TemplateEngineAgent
+
+# Per-process orchestrator kept warm across chunks by run_batch workers
+_WORKER_ORCHESTRATOR: "Orchestrator | None" = None
+
+# The nodes the Orchestrator registers itself; run_columnar knows how to run
+# exactly these stage by stage
+_BUILTIN_NODES = frozenset({
+    "parse_data",
+    "generate_questions",
+    "lookup_competitors",
+    "create_content_blocks",
+    "apply_templates",
+    "assemble_pages",
+})
+# Products per stage-by-stage slice in run_columnar
+_COLUMNAR_SLICE = 64
+# Orchestrator attributes holding the five agents
+_AGENT_NAMES = ("data_parser", "question_gen", "content_blocker", "template_engine", "page_assembler")
+
+
+def init_worker(
+    cache_path: str | None = None,
+    competitor_index: "CompetitorIndex | None" = None,
+    agents: Dict[str, Tuple[type, Dict[str, Any]]] | None = None,
+) -> None:
+    """
+    Pool initializer: build one orchestrator per worker process.
+
+    The worker's agents are then reused by every ``run_chunk`` call it
+    serves, so pools that run workflow chunks (``run_batch``, the generation
+    service) pass this as ``initializer`` with ``(cache_path, competitor_index)``,
+    plus the parent's ``agent_specs()`` so the worker's agents are built
+    with the same classes and configuration.
+    """
+    global _WORKER_ORCHESTRATOR
+    from agents.cache import SqliteStore, StageCache
+
+    cache = StageCache(store=SqliteStore(cache_path)) if cache_path else None
+    orchestrator = Orchestrator(cache=cache, competitor_index=competitor_index)
+    for name, (agent_class, config) in (agents or {}).items():
+        setattr(orchestrator, name, agent_class(config))
+    _WORKER_ORCHESTRATOR = orchestrator
+
+
+def run_chunk(
+    chunk: List[Dict[str, Any]], pages: Sequence[str] | None = None
+) -> List[Dict[str, Any]]:
+    """Run the workflow for a chunk of products on the worker's orchestrator (see ``init_worker``)."""
+    results = _WORKER_ORCHESTRATOR.run_columnar(chunk, pages)
+    cache = _WORKER_ORCHESTRATOR.cache
+    if cache is not None and cache.store is not None:
+        cache.store.flush()
+    return results
+
+
+def run_node(name: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute one workflow node on the worker's orchestrator (staged pipeline process stages)."""
+    outputs = _WORKER_ORCHESTRATOR.workflow_graph.nodes[name].compute(state)
+    cache = _WORKER_ORCHESTRATOR.cache
+    if cache is not None and cache.store is not None:
+        # Commit now, so the parent and sibling stages see this node's entries
+        cache.store.flush()
+    return outputs
+
+
+class _LazyAgent:
+    """
+    Orchestrator attribute that imports and builds its agent on first access.
+
+    The agent is then stored on the instance, so later reads are plain
+    attribute lookups. Keeps importing the orchestrator (and constructing
+    one) cheap: an agent's module and its dependencies, such as pydantic for
+    DataParserAgent, load only once a node or caller actually uses it.
+    """
+
+    def __init__(self, module: str, class_name: str):
+        self.module = module
+        self.class_name = class_name
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        agent_class = getattr(importlib.import_module(self.module), self.class_name)
+        agent = instance.__dict__[self.name] = agent_class()
+        return agent
 
 
 class Orchestrator:
@@ -12,70 +111,595 @@ class Orchestrator:
     Central coordinator that manages the multi-agent workflow.
     
     Responsibilities:
-    - Encodes workflow as a Directed Acyclic Graph (DAG)
-    - Dynamically routes data between agents
+    - Encodes workflow as a Directed Acyclic Graph (DAG) of declared nodes
+    - Dynamically routes data between agents via each node's inputs/outputs
     - Maintains shared state dictionary
     - Provides clear agent boundaries and orchestration logic
+
+    Agents are built lazily, on first use, together with their imports.
+
+    Runs may request a subset of the output pages; the graph then evaluates
+    only the stages and content blocks those pages depend on (see
+    ``page_plan``).
     """
 
-    def __init__(self):
-        """Initialize all agents as independent, modular components."""
-        self.data_parser = DataParserAgent()
-        self.question_gen = QuestionGeneratorAgent()
-        self.content_blocker = ContentBlockAgent()
-        self.template_engine = TemplateEngineAgent()
-        self.page_assembler = PageAssemblerAgent()
+    data_parser: "DataParserAgent" = _LazyAgent("agents.data_parser", "DataParserAgent")
+    question_gen: "QuestionGeneratorAgent" = _LazyAgent(
+        "agents.question_generator", "QuestionGeneratorAgent"
+    )
+    content_blocker: "ContentBlockAgent" = _LazyAgent("agents.content_blocker", "ContentBlockAgent")
+    template_engine: "TemplateEngineAgent" = _LazyAgent("agents.template_engine", "TemplateEngineAgent")
+    page_assembler: "PageAssemblerAgent" = _LazyAgent("agents.page_assembler", "PageAssemblerAgent")
+
+    def __init__(
+        self,
+        cache: "StageCache | None" = None,
+        generation: "GenerationClient | None" = None,
+        competitor_index: "CompetitorIndex | None" = None,
+    ):
+        """
+        Initialize the workflow graph over independent, modular agents.
+
+        Args:
+            cache: Optional stage cache; when given, every registered node is
+                memoized on a content hash of its inputs
+            generation: Client for model-backed generation in ``run_async``
+                (defaults to one over the deterministic local StubBackend)
+            competitor_index: Optional catalog-wide competitor index; when
+                given, comparison blocks carry each competitor's profile
+        """
+        self.cache = cache
+        self._generation = generation
+        self.competitor_index = competitor_index
+        self._page_plans: Dict[FrozenSet[str], PagePlan] = {}
+        self._cache_version: str | None = None
 
         # Define workflow as a DAG (Directed Acyclic Graph)
-        # Each node represents an agent, edges represent data flow
-        self.workflow_graph = [
-            "parse_data",
-            "generate_questions",
-            "create_content_blocks",
+        # Each node declares the state keys it reads and writes; edges are
+        # derived from that data flow rather than from list order
+        self.workflow_graph = WorkflowGraph()
+        # Agent 1: Parse and normalize raw product data
+        self.register_node(
+            "parse_data", lambda raw: self.data_parser.execute(raw),
+            inputs=["raw_product"], outputs=["parsed_product"],
+        )
+        # Agent 2: Generate FAQ questions from parsed data
+        self.register_node(
+            "generate_questions", lambda parsed: self.question_gen.execute(parsed),
+            inputs=["parsed_product"], outputs=["questions"],
+            async_fn=lambda parsed: self.question_gen.execute_async(parsed, self.generation),
+        )
+        if competitor_index is not None:
+            # O(1) profile lookups; not memoized, so cached content blocks are
+            # keyed on the profiles themselves rather than on the product alone
+            self.workflow_graph.add_node(
+                "lookup_competitors",
+                lambda parsed: competitor_index.lookup(parsed.competitor_products),
+                inputs=["parsed_product"], outputs=["competitors"],
+            )
+        # Agent 3: Create reusable content blocks
+        # (only those the requested pages use, when the run carries a page plan)
+        self.register_node(
+            "create_content_blocks", self._content_blocks,
+            inputs=["parsed_product", "questions"], outputs=["content_blocks"],
+            async_fn=self._content_blocks_async,
+            options=["page_plan", "competitors"],
+        )
+        # Agent 4: Apply page-specific templates to content blocks
+        self.register_node(
             "apply_templates",
+            lambda blocks, page_plan=None: self.template_engine.execute(
+                blocks, None if page_plan is None else page_plan.templates
+            ),
+            inputs=["content_blocks"], outputs=["templated_pages"],
+            options=["page_plan"],
+        )
+        # Agent 5: Assemble final JSON pages for each page type
+        self.register_node(
             "assemble_pages",
+            lambda templated, questions, page_plan=None: self.page_assembler.execute(
+                templated, questions, None if page_plan is None else page_plan.outputs
+            ),
+            inputs=["templated_pages", "questions"], outputs=["final_pages"],
+            options=["page_plan"],
+        )
+
+    def _content_blocks(
+        self,
+        parsed: Product,
+        questions: List[Question],
+        page_plan: PagePlan | None = None,
+        competitors: Tuple[CompetitorProfile, ...] | None = None,
+    ) -> Dict[str, Any]:
+        """Node callable for ContentBlockAgent, applying the run's page plan and competitor profiles."""
+        return self.content_blocker.execute(
+            parsed,
+            questions,
+            None if page_plan is None else page_plan.blocks,
+            None if competitors is None else {"competitors": competitors},
+        )
+
+    async def _content_blocks_async(
+        self,
+        parsed: Product,
+        questions: List[Question],
+        page_plan: PagePlan | None = None,
+        competitors: Tuple[CompetitorProfile, ...] | None = None,
+    ) -> Dict[str, Any]:
+        """Async node callable for ContentBlockAgent (generated benefit descriptions)."""
+        return await self.content_blocker.execute_async(
+            parsed,
+            questions,
+            self.generation,
+            None if page_plan is None else page_plan.blocks,
+            None if competitors is None else {"competitors": competitors},
+        )
+
+    @property
+    def generation(self) -> "GenerationClient":
+        """Generation client for ``run_async`` (a StubBackend client unless one was given)."""
+        if self._generation is None:
+            from agents.generation import GenerationClient
+
+            self._generation = GenerationClient()
+        return self._generation
+
+    def register_node(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Sequence[str],
+        outputs: Sequence[str],
+        async_fn: Callable[..., Awaitable[Any]] | None = None,
+        options: Sequence[str] = (),
+    ) -> WorkflowNode:
+        """
+        Register an agent node in the workflow DAG.
+
+        New agents plug in by declaring which state keys they read and write;
+        the scheduler places them automatically, without changes to ``run``.
+        When the orchestrator has a cache, the node is memoized per stage,
+        under this orchestrator's ``cache_version``.
+
+        Args:
+            name: Unique node name
+            fn: Agent callable, receiving the input values positionally
+            inputs: State keys the node reads
+            outputs: State keys the node writes
+            async_fn: Optional coroutine variant of ``fn`` used by ``run_async``
+            options: State keys passed to ``fn`` as keyword arguments when present
+
+        Returns:
+            The registered WorkflowNode
+        """
+        if self.cache is not None:
+            fn = self.cache.memoize(name, fn, self.cache_version)
+        return self.workflow_graph.add_node(name, fn, inputs, outputs, async_fn, options)
+
+    def agent_specs(self) -> Dict[str, Tuple[type, Dict[str, Any]]]:
+        """
+        Class and configuration of every agent built so far, by attribute name.
+
+        Agents hold compiled templates and cannot be pickled, so worker
+        processes rebuild them from these specs (see ``init_worker``).
+        """
+        return {
+            name: (type(agent), agent.config)
+            for name in _AGENT_NAMES
+            if (agent := self.__dict__.get(name)) is not None
+        }
+
+    def local_only(self) -> List[str]:
+        """
+        Parts of this orchestrator that worker processes cannot reproduce.
+
+        Workers rebuild the built-in graph and the agents (``agent_specs``),
+        but node callables and observers are arbitrary in-process objects:
+        nodes added with ``register_node`` and attached observers would be
+        silently missing from a worker's run. The generation client is not
+        listed; only ``run_async`` uses it, and that never runs in workers.
+
+        Returns:
+            Human-readable descriptions; empty if workers are equivalent
+        """
+        return [
+            *(f"node {name!r}" for name in self.workflow_graph.nodes if name not in _BUILTIN_NODES),
+            *(f"observer {type(observer).__name__}" for observer in self.workflow_graph.observers),
         ]
 
-    def run(self, raw_product_json: Dict[str, Any]) -> Dict[str, Any]:
+    def cache_version(self) -> str:
+        """
+        Version token mixed into every stage cache key.
+
+        Hashes the page template files and each agent's configuration, so a
+        template edit or a configuration change misses the cache instead of
+        returning pages built the old way. Computed once, on the first cached
+        stage call (which builds the agents).
+        """
+        if self._cache_version is None:
+            from agents.cache import stable_hash
+            from agents.template_compiler import templates_fingerprint
+
+            agents = {
+                name: getattr(self, name).config
+                for name in _AGENT_NAMES
+            }
+            self._cache_version = stable_hash({
+                "templates": templates_fingerprint(self.template_engine.config.get("templates_dir")),
+                "agents": agents,
+            })
+        return self._cache_version
+
+    def page_plan(self, pages: Iterable[str]) -> PagePlan:
+        """
+        Work back from requested output pages to the work they need.
+
+        Each output file (``PageAssemblerAgent.page_sources``) names the
+        templated pages it is assembled from, each templated page
+        (``TemplateEngineAgent.page_blocks``) the content blocks it reads, and
+        each block (``ContentBlockAgent.block_fields``) whether it reads the
+        FAQ questions. Plans are computed once per distinct page set.
+
+        Args:
+            pages: Output filenames, e.g. ``["product_page.json"]``
+
+        Returns:
+            PagePlan with the outputs, templated pages and blocks to build (in
+            workflow order) and whether FAQ questions are needed
+
+        Raises:
+            ValueError: If a page is not produced by any template
+        """
+        key = frozenset(pages)
+        plan = self._page_plans.get(key)
+        if plan is not None:
+            return plan
+
+        page_sources = self.page_assembler.page_sources
+        unknown = sorted(key.difference(page_sources))
+        if unknown:
+            raise ValueError(f"Unknown pages {unknown}; available: {sorted(page_sources)}")
+        outputs = tuple(output for output in page_sources if output in key)
+        sources = {source for output in outputs for source in page_sources[output]}
+        page_blocks = self.template_engine.page_blocks
+        templates = tuple(page for page in page_blocks if page in sources)
+        needed = {block for page in templates for block in page_blocks[page]}
+        block_fields = self.content_blocker.block_fields
+        blocks = tuple(block for block in block_fields if block in needed)
+        questions = "questions" in sources or any(
+            "questions" in block_fields[block] for block in blocks
+        )
+        plan = self._page_plans[key] = PagePlan(outputs, templates, blocks, questions)
+        return plan
+
+    def initial_state(
+        self, raw_product_json: Dict[str, Any], pages: Iterable[str] | None
+    ) -> Dict[str, Any]:
+        """
+        Fresh workflow state for one product, restricted to ``pages`` if given.
+
+        A Product (e.g. a valid row of ``DataParserAgent.validate_many``) is
+        seeded as the parsed product, so parsing is not repeated.
+        """
+        if isinstance(raw_product_json, Product):
+            state: Dict[str, Any] = {"parsed_product": raw_product_json}
+        else:
+            state = {"raw_product": raw_product_json}
+        if pages is not None:
+            plan = state["page_plan"] = self.page_plan(pages)
+            if not plan.questions:
+                # No requested page reads the questions, so supplying an empty
+                # list up front skips QuestionGeneratorAgent entirely
+                state["questions"] = []
+        return state
+
+    def add_observer(self, observer: Any) -> None:
+        """
+        Attach an observer (e.g. ``StageProfiler``) around every workflow node.
+
+        See ``WorkflowGraph.add_observer`` for the observer protocol.
+        """
+        self.workflow_graph.add_observer(observer)
+
+    def remove_observer(self, observer: Any) -> None:
+        """Detach a previously attached observer."""
+        self.workflow_graph.remove_observer(observer)
+
+    def run(
+        self, raw_product_json: Dict[str, Any], pages: Iterable[str] | None = None
+    ) -> Dict[str, Any]:
         """
         Execute the multi-agent workflow orchestration.
         
         Args:
             raw_product_json: Raw product data JSON
+            pages: Optional output filenames to generate (default: all pages);
+                only the stages and blocks they depend on run
             
         Returns:
             Dict containing final pages: {"faq", "product_page", "comparison_page"}
         """
         # Shared state dictionary passed between agents
-        state: Dict[str, Any] = {"raw_product": raw_product_json}
+        state = self.initial_state(raw_product_json, pages)
 
-        # Execute each node in the workflow DAG
-        for node in self.workflow_graph:
-            if node == "parse_data":
-                # Agent 1: Parse and normalize raw product data
-                state["parsed_product"] = self.data_parser.execute(state["raw_product"])
-
-            elif node == "generate_questions":
-                # Agent 2: Generate FAQ questions from parsed data
-                state["questions"] = self.question_gen.execute(state["parsed_product"])
-
-            elif node == "create_content_blocks":
-                # Agent 3: Create reusable content blocks
-                state["content_blocks"] = self.content_blocker.execute(
-                    parsed=state["parsed_product"], questions=state["questions"]
-                )
-
-            elif node == "apply_templates":
-                # Agent 4: Apply page-specific templates to content blocks
-                state["templated_pages"] = self.template_engine.execute(
-                    content_blocks=state["content_blocks"]
-                )
-
-            elif node == "assemble_pages":
-                # Agent 5: Assemble final JSON pages for each page type
-                state["final_pages"] = self.page_assembler.execute(
-                    templated_pages=state["templated_pages"],
-                    questions=state["questions"],
-                )
+        # Execute each node in the workflow DAG in dependency order
+        self.workflow_graph.run(state)
 
         return state["final_pages"]
+
+    async def run_async(
+        self, raw_product_json: Dict[str, Any], pages: Iterable[str] | None = None
+    ) -> Dict[str, Any]:
+        """
+        Execute the workflow under asyncio with model-backed generation.
+
+        FAQ answers (QuestionGeneratorAgent) and benefit descriptions
+        (ContentBlockAgent) are produced through ``self.generation``; all other
+        nodes run as in ``run``.
+
+        Args:
+            raw_product_json: Raw product data JSON
+            pages: Optional output filenames to generate (default: all pages)
+
+        Returns:
+            Dict containing final pages: {"faq", "product_page", "comparison_page"}
+        """
+        state = self.initial_state(raw_product_json, pages)
+        await self.workflow_graph.run_async(state)
+        return state["final_pages"]
+
+    async def run_many_async(
+        self,
+        products: Iterable[Dict[str, Any]],
+        max_in_flight: int = 1000,
+        pages: Iterable[str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute ``run_async`` for many products with bounded concurrency.
+
+        ``max_in_flight`` worker coroutines each take the next product from
+        ``products`` as soon as their current one finishes, so at most that
+        many products (and their states) exist at once, however long the
+        input is. Their generation requests are batched and rate-bounded by
+        the shared GenerationClient.
+
+        Args:
+            products: Raw product data JSON records (may be lazy)
+            max_in_flight: Maximum number of products in progress at a time
+            pages: Optional output filenames to generate (default: all pages)
+
+        Returns:
+            List of final page dicts, one per input product, in input order
+
+        Raises:
+            Exception: The first error raised for any product; the other
+                workers are cancelled
+        """
+        import asyncio
+
+        items = enumerate(products)
+        results: Dict[int, Dict[str, Any]] = {}
+
+        async def worker() -> None:
+            # The workers share one iterator; next() never awaits, so each
+            # product is taken exactly once
+            for index, product in items:
+                results[index] = await self.run_async(product, pages)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, max_in_flight))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return [results[index] for index in range(len(results))]
+
+    def run_many(
+        self,
+        products: Iterable[Dict[str, Any]],
+        max_workers: int | None = None,
+        pages: Iterable[str] | None = None,
+        max_in_flight: int = 64,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the workflow for many products with concurrent node scheduling.
+
+        The scheduler dispatches every (product, node) pair to a thread pool as
+        soon as its inputs are ready, so independent nodes and different
+        products run side by side. Only for nodes that release the GIL or
+        wait on I/O (e.g. remote generation): with the built-in CPU-bound
+        nodes the per-node scheduling makes it slower than ``run``, so prefer
+        ``run_batch`` for those.
+
+        Args:
+            products: Raw product data JSON records
+            max_workers: Thread pool size (defaults to the executor's default)
+            pages: Optional output filenames to generate (default: all pages)
+            max_in_flight: Maximum number of products scheduled at a time
+
+        Returns:
+            List of final page dicts, one per input product, in input order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        states = [self.initial_state(product, pages) for product in products]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            self.workflow_graph.run_many(states, executor, max_in_flight)
+        return [state["final_pages"] for state in states]
+
+    def run_stream(
+        self, products: Iterable[Dict[str, Any]], pages: Iterable[str] | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute the workflow lazily over a stream of products.
+
+        Each workflow node is a generator stage that pulls one state at a time
+        from the stage before it, so only a single product is in flight and
+        memory stays flat regardless of catalog size.
+
+        Args:
+            products: Iterable of raw product data JSON records (may be lazy)
+            pages: Optional output filenames to generate (default: all pages)
+
+        Yields:
+            Final page dicts, one per input product, in input order
+        """
+        states: Iterator[Dict[str, Any]] = (
+            self.initial_state(product, pages) for product in products
+        )
+        for node in self.workflow_graph:
+            states = self._stream_node(node, states)
+        for state in states:
+            yield state["final_pages"]
+
+    def _stream_node(
+        self, node: str, states: Iterator[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Generator stage that runs a single workflow node over a state stream."""
+        workflow_node = self.workflow_graph.nodes[node]
+        for state in states:
+            workflow_node.run(state)
+            yield state
+
+    def run_columnar(
+        self, raw_products: Sequence[Dict[str, Any]], pages: Iterable[str] | None = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the workflow for a chunk of products one stage at a time.
+
+        Each stage runs over the whole chunk before the next starts: questions
+        through ``QuestionGeneratorAgent.execute_many``, content blocks
+        column-wise through ``ContentBlockAgent.execute_batch``, which is the
+        cheapest way to build them, and templated pages one template at a
+        time through ``TemplateEngineAgent.execute_many``. The pages equal
+        ``run`` applied to every product. Stage caching and observers work per
+        node and per product, so an orchestrator with a cache, observers or
+        extra registered nodes falls back to ``run`` for each product.
+
+        Args:
+            raw_products: Raw product data JSON records (or already normalized
+                Products, which skip parsing)
+            pages: Optional output filenames to generate (default: all pages)
+
+        Returns:
+            List of final page dicts, one per input product, in input order
+        """
+        graph = self.workflow_graph
+        if self.cache is not None or graph.observers or not _BUILTIN_NODES.issuperset(graph.nodes):
+            return [self.run(product, pages) for product in raw_products]
+
+        plan = None if pages is None else self.page_plan(pages)
+        results: List[Dict[str, Any]] = []
+        # Slices of a few dozen products keep the intermediate columns small;
+        # whole-catalog columns cost more in allocation than batching saves
+        for start in range(0, len(raw_products), _COLUMNAR_SLICE):
+            results.extend(self._run_columnar_slice(raw_products[start:start + _COLUMNAR_SLICE], plan))
+        return results
+
+    def _run_columnar_slice(
+        self, raw_products: Sequence[Dict[str, Any]], plan: PagePlan | None
+    ) -> List[Dict[str, Any]]:
+        """``run_columnar`` over one slice of products."""
+        parse = self.data_parser.execute
+        parsed_batch = [
+            product if isinstance(product, Product) else parse(product) for product in raw_products
+        ]
+        if plan is None or plan.questions:
+            questions_batch = self.question_gen.execute_many(parsed_batch)
+        else:
+            questions_batch = [[] for _ in parsed_batch]
+        context = None
+        if self.competitor_index is not None:
+            lookup = self.competitor_index.lookup
+            context = {"competitors": [lookup(parsed.competitor_products) for parsed in parsed_batch]}
+        blocks_batch = self.content_blocker.execute_batch(
+            parsed_batch, questions_batch, None if plan is None else plan.blocks, context
+        )
+        templates = None if plan is None else plan.templates
+        outputs = None if plan is None else plan.outputs
+        templated_batch = self.template_engine.execute_many(blocks_batch, templates)
+        page_assembler = self.page_assembler
+        return [
+            page_assembler.execute(templated, questions, outputs)
+            for templated, questions in zip(templated_batch, questions_batch)
+        ]
+
+    def worker_pool(self, workers: int) -> "ProcessPoolExecutor":
+        """
+        A process pool whose workers each hold a warm copy of this orchestrator.
+
+        Workers are set up by ``init_worker`` with this orchestrator's
+        on-disk cache (flushed first, so workers see its entries), competitor
+        index and agent specs; submit ``run_chunk`` (or ``run_node``) to them.
+
+        Raises:
+            ValueError: If the orchestrator has custom nodes or observers
+                (``local_only``), which workers would silently lack
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        local = self.local_only()
+        if local:
+            raise ValueError(
+                f"Worker processes cannot reproduce {', '.join(local)}; run in-process instead"
+            )
+        cache_path = None
+        if self.cache is not None and self.cache.store is not None:
+            self.cache.store.flush()
+            cache_path = str(self.cache.store.path)
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(cache_path, self.competitor_index, self.agent_specs()),
+        )
+
+    def run_batch(
+        self,
+        products: Iterable[Dict[str, Any]],
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        pages: Iterable[str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the workflow for many products across a process pool.
+
+        Products are split into contiguous chunks and dispatched to worker
+        processes, each of which holds its own warm Orchestrator and runs its
+        chunks with ``run_columnar``. Results are returned in input order. If
+        this orchestrator's cache has an on-disk store, workers share it;
+        in-memory cache entries stay per process. An orchestrator with custom
+        nodes or observers (``local_only``) runs in-process instead, so its
+        results always match ``run``.
+
+        Args:
+            products: Raw product data JSON records (or already normalized
+                Products, which skip parsing)
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Products per dispatched chunk (defaults to ~4 chunks per worker)
+            pages: Optional output filenames to generate (default: all pages)
+
+        Returns:
+            List of final page dicts, one per input product, in input order
+        """
+        products = list(products)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(products) or 1))
+
+        # A single worker gains nothing from a pool; stay in-process
+        if workers == 1 or self.local_only():
+            return self.run_columnar(products, pages)
+
+        if not chunk_size:
+            chunk_size = max(1, -(-len(products) // (workers * 4)))
+        chunks = [
+            products[start : start + chunk_size]
+            for start in range(0, len(products), chunk_size)
+        ]
+
+        if pages is not None:
+            # Validate here rather than in every worker; workers get a picklable list
+            pages = list(self.page_plan(pages).outputs)
+        results: List[Dict[str, Any]] = []
+        with self.worker_pool(workers) as pool:
+            for chunk_result in pool.map(partial(run_chunk, pages=pages), chunks):
+                results.extend(chunk_result)
+        return results
@@ -0,0 +1,356 @@
+"""Output Writer - Pluggable JSON serialization and background page writing"""
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Set, Tuple
+from agents.interning import deduplicate, shared_table
+from agents.records import json_default
+
+try:
+    import orjson
+except ImportError:  # optional dependency; stdlib json is the fallback
+    orjson = None
+
+# Process umask, read once: querying it means setting it, which is not thread-safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def make_serializer(pretty: bool = True, backend: str = "auto") -> Callable[[Any], bytes]:
+    """
+    Build a function serializing a page to UTF-8 JSON bytes.
+
+    Records inside pages are serialized as their dict views (natively by
+    orjson, through ``json_default`` with the stdlib encoder).
+
+    Args:
+        pretty: Two-space indented output (as before) instead of compact
+        backend: ``"orjson"``, ``"json"`` or ``"auto"`` (orjson when installed)
+
+    Returns:
+        Callable mapping a JSON-like value to bytes
+    """
+    if backend not in ("auto", "orjson", "json"):
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if backend == "orjson" and orjson is None:
+        raise ImportError("The 'orjson' JSON backend requires the orjson package")
+
+    if orjson is not None and backend != "json":
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return lambda value: orjson.dumps(value, option=option)
+
+    if pretty:
+        return lambda value: json.dumps(
+            value, indent=2, ensure_ascii=False, default=json_default
+        ).encode("utf-8")
+    return lambda value: json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=json_default
+    ).encode("utf-8")
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write ``data`` to ``path`` atomically.
+
+    The bytes go to a temporary file in the same directory, which then
+    replaces the target with ``os.replace``, so readers never observe a
+    partially written page. The page gets the target's existing permissions,
+    or those of a newly created file (``0o666`` less the umask) rather than
+    the private ``0o600`` of the temporary file.
+    """
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class PageWriter:
+    """
+    Writes assembled pages to disk, optionally from a background thread.
+
+    Responsibility: Serialize pages with the configured backend and layout
+    and write them atomically, so rendering never has to wait on the disk.
+
+    Layouts:
+    - ``"flat"``: ``<output_dir>/<product_id>/<page>.json``
+    - ``"sharded"``: ``<output_dir>/<ab>/<cd>/<product_id>/<page>.json``, where
+      ``ab``/``cd`` come from a hash of the product id, keeping every
+      directory small even for hundreds of thousands of products
+
+    With ``background=True``, ``write`` only enqueues onto a bounded queue
+    (blocking when it is full, which applies backpressure to rendering) and a
+    writer thread performs the I/O. Errors raised by the thread are re-raised
+    from ``flush``/``close``. Usable as a context manager.
+
+    With ``shared_refs=True``, interned static structures (see
+    ``agents.interning``) are written as ``{"$ref": <id>}`` and emitted once in
+    ``<output_dir>/shared.json`` on close; ``interning.resolve`` expands them.
+
+    With ``change_detection=True`` (the default), each serialized page is
+    hashed (blake2b-128 over the bytes about to be written, so no extra
+    serialization) and compared against the hash manifest stored alongside
+    the outputs; pages whose bytes are unchanged and still on disk are not
+    rewritten. The manifest is an append-only ``<hex digest>  <path>`` file
+    (``b2sum -l 128`` format, later lines win) compacted on close. Paths of
+    the pages actually written are listed, one per line, in the changed-pages
+    file, so downstream sync (``rsync --files-from``, CDN purges) moves only
+    what changed. Both files are updated on ``flush`` and ``close``.
+    """
+
+    SHARED_FILENAME = "shared.json"
+    HASHES_FILENAME = ".page_hashes"
+    CHANGES_FILENAME = "changed_pages.txt"
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        pretty: bool = True,
+        backend: str = "auto",
+        layout: str = "flat",
+        atomic: bool = True,
+        background: bool = True,
+        queue_size: int = 1024,
+        shared_refs: bool = False,
+        change_detection: bool = True,
+        hashes_path: str | Path | None = None,
+        changes_path: str | Path | None = None,
+        append_changes: bool = False,
+    ):
+        """
+        Configure the writer and start its background thread if requested.
+
+        ``hashes_path``/``changes_path`` override where the hash manifest and
+        the changed-pages list live (default: in ``output_dir``). The list is
+        started afresh for each writer unless ``append_changes`` is set, as
+        for a resumed run that continues an earlier list.
+        """
+        if layout not in ("flat", "sharded"):
+            raise ValueError(f"Unknown output layout: {layout}")
+        self.output_dir = Path(output_dir)
+        self.layout = layout
+        self.atomic = atomic
+        self.serialize = make_serializer(pretty, backend)
+        self.shared_refs = shared_refs
+        self._shared_used: Dict[str, Any] = {}
+        self.pages_written = 0
+        self.pages_unchanged = 0
+        self.bytes_written = 0
+        self.change_detection = change_detection
+        self.hashes_path = Path(hashes_path or self.output_dir / self.HASHES_FILENAME)
+        self.changes_path = Path(changes_path or self.output_dir / self.CHANGES_FILENAME)
+        self._hashes: Dict[str, str] = {}
+        self._hash_lines = 0
+        self._new_hashes: List[str] = []
+        self._new_changes: List[str] = []
+        self._reset_changes = not append_changes
+        if change_detection:
+            self._load_hashes()
+        self._made_dirs: set = set()
+        self._product_ids: Set[str] = set()
+        self._error: BaseException | None = None
+        self._queue: "queue.Queue[Tuple[str | None, Dict[str, Any]] | None]" | None = None
+        self._thread: threading.Thread | None = None
+        if background:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(target=self._drain, name="page-writer", daemon=True)
+            self._thread.start()
+
+    def product_dir(self, product_id: str | None) -> Path:
+        """Directory holding a product's pages (the output dir itself for ``None``)."""
+        if product_id is None:
+            return self.output_dir
+        if self.layout == "sharded":
+            digest = hashlib.blake2b(product_id.encode("utf-8"), digest_size=2).hexdigest()
+            return self.output_dir / digest[:2] / digest[2:] / product_id
+        return self.output_dir / product_id
+
+    def path_for(self, product_id: str | None, filename: str) -> Path:
+        """Full path of one page file."""
+        return self.product_dir(product_id) / filename
+
+    def write(
+        self,
+        product_id: str | None,
+        pages: Dict[str, Any],
+        on_written: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Write (or enqueue) one product's pages.
+
+        Args:
+            product_id: Product identifier, or None to write into the output dir itself
+            pages: Mapping of page filename to page content
+            on_written: Optional callback run once the pages are on disk (on
+                the writer thread in background mode), e.g. to record state
+                that must never get ahead of the pages
+
+        Raises:
+            ValueError: If this writer already wrote pages for ``product_id``
+        """
+        if product_id is not None:
+            if product_id in self._product_ids:
+                raise ValueError(f"Duplicate product id in output: {product_id}")
+            self._product_ids.add(product_id)
+        if self._queue is None:
+            self._write_now(product_id, pages, on_written)
+            return
+        self._raise_pending()
+        self._queue.put((product_id, pages, on_written))
+
+    def flush(self) -> None:
+        """Block until every queued page has been written, then record their hashes."""
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_pending()
+        if self.change_detection:
+            self._save_changes()
+
+    def close(self) -> None:
+        """Flush pending pages, stop the background thread and write the shared table."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_pending()
+        if self._shared_used:
+            self._write_shared_table()
+        if self.change_detection:
+            self._save_changes()
+            self._compact_hashes()
+
+    def restart_changes(self) -> None:
+        """Start the changed-pages list afresh at the next save (e.g. a shard starting over)."""
+        self._reset_changes = True
+
+    def _load_hashes(self) -> None:
+        """Read the hash manifest left by earlier runs (later lines win)."""
+        if not self.hashes_path.exists():
+            return
+        with open(self.hashes_path, "r", encoding="utf-8") as f:
+            for line in f:
+                digest, _, relpath = line.rstrip("\n").partition("  ")
+                if relpath:
+                    self._hashes[relpath] = digest
+                    self._hash_lines += 1
+
+    def _save_changes(self) -> None:
+        """Append new hashes to the manifest and written paths to the changed-pages list."""
+        if self._new_hashes or self._reset_changes:
+            self.hashes_path.parent.mkdir(parents=True, exist_ok=True)
+            self.changes_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._new_hashes:
+            with open(self.hashes_path, "a", encoding="utf-8") as f:
+                f.writelines(self._new_hashes)
+            self._hash_lines += len(self._new_hashes)
+            self._new_hashes.clear()
+        if self._new_changes or self._reset_changes:
+            with open(self.changes_path, "w" if self._reset_changes else "a", encoding="utf-8") as f:
+                f.writelines(self._new_changes)
+            self._new_changes.clear()
+            self._reset_changes = False
+
+    def _compact_hashes(self) -> None:
+        """Rewrite the manifest with one line per page once superseded lines dominate it."""
+        if self._hash_lines > 2 * len(self._hashes):
+            atomic_write(
+                self.hashes_path,
+                "".join(
+                    f"{digest}  {relpath}\n" for relpath, digest in sorted(self._hashes.items())
+                ).encode("utf-8"),
+            )
+            self._hash_lines = len(self._hashes)
+
+    def _write_shared_table(self) -> None:
+        """Write ``shared.json``, keeping entries that earlier runs' pages may reference."""
+        path = self.output_dir / self.SHARED_FILENAME
+        table: Dict[str, Any] = {}
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                table = json.load(f)
+        table.update(shared_table(self._shared_used))
+        self._shared_used.clear()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._store(self.SHARED_FILENAME, path, self.serialize(dict(sorted(table.items()))))
+
+    def __enter__(self) -> "PageWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_now(
+        self,
+        product_id: str | None,
+        pages: Dict[str, Any],
+        on_written: Callable[[], None] | None = None,
+    ) -> None:
+        """Serialize and write one product's pages on the calling thread."""
+        directory = self.product_dir(product_id)
+        if directory not in self._made_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(directory)
+        prefix = "" if product_id is None else directory.relative_to(self.output_dir).as_posix() + "/"
+        for filename, page in pages.items():
+            if self.shared_refs:
+                page = deduplicate(page, self._shared_used)
+            data = self.serialize(page)
+            if self._store(prefix + filename, directory / filename, data):
+                self.pages_written += 1
+                self.bytes_written += len(data)
+            else:
+                self.pages_unchanged += 1
+        if on_written is not None:
+            on_written()
+
+    def _store(self, relpath: str, path: Path, data: bytes) -> bool:
+        """Write one file unless its hash shows it unchanged; True if it was written."""
+        if self.change_detection:
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if self._hashes.get(relpath) == digest and path.exists():
+                return False
+        if self.atomic:
+            atomic_write(path, data)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+        if self.change_detection:
+            self._hashes[relpath] = digest
+            self._new_hashes.append(f"{digest}  {relpath}\n")
+            self._new_changes.append(relpath + "\n")
+        return True
+
+    def _drain(self) -> None:
+        """Background thread: write queued pages until the sentinel arrives."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._write_now(*item)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending(self) -> None:
+        """Re-raise an error captured by the background thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
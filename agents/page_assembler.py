@@ -1,6 +1,7 @@
 """Page Assembler Agent - Assembles final JSON pages for delivery"""
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Iterable, List
+from agents.records import to_dict
+from agents.template_compiler import load_page_templates
 
 
 class PageAssemblerAgent:
@@ -15,11 +16,28 @@ class PageAssemblerAgent:
     """
 
     def __init__(self, config: Dict[str, Any] | None = None):
-        """Initialize the PageAssembler agent."""
+        """
+        Initialize the PageAssembler agent.
+
+        Final page layouts come from the same ``*_template.json`` files as the
+        TemplateEngineAgent (``config["templates_dir"]``).
+        """
         self.config = config or {}
+        self.page_templates = load_page_templates(self.config.get("templates_dir"))
+        # Templated pages (plus the "questions" list) each output file is built from
+        self.page_sources = {
+            template.output: tuple(
+                template.page if root == "page" else root
+                for root in sorted(template.layout.slot_roots)
+            )
+            for template in self.page_templates
+        }
 
     def execute(
-        self, templated_pages: Dict[str, Any], questions: List[Dict[str, Any]]
+        self,
+        templated_pages: Dict[str, Any],
+        questions: List[Dict[str, Any]],
+        outputs: Iterable[str] | None = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Assemble final JSON pages for all page types.
@@ -27,63 +45,19 @@ class PageAssemblerAgent:
         Args:
             templated_pages: Templated pages from TemplateEngineAgent
             questions: FAQ questions from QuestionGeneratorAgent
+            outputs: Optional subset of output filenames to assemble (default: all)
             
         Returns:
-            Dictionary containing final pages:
+            Dictionary containing final pages as plain dicts and lists (no
+            records), keyed by output filename:
             - faq.json: FAQ page in production-ready JSON
             - product_page.json: Product page in production-ready JSON
             - comparison_page.json: Comparison page in production-ready JSON
         """
-        # Extract pages
-        faq_template = templated_pages.get("faq_page", {})
-        product_template = templated_pages.get("product_page", {})
-        comparison_template = templated_pages.get("comparison_page", {})
-
-        # Assemble FAQ Page
-        faq_page = {
-            "type": "faq_page",
-            "meta": {
-                "title": faq_template.get("title", "FAQ"),
-                "description": faq_template.get("description", ""),
-                "version": "1.0",
-            },
-            "content": {
-                "sections": faq_template.get("sections", {}),
-                "total_questions": len(questions),
-            },
-        }
-
-        # Assemble Product Page
-        product_page = {
-            "type": "product_page",
-            "meta": {
-                "title": product_template.get("title", "Product"),
-                "version": "1.0",
-            },
-            "content": {
-                "benefits": product_template.get("benefits_section", {}),
-                "ingredients": product_template.get("ingredients_section", {}),
-                "usage": product_template.get("usage_section", {}),
-                "highlights": product_template.get("highlights", []),
-            },
-        }
-
-        # Assemble Comparison Page
-        comparison_page = {
-            "type": "comparison_page",
-            "meta": {
-                "title": comparison_template.get("title", "Comparison"),
-                "version": "1.0",
-            },
-            "content": {
-                "comparison": comparison_template.get("comparison_data", {}),
-                "testimonials": comparison_template.get("testimonials", []),
-            },
-        }
-
-        # Return all pages as final output
         return {
-            "faq.json": faq_page,
-            "product_page.json": product_page,
-            "comparison_page.json": comparison_page,
+            template.output: to_dict(template.layout.render(
+                {"page": templated_pages.get(template.page, {}), "questions": questions}
+            ))
+            for template in self.page_templates
+            if outputs is None or template.output in outputs
         }
@@ -0,0 +1,290 @@
+"""Staged Pipeline - Per-stage worker pools linked by bounded queues"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, List, Tuple, TYPE_CHECKING
+from agents.orchestrator import run_node
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from agents.orchestrator import Orchestrator
+    from agents.workflow import WorkflowNode
+
+# End-of-input marker passed down the stages after the last product
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class StageConfig:
+    """
+    Worker pool of one pipeline stage.
+
+    Attributes:
+        workers: Concurrent workers for the stage
+        processes: Run the stage's node in worker processes instead of threads
+    """
+
+    workers: int = 1
+    processes: bool = False
+
+
+class _Stage:
+    """One workflow node with its input queue, workers and counters."""
+
+    def __init__(self, node: "WorkflowNode", config: StageConfig, queue_size: int):
+        self.node = node
+        self.config = config
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.keys = node.inputs + node.options
+        self.pool: "ProcessPoolExecutor | None" = None
+        self.processed = 0
+        self.busy_s = 0.0
+        self.active = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self.lock:
+            self.processed += 1
+            self.busy_s += seconds
+
+
+class StagedPipeline:
+    """
+    Runs the workflow as a pipeline of stages, one per workflow node.
+
+    Responsibility: Give every node of ``orchestrator.workflow_graph`` (from
+    ``parse_data`` to ``assemble_pages``) its own pool of threads or
+    processes, sized to its cost, and connect consecutive stages with
+    bounded queues. A slow stage fills its input queue, which blocks the
+    stage before it, and so on back to the source, so the pipeline applies
+    backpressure instead of buffering the catalog. At most ``max_in_flight``
+    products are inside the pipeline at once, which bounds memory even when
+    results are reordered.
+
+    Stages report live queue depth and utilization (busy time over workers
+    times elapsed time) through ``stats``; the most utilized stage is the
+    bottleneck to give more workers.
+
+    Autonomy: Uses the orchestrator's nodes as they are (cache, observers,
+    page plans and competitor lookups included); process stages run the same
+    node on a per-process orchestrator, receiving only the node's inputs.
+    """
+
+    def __init__(
+        self,
+        orchestrator: "Orchestrator",
+        stages: Dict[str, StageConfig] | None = None,
+        queue_size: int = 64,
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+    ):
+        """
+        Prepare the stages (process pools start on first ``run``).
+
+        Args:
+            orchestrator: Orchestrator whose workflow nodes become the stages
+            stages: Worker pool per node name (default: one thread per stage)
+            queue_size: Capacity of each stage's input queue
+            ordered: Yield results in input order (else in completion order)
+            max_in_flight: Products admitted at once (default: queue_size per stage, plus one)
+
+        Raises:
+            ValueError: If ``stages`` names a node the workflow does not have
+        """
+        stages = stages or {}
+        unknown = sorted(set(stages).difference(orchestrator.workflow_graph.nodes))
+        if unknown:
+            raise ValueError(
+                f"Unknown stages {unknown}; available: {list(orchestrator.workflow_graph)}"
+            )
+        self.orchestrator = orchestrator
+        self.queue_size = max(1, queue_size)
+        self.ordered = ordered
+        self.stages = [
+            _Stage(
+                orchestrator.workflow_graph.nodes[name],
+                stages.get(name, StageConfig()),
+                self.queue_size,
+            )
+            for name in orchestrator.workflow_graph
+        ]
+        self.max_in_flight = max_in_flight or self.queue_size * (len(self.stages) + 1)
+        self.products = 0
+        self._started = time.monotonic()
+        self._stop = threading.Event()
+
+    def run(
+        self, products: Iterable[Dict[str, Any]], pages: Iterable[str] | None = None
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Push products through the stages.
+
+        Args:
+            products: Raw product data JSON records, or already normalized
+                Products that skip parsing (may be lazy)
+            pages: Optional output filenames to generate (default: all pages)
+
+        Yields:
+            ``(input index, final pages)`` per product, in input order when
+            the pipeline is ordered
+
+        Raises:
+            Exception: The first error raised by a stage (or by ``products``)
+        """
+        self._stop.clear()
+        self._started = time.monotonic()
+        self.products = 0
+        window = threading.Semaphore(self.max_in_flight)
+        results: queue.Queue = queue.Queue()
+        source_errors: List[BaseException] = []
+        threads = [
+            threading.Thread(
+                target=self._feed, args=(products, pages, window, source_errors), daemon=True
+            )
+        ]
+        for position, stage in enumerate(self.stages):
+            downstream = self.stages[position + 1].queue if position + 1 < len(self.stages) else results
+            if stage.config.processes:
+                stage.pool = self.orchestrator.worker_pool(stage.config.workers)
+            stage.active = max(1, stage.config.workers)
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(stage, downstream),
+                    name=f"stage-{stage.node.name}",
+                    daemon=True,
+                )
+                for _ in range(stage.active)
+            )
+        for thread in threads:
+            thread.start()
+
+        pending: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        try:
+            while True:
+                item = self._get(results)
+                if item is _DONE or item is None:
+                    break
+                index, state, error = item
+                if error is not None:
+                    raise error
+                if not self.ordered:
+                    self.products += 1
+                    window.release()
+                    yield index, state["final_pages"]
+                    continue
+                pending[index] = state["final_pages"]
+                while next_index in pending:
+                    self.products += 1
+                    window.release()
+                    yield next_index, pending.pop(next_index)
+                    next_index += 1
+            if source_errors:
+                raise source_errors[0]
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            for stage in self.stages:
+                if stage.pool is not None:
+                    stage.pool.shutdown(wait=True, cancel_futures=True)
+                    stage.pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Live per-stage queue depth, throughput and utilization, plus the bottleneck stage."""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        stages = []
+        for stage in self.stages:
+            with stage.lock:
+                processed, busy_s = stage.processed, stage.busy_s
+            workers = max(1, stage.config.workers)
+            stages.append({
+                "stage": stage.node.name,
+                "workers": workers,
+                "kind": "process" if stage.config.processes else "thread",
+                "queue_depth": stage.queue.qsize(),
+                "queue_size": self.queue_size,
+                "processed": processed,
+                "mean_ms": round(busy_s / processed * 1000, 3) if processed else None,
+                "utilization": round(min(1.0, busy_s / (workers * elapsed)), 3),
+            })
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "products": self.products,
+            "products_per_s": round(self.products / elapsed, 2),
+            "bottleneck": max(stages, key=lambda stage: stage["utilization"])["stage"] if stages else None,
+            "stages": stages,
+        }
+
+    def _feed(
+        self,
+        products: Iterable[Dict[str, Any]],
+        pages: Iterable[str] | None,
+        window: threading.Semaphore,
+        errors: List[BaseException],
+    ) -> None:
+        """Source thread: admit products into the first stage, at most ``max_in_flight`` at a time."""
+        first = self.stages[0].queue
+        try:
+            for index, product in enumerate(products):
+                while not window.acquire(timeout=0.1):
+                    if self._stop.is_set():
+                        return
+                state = self.orchestrator.initial_state(product, pages)
+                if not self._put(first, (index, state, None)):
+                    return
+        except BaseException as exc:
+            errors.append(exc)
+        self._put(first, _DONE)
+
+    def _work(self, stage: _Stage, downstream: queue.Queue) -> None:
+        """Stage worker: run the stage's node on each state and pass it downstream."""
+        node = stage.node
+        while True:
+            item = self._get(stage.queue)
+            if item is None:
+                return
+            if item is _DONE:
+                with stage.lock:
+                    stage.active -= 1
+                    last = stage.active == 0
+                # The last worker to finish forwards end-of-input; the others
+                # hand it back so every sibling sees it
+                self._put(downstream if last else stage.queue, _DONE)
+                return
+            index, state, error = item
+            if error is None and not node.provided(state):
+                start = time.perf_counter()
+                try:
+                    if stage.pool is None:
+                        outputs = node.compute(state)
+                    else:
+                        inputs = {key: state[key] for key in stage.keys if key in state}
+                        outputs = stage.pool.submit(run_node, node.name, inputs).result()
+                    state.update(outputs)
+                except BaseException as exc:
+                    error = exc
+                stage.record(time.perf_counter() - start)
+            if not self._put(downstream, (index, state, error)):
+                return
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Take the next item, or None once the pipeline is stopping."""
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return None
+
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """Put an item, blocking while the queue is full; False once the pipeline is stopping."""
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
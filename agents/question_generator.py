@@ -1,5 +1,98 @@
 """Question Generator Agent - Generates FAQ questions from product data"""
-from typing import Dict, Any, List
+import string
+from typing import Dict, Any, List, Iterable, Tuple, TYPE_CHECKING
+from agents.records import Product, Question
+
+if TYPE_CHECKING:
+    from agents.generation import GenerationClient
+
+
+def _joined(field: str, limit: int | None, fallback: str) -> str:
+    """Expression joining (up to ``limit`` items of) a list field, or ``fallback`` if empty."""
+    items = f"parsed.get({field!r}, [])" + (f"[:{limit}]" if limit else "")
+    return f"(', '.join({items}) if parsed.get({field!r}) else {fallback!r})"
+
+
+def _text(field: str, fallback: str) -> str:
+    """Expression returning a text field, or ``fallback`` if empty."""
+    return f"(parsed.get({field!r}, '') or {fallback!r})"
+
+
+# Template placeholders -> (normalized fields read, accessor expression over ``parsed``)
+QUESTION_FIELDS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "product_name": (("product_name",), "parsed.get('product_name', 'Product')"),
+    "top_benefits": (("benefits",), _joined("benefits", 3, "improved skin health")),
+    "all_benefits": (("benefits",), _joined("benefits", None, "multiple skin concerns")),
+    "top_ingredients": (
+        ("ingredients",),
+        _joined("ingredients", 4, "Natural plant extracts and vitamins"),
+    ),
+    "usage": (("usage_instructions",), _text("usage_instructions", "Apply as directed on packaging.")),
+    "side_effects": (
+        ("side_effects",),
+        _text("side_effects", "Minimal. Some users may experience mild tingling."),
+    ),
+}
+
+# Prompt used to answer each question with a generation backend (async mode)
+ANSWER_PROMPT = (
+    "Answer this customer question about {product_name} in one or two sentences.\n"
+    "Question: {question}\n"
+    "Context: {context}"
+)
+
+# Stand-in product name for answers shared across products (config "generic_answers")
+GENERIC_PRODUCT_NAME = "this product"
+
+# The FAQ question bank: (id, category, question template, context template)
+QUESTION_BANK: List[Tuple[int, str, str, str]] = [
+    # Product Overview - 4 questions
+    (1, "Product Overview", "What is {product_name}?",
+     "{product_name} is a specialized skincare product."),
+    (2, "Product Overview", "What are the main benefits of {product_name}?",
+     "Benefits include: {top_benefits}."),
+    (3, "Product Overview", "Who should use {product_name}?",
+     "This product is suitable for various skin types."),
+    (4, "Product Overview", "Is {product_name} suitable for sensitive skin?",
+     "Formulated with gentle, natural ingredients."),
+    # Usage Instructions - 4 questions
+    (5, "Usage Instructions", "How do I use {product_name}?",
+     "Usage: {usage}"),
+    (6, "Usage Instructions", "How often should I use {product_name}?",
+     "Recommended frequency depends on your skin type."),
+    (7, "Usage Instructions", "Can I use {product_name} with other products?",
+     "Generally compatible with most skincare routines."),
+    (8, "Usage Instructions", "When will I see results from {product_name}?",
+     "Results typically appear within 2-4 weeks of consistent use."),
+    # Benefits & Results - 4 questions
+    (9, "Benefits & Results", "What specific skin concerns does {product_name} address?",
+     "Targets: {all_benefits}."),
+    (10, "Benefits & Results", "Are the benefits of {product_name} permanent?",
+     "Continued use maintains the benefits for your skin."),
+    (11, "Benefits & Results", "Can I combine {product_name} with other treatments?",
+     "Yes, with proper guidance. Consult dermatologist if needed."),
+    (12, "Benefits & Results", "What do users say about {product_name}?",
+     "Customers report positive results and high satisfaction."),
+    # Ingredients & Safety - 4 questions
+    (13, "Ingredients & Safety", "What are the key ingredients in {product_name}?",
+     "Main ingredients: {top_ingredients}."),
+    (14, "Ingredients & Safety", "Is {product_name} safe for all skin types?",
+     "Dermatologist-tested and hypoallergenic formula."),
+    (15, "Ingredients & Safety", "Are there any side effects of {product_name}?",
+     "Side effects: {side_effects}"),
+    (16, "Ingredients & Safety", "Is {product_name} cruelty-free and vegan?",
+     "Committed to ethical, sustainable production."),
+]
+
+
+def _placeholders(template: str) -> List[str]:
+    """Placeholder names used by a question bank template."""
+    return [field for _, field, _, _ in string.Formatter().parse(template) if field]
+
+
+def _fstring(template: str) -> str:
+    """Python source for a template: an f-string if it has placeholders, else a constant."""
+    return ("f" if _placeholders(template) else "") + repr(template)
 
 
 class QuestionGeneratorAgent:
@@ -8,6 +101,12 @@ class QuestionGeneratorAgent:
     
     Responsibility: Generate comprehensive, categorized FAQ questions that address
     customer concerns about the product. Returns 16 questions across key topics.
+
+    The question bank is data (QUESTION_BANK). At construction it is filtered
+    by ``self.categories`` and ``config["num_questions"]`` and compiled into one
+    render function: every placeholder accessor is inlined and evaluated once
+    per product, and each question is a precompiled f-string (or a constant
+    when it has none).
     
     Autonomy: Works independently with only the parsed product data as input.
     No global state or external dependencies.
@@ -22,8 +121,55 @@ class QuestionGeneratorAgent:
             "Benefits & Results",
             "Ingredients & Safety",
         ]
+        self.compile()
+
+    def compile(self) -> None:
+        """
+        Compile the selected questions into a single render function.
 
-    def execute(self, parsed_product: Dict[str, Any]) -> List[Dict[str, Any]]:
+        Call again after changing ``self.categories`` or ``self.config``.
+        """
+        num_questions = self.config.get("num_questions", 16)
+        selected = [entry for entry in QUESTION_BANK if entry[1] in self.categories]
+        selected = selected[:num_questions]
+        # Questions whose text depends only on the product name and whose
+        # context is fixed: their answers can be shared across products
+        self._generic_questions = {
+            question_id: question
+            for question_id, _, question, context in selected
+            if not _placeholders(context) and set(_placeholders(question)) <= {"product_name"}
+        }
+
+        used_fields: List[str] = []
+        for _, _, question, context in selected:
+            for field in _placeholders(question) + _placeholders(context):
+                if field not in QUESTION_FIELDS:
+                    raise ValueError(f"Unknown question bank placeholder '{{{field}}}'")
+                if field not in used_fields:
+                    used_fields.append(field)
+
+        # Normalized fields the generated questions are built from
+        self.input_fields = tuple(
+            dict.fromkeys(
+                source for field in used_fields for source in QUESTION_FIELDS[field][0]
+            )
+        )
+
+        lines = ["def render(parsed):"]
+        lines += [f"    {field} = {QUESTION_FIELDS[field][1]}" for field in used_fields]
+        lines.append("    return [")
+        for question_id, category, question, context in selected:
+            lines.append(
+                f"        Question({question_id!r}, {category!r}, "
+                f"{_fstring(question)}, {_fstring(context)}),"
+            )
+        lines.append("    ]")
+
+        namespace: Dict[str, Any] = {"Question": Question}
+        exec(compile("\n".join(lines), "<question bank>", "exec"), namespace)
+        self._render = namespace["render"]
+
+    def execute(self, parsed_product: Product) -> List[Question]:
         """
         Generate 16 FAQ questions from parsed product data.
         
@@ -31,119 +177,59 @@ class QuestionGeneratorAgent:
             parsed_product: Normalized product data from DataParserAgent
             
         Returns:
-            List of 16 FAQ question dictionaries, each containing:
+            List of 16 FAQ Question records, each containing:
             - id: Unique question identifier
             - category: FAQ category
             - question: The FAQ question text
             - context: Product-specific context used to generate this question
         """
+        return self._render(parsed_product)
+
+    def execute_many(
+        self, parsed_products: Iterable[Product]
+    ) -> List[List[Question]]:
+        """Generate FAQ questions for a batch of parsed products in one call."""
+        render = self._render
+        return [render(parsed) for parsed in parsed_products]
+
+    async def execute_async(
+        self, parsed_product: Product, client: "GenerationClient"
+    ) -> List[Question]:
+        """
+        Generate FAQ questions and answer each one with a generation backend.
+
+        Args:
+            parsed_product: Normalized product data from DataParserAgent
+            client: GenerationClient used to answer the questions
+
+        Returns:
+            The questions from ``execute``, each with its ``answer`` set
+
+        With ``config["generic_answers"]``, questions that differ between
+        products only by name (e.g. "Is X cruelty-free and vegan?") are asked
+        about GENERIC_PRODUCT_NAME instead, so every product shares one cached
+        or deduplicated generation for them.
+        """
+        questions = self._render(parsed_product)
         product_name = parsed_product.get("product_name", "Product")
-        benefits = parsed_product.get("benefits", [])
-        ingredients = parsed_product.get("ingredients", [])
-        usage = parsed_product.get("usage_instructions", "")
-        side_effects = parsed_product.get("side_effects", "")
-
-        faqs = [
-            # Product Overview - 4 questions
-            {
-                "id": 1,
-                "category": "Product Overview",
-                "question": f"What is {product_name}?",
-                "context": f"{product_name} is a specialized skincare product.",
-            },
-            {
-                "id": 2,
-                "category": "Product Overview",
-                "question": f"What are the main benefits of {product_name}?",
-                "context": f"Benefits include: {', '.join(benefits[:3]) if benefits else 'improved skin health'}.",
-            },
-            {
-                "id": 3,
-                "category": "Product Overview",
-                "question": f"Who should use {product_name}?",
-                "context": "This product is suitable for various skin types.",
-            },
-            {
-                "id": 4,
-                "category": "Product Overview",
-                "question": f"Is {product_name} suitable for sensitive skin?",
-                "context": "Formulated with gentle, natural ingredients.",
-            },
-            # Usage Instructions - 4 questions
-            {
-                "id": 5,
-                "category": "Usage Instructions",
-                "question": f"How do I use {product_name}?",
-                "context": f"Usage: {usage if usage else 'Apply as directed on packaging.'}",
-            },
-            {
-                "id": 6,
-                "category": "Usage Instructions",
-                "question": f"How often should I use {product_name}?",
-                "context": "Recommended frequency depends on your skin type.",
-            },
-            {
-                "id": 7,
-                "category": "Usage Instructions",
-                "question": f"Can I use {product_name} with other products?",
-                "context": "Generally compatible with most skincare routines.",
-            },
-            {
-                "id": 8,
-                "category": "Usage Instructions",
-                "question": f"When will I see results from {product_name}?",
-                "context": "Results typically appear within 2-4 weeks of consistent use.",
-            },
-            # Benefits & Results - 4 questions
-            {
-                "id": 9,
-                "category": "Benefits & Results",
-                "question": f"What specific skin concerns does {product_name} address?",
-                "context": f"Targets: {', '.join(benefits) if benefits else 'multiple skin concerns'}.",
-            },
-            {
-                "id": 10,
-                "category": "Benefits & Results",
-                "question": f"Are the benefits of {product_name} permanent?",
-                "context": "Continued use maintains the benefits for your skin.",
-            },
-            {
-                "id": 11,
-                "category": "Benefits & Results",
-                "question": f"Can I combine {product_name} with other treatments?",
-                "context": "Yes, with proper guidance. Consult dermatologist if needed.",
-            },
-            {
-                "id": 12,
-                "category": "Benefits & Results",
-                "question": f"What do users say about {product_name}?",
-                "context": "Customers report positive results and high satisfaction.",
-            },
-            # Ingredients & Safety - 4 questions
-            {
-                "id": 13,
-                "category": "Ingredients & Safety",
-                "question": f"What are the key ingredients in {product_name}?",
-                "context": f"Main ingredients: {', '.join(ingredients[:4]) if ingredients else 'Natural plant extracts and vitamins'}.",
-            },
-            {
-                "id": 14,
-                "category": "Ingredients & Safety",
-                "question": f"Is {product_name} safe for all skin types?",
-                "context": "Dermatologist-tested and hypoallergenic formula.",
-            },
-            {
-                "id": 15,
-                "category": "Ingredients & Safety",
-                "question": f"Are there any side effects of {product_name}?",
-                "context": f"Side effects: {side_effects if side_effects else 'Minimal. Some users may experience mild tingling.'}",
-            },
-            {
-                "id": 16,
-                "category": "Ingredients & Safety",
-                "question": f"Is {product_name} cruelty-free and vegan?",
-                "context": "Committed to ethical, sustainable production.",
-            },
+        share_generic = self.config.get("generic_answers", False)
+        variables = []
+        for q in questions:
+            generic = self._generic_questions.get(q.id) if share_generic else None
+            if generic is not None:
+                variables.append(
+                    {
+                        "product_name": GENERIC_PRODUCT_NAME,
+                        "question": generic.format(product_name=GENERIC_PRODUCT_NAME),
+                        "context": q.context,
+                    }
+                )
+            else:
+                variables.append(
+                    {"product_name": product_name, "question": q.question, "context": q.context}
+                )
+        answers = await client.generate_many(ANSWER_PROMPT, variables)
+        return [
+            Question(q.id, q.category, q.question, q.context, answer)
+            for q, answer in zip(questions, answers)
         ]
-
-        return faqs
@@ -0,0 +1,260 @@
+"""Records - Slotted immutable record types for workflow state"""
+import weakref
+from collections import deque
+from dataclasses import MISSING, dataclass, field, fields
+from itertools import repeat
+from typing import Dict, Any, List, Sequence, Tuple
+from agents.interning import FrozenDict, FrozenList, intern, shared_id, shared_value
+
+
+def _rebuild(cls: type, ref: str | None, values: Tuple[Any, ...]) -> "Record":
+    """Unpickle a record, mapping interned records back onto the shared instance."""
+    if ref is not None:
+        try:
+            return shared_value(ref)
+        except KeyError:
+            pass
+    record = object.__new__(cls)
+    for name, value in zip(cls.__slots__, values):
+        object.__setattr__(record, name, value)
+    return intern(record) if ref is not None else record
+
+
+class Record:
+    """
+    Base for the immutable records passed between agents.
+
+    Records are frozen dataclasses with ``__slots__``: no per-instance
+    ``__dict__``, so each holds only its field pointers. Reads mirror the
+    dicts they replace (``record.get(key, default)``), which keeps template
+    slot lookups working unchanged. Mapping fields hold FrozenDicts, so a
+    record is immutable all the way down. Records never leave the workflow:
+    PageAssemblerAgent turns the final pages into plain dicts and lists with
+    ``to_dict``, and ``json_default`` covers the stdlib json encoder and
+    hashing of intermediate state.
+
+    Fields named in ``_optional`` are left out of dict views while ``None``.
+    The ``__weakref__`` slot lets ``agents.interning`` hold shared records
+    weakly.
+    """
+
+    __slots__ = ("__weakref__",)
+    _optional: Tuple[str, ...] = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Field value by name, or ``default`` if the record has no such field."""
+        return getattr(self, key, default)
+
+    @classmethod
+    def from_columns(cls, *columns: Sequence[Any]) -> List["Record"]:
+        """
+        Build one record per row from column-wise field values.
+
+        ``columns`` hold the values of the ``__init__`` fields in declaration
+        order; omitted trailing fields and fields with ``init=False`` take
+        their default. Records are
+        allocated in bulk and each field is filled for the whole batch with
+        one C-level ``map`` over its slot setter, which is several times
+        faster than calling the frozen ``__init__`` per row.
+        """
+        size = len(columns[0]) if columns else 0
+        records = list(map(object.__new__, repeat(cls, size)))
+        column = iter(columns)
+        for spec in fields(cls):
+            values = next(column, None) if spec.init else None
+            if values is None:
+                if spec.default is MISSING:
+                    raise TypeError(f"{cls.__name__}.from_columns() missing column '{spec.name}'")
+                values = repeat(spec.default, size)
+            deque(map(cls.__dict__[spec.name].__set__, records, values), maxlen=0)
+        return records
+
+    def __reduce__(self):
+        return _rebuild, (
+            type(self),
+            shared_id(self),
+            tuple(getattr(self, name) for name in self.__slots__),
+        )
+
+
+def json_default(value: Any) -> Dict[str, Any]:
+    """``default`` hook for ``json.dumps``: a record's shallow dict view."""
+    if isinstance(value, Record):
+        optional = value._optional
+        return {
+            name: getattr(value, name)
+            for name in value.__slots__
+            if not (name in optional and getattr(value, name) is None)
+        }
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Interned id -> interned plain view, so shared records convert once; an
+# entry lives as long as its record (see ``agents.interning``)
+_plain_views: Dict[str, Any] = {}
+
+
+def to_dict(value: Any) -> Any:
+    """
+    Recursive plain dict/list view of records, tuples and containers holding them.
+
+    Interned records map onto one interned (frozen) view each, so pages built
+    from shared structures still share them after conversion.
+    """
+    if isinstance(value, (str, int, float)) or value is None:
+        return value
+    ref = shared_id(value)
+    if ref is not None:
+        if isinstance(value, (FrozenDict, FrozenList)):
+            return value
+        view = _plain_views.get(ref)
+        if view is None:
+            view = _plain_views.setdefault(ref, intern(_to_dict(value)))
+            weakref.finalize(value, _plain_views.pop, ref, None)
+        return view
+    return _to_dict(value)
+
+
+def _to_dict(value: Any) -> Any:
+    if isinstance(value, Record):
+        return {name: to_dict(item) for name, item in json_default(value).items()}
+    if isinstance(value, dict):
+        return {key: to_dict(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dict(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Product(Record):
+    """A normalized product, as produced by DataParserAgent."""
+
+    product_name: str
+    concentration: str
+    skin_type: Tuple[str, ...]
+    ingredients: Tuple[str, ...]
+    benefits: Tuple[str, ...]
+    usage_instructions: str
+    side_effects: str
+    price: str | int | float
+    price_value: float | None
+    price_currency: str | None
+    competitor_products: FrozenDict
+
+
+@dataclass(frozen=True, slots=True)
+class Question(Record):
+    """One FAQ question; ``answer`` is set only by generation-backed runs."""
+
+    _optional = ("answer",)
+
+    id: int
+    category: str
+    question: str
+    context: str
+    answer: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BenefitItem(Record):
+    benefit: str
+    description: str
+
+
+@dataclass(frozen=True, slots=True)
+class BenefitsBlock(Record):
+    type: str = field(default="benefits", init=False)
+    title: str
+    items: Tuple[BenefitItem, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class IngredientItem(Record):
+    name: str
+    type: str = "Natural Extract"
+
+
+@dataclass(frozen=True, slots=True)
+class IngredientsBlock(Record):
+    type: str = field(default="ingredients", init=False)
+    title: str = field(default="Key Ingredients", init=False)
+    items: Tuple[IngredientItem, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class UsageStep(Record):
+    step: int
+    instruction: str
+
+
+@dataclass(frozen=True, slots=True)
+class UsageBlock(Record):
+    type: str = field(default="usage", init=False)
+    title: str = field(default="How to Use", init=False)
+    steps: Tuple[UsageStep, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ComparisonBlock(Record):
+    type: str = field(default="comparison", init=False)
+    title: str = field(default="How We Compare", init=False)
+    our_product: str
+    competitors: Tuple[str, ...]
+    advantages: Sequence[str]
+
+
+@dataclass(frozen=True, slots=True)
+class CompetitorProfile(Record):
+    """
+    Catalog-wide view of one competitor (see ``agents.competitors``).
+
+    ``notes`` are the distinct notes our products give for it, most common
+    first; ``median_price`` is the median parsed price of the referencing
+    products in their most common ``currency``.
+    """
+
+    name: str
+    products: int
+    notes: Tuple[str, ...]
+    median_price: float | None
+    currency: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedComparisonBlock(Record):
+    type: str = field(default="comparison", init=False)
+    title: str = field(default="How We Compare", init=False)
+    our_product: str
+    competitors: Tuple[str, ...]
+    advantages: Sequence[str]
+    competitor_profiles: Tuple[CompetitorProfile, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class FaqEntry(Record):
+    question: str
+    id: int
+
+
+@dataclass(frozen=True, slots=True)
+class AnsweredFaqEntry(Record):
+    question: str
+    id: int
+    answer: str
+
+
+@dataclass(frozen=True, slots=True)
+class FaqBlocks(Record):
+    type: str = field(default="faqs", init=False)
+    title: str = field(default="Frequently Asked Questions", init=False)
+    categories: FrozenDict  # category -> Tuple[FaqEntry | AnsweredFaqEntry, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class PagePlan(Record):
+    """The work needed for a subset of output pages (see ``Orchestrator.page_plan``)."""
+
+    outputs: Tuple[str, ...]
+    templates: Tuple[str, ...]
+    blocks: Tuple[str, ...]
+    questions: bool
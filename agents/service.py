@@ -0,0 +1,338 @@
+"""Generation Service - Resident HTTP / Unix-socket server over warm orchestrator workers"""
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Iterator, Tuple
+from agents.cache import SqliteStore, StageCache
+from agents.catalog import product_id
+from agents.data_parser import DataParserAgent
+from agents.orchestrator import Orchestrator, init_worker, run_chunk
+from agents.output_writer import make_serializer
+
+_THREAD_STATE = threading.local()
+
+
+def _warm_worker() -> int:
+    """No-op task that forces a pool worker (and its orchestrator) to start."""
+    return os.getpid()
+
+
+def _run_chunk_in_thread(cache_path: str | None, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run a chunk on a warm orchestrator owned by the calling thread."""
+    orchestrator = getattr(_THREAD_STATE, "orchestrator", None)
+    if orchestrator is None:
+        cache = StageCache(store=SqliteStore(cache_path)) if cache_path else None
+        orchestrator = _THREAD_STATE.orchestrator = Orchestrator(cache=cache)
+    results = orchestrator.run_columnar(chunk)
+    if orchestrator.cache is not None:
+        orchestrator.cache.store.flush()
+    return results
+
+
+class ServiceStats:
+    """
+    Thread-safe request, product and latency counters for a running service.
+
+    Latencies of the most recent ``window`` requests are kept for percentile
+    estimates; throughput is reported over the service's uptime.
+    """
+
+    def __init__(self, window: int = 10_000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.products = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self._latencies_ms: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, products: int, errors: int, latency_ms: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.products += products
+            self.errors += errors
+            self._latencies_ms.append(latency_ms)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters, latency percentiles and throughput."""
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+            uptime = time.monotonic() - self.started
+            counters = {
+                "uptime_s": round(uptime, 3),
+                "requests": self.requests,
+                "products": self.products,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+            }
+
+        def percentile(fraction: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 3)
+
+        counters["latency_ms"] = {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(latencies[-1], 3) if latencies else None,
+        }
+        counters["products_per_s"] = round(counters["products"] / uptime, 2) if uptime else 0.0
+        return counters
+
+
+class GenerationService:
+    """
+    Keeps warm orchestrators resident and serves page generation on demand.
+
+    Responsibility: Own a pool of workers, each holding one Orchestrator built
+    once at start-up, so a request pays neither interpreter start-up nor
+    agent/template construction. Requests (one product or a batch) are
+    validated, split into chunks, run on the pool, and their pages streamed
+    back chunk by chunk in input order.
+
+    Backpressure: at most ``queue_size`` requests are admitted at a time
+    (running or waiting for a worker); further requests are rejected
+    immediately instead of queueing without bound, so callers can retry.
+
+    Autonomy: Independent of the transport; ``make_server`` exposes it over
+    a local TCP or Unix socket.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int = 64,
+        chunk_size: int = 16,
+        cache_path: str | None = None,
+        processes: bool = True,
+        max_request_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Start the worker pool and warm every worker.
+
+        Args:
+            workers: Pool size (defaults to the CPU count)
+            queue_size: Maximum admitted requests before new ones are rejected
+            chunk_size: Products per dispatched chunk within a request
+            cache_path: Optional SQLite stage cache shared by the workers
+            processes: Use worker processes (True) or threads in this process
+            max_request_bytes: Largest accepted request body; larger ones get 413
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.cache_path = cache_path
+        self.max_request_bytes = max_request_bytes
+        self.stats = ServiceStats()
+        self.serialize = make_serializer(pretty=False)
+        self._parser = DataParserAgent()
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self.queue_size = max(1, queue_size)
+        if processes:
+            self._pool: Executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=init_worker, initargs=(cache_path,)
+            )
+            self._run = run_chunk
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            self._run = lambda chunk: _run_chunk_in_thread(cache_path, chunk)
+        for future in [self._pool.submit(_warm_worker) for _ in range(self.workers)]:
+            future.result()
+
+    def admit(self) -> bool:
+        """Reserve a queue slot for a request; False if the queue is full."""
+        if self._slots.acquire(blocking=False):
+            self.stats.begin()
+            return True
+        self.stats.reject()
+        return False
+
+    def generate(self, payload: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Generate pages for an admitted request, releasing its slot when done.
+
+        Args:
+            payload: One raw product, a list of products, or ``{"products": [...]}``
+
+        Yields:
+            ``{"id", "pages"}`` per valid product and ``{"id", "errors"}`` per
+            rejected one, in input order
+        """
+        start = time.perf_counter()
+        products, errors = 0, 0
+        try:
+            for line in self._generate(payload):
+                if "pages" in line:
+                    products += 1
+                else:
+                    errors += 1
+                yield line
+        finally:
+            self._slots.release()
+            self.stats.end(products, errors, (time.perf_counter() - start) * 1000)
+
+    def _generate(self, payload: Any) -> Iterator[Dict[str, Any]]:
+        if isinstance(payload, dict) and isinstance(payload.get("products"), list):
+            payload = payload["products"]
+        raw_products = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(product, dict) for product in raw_products):
+            raise ValueError("Products must be JSON objects")
+
+        # Workers receive the validated Products, which skip parsing there
+        valid, quarantined = self._parser.validate_many(raw_products)
+        rejected = {entry["index"]: entry["errors"] for entry in quarantined}
+        entries: List[Tuple[int, str]] = [
+            (index, product_id(product, index)) for index, product in enumerate(raw_products)
+        ]
+        futures = [
+            self._pool.submit(self._run, valid[start:start + self.chunk_size])
+            for start in range(0, len(valid), self.chunk_size)
+        ]
+
+        results: Iterator[Dict[str, Any]] = (
+            pages for future in futures for pages in future.result()
+        )
+        for index, pid in entries:
+            if index in rejected:
+                yield {"id": pid, "errors": rejected[index]}
+            else:
+                yield {"id": pid, "pages": next(results)}
+
+    def close(self) -> None:
+        """Shut the worker pool down."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP front end: ``POST /generate`` (NDJSON stream), ``GET /stats``, ``GET /health``."""
+
+    protocol_version = "HTTP/1.1"
+    service: GenerationService
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            snapshot = self.service.stats.snapshot()
+            snapshot.update(workers=self.service.workers, queue_size=self.service.queue_size)
+            self._send_json(200, snapshot)
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/generate":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > self.service.max_request_bytes:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(
+                413, {"error": f"Request body exceeds {self.service.max_request_bytes} bytes"}
+            )
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except ValueError as exc:
+            self._send_json(400, {"error": f"Invalid JSON body: {exc}"})
+            return
+        if not self.service.admit():
+            self._send_json(503, {"error": "Request queue is full"}, {"Retry-After": "1"})
+            return
+
+        lines = self.service.generate(payload)
+        try:
+            try:
+                line = next(lines, None)
+            except ValueError as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            except Exception as exc:
+                self._send_json(500, {"error": f"Generation failed: {exc}"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            # Flush each product as soon as its chunk of work is done; a
+            # failure once the stream has started ends it with an error line
+            while line is not None:
+                self._send_chunk(self.service.serialize(line) + b"\n")
+                try:
+                    line = next(lines, None)
+                except Exception as exc:
+                    self._send_chunk(self.service.serialize({"error": f"Generation failed: {exc}"}) + b"\n")
+                    break
+            self._send_chunk(b"")
+        finally:
+            lines.close()
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Dict[str, str] | None = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def make_server(service: GenerationService, address: str) -> socketserver.BaseServer:
+    """
+    Bind an HTTP server for ``service``.
+
+    Args:
+        service: The generation service to expose
+        address: ``host:port`` for TCP, or ``unix:/path/to.sock`` for a Unix socket
+
+    Returns:
+        A bound server; call ``serve_forever()`` to start handling requests
+    """
+    handler = type("ServiceHandler", (_Handler,), {"service": service})
+    if address.startswith("unix:"):
+        return _UnixHTTPServer(address[len("unix:"):], handler)
+    host, _, port = address.rpartition(":")
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), handler)
+    server.daemon_threads = True
+    return server
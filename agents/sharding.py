@@ -0,0 +1,371 @@
+"""Sharded Runs - Hash-partitioned catalog generation with resumable checkpoints and manifests"""
+import hashlib
+import json
+import os
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Sequence, Tuple, TYPE_CHECKING
+from agents.catalog import duplicate_entry, iter_catalog, load_catalog, product_id
+from agents.orchestrator import run_chunk
+from agents.output_writer import atomic_write
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from agents.orchestrator import Orchestrator
+    from agents.output_writer import PageWriter
+    from agents.records import Product
+
+# Checkpoints and per-shard manifests live here, inside the shared output directory
+SHARD_DIRNAME = ".shards"
+MERGED_MANIFEST = "manifest.jsonl"
+MERGED_CHANGES = "changed_pages.txt"
+
+
+def shard_of(pid: str, shards: int) -> int:
+    """
+    Deterministic shard index of a product id.
+
+    Uses a blake2b digest rather than ``hash()``, whose value changes
+    between interpreter runs, so every host agrees on the partition.
+    """
+    digest = hashlib.blake2b(pid.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def catalog_fingerprint(path: str | Path) -> str:
+    """
+    Size plus a digest of the whole file, identifying the catalog a checkpoint belongs to.
+
+    The file is hashed in 1 MiB blocks, so memory stays flat for any catalog
+    size, and an edit anywhere in the catalog changes the fingerprint.
+    """
+    path = Path(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return f"{path.stat().st_size}:{digest.hexdigest()}"
+
+
+def shard_paths(output_dir: str | Path, shard: int, shards: int) -> Tuple[Path, Path]:
+    """``(checkpoint, manifest)`` paths of one shard."""
+    stem = Path(output_dir) / SHARD_DIRNAME / f"shard-{shard:05d}-of-{shards:05d}"
+    return stem.with_suffix(".checkpoint.json"), stem.with_suffix(".manifest.jsonl")
+
+
+def shard_change_paths(output_dir: str | Path, shard: int, shards: int) -> Tuple[Path, Path]:
+    """
+    ``(page hashes, changed pages)`` paths of one shard's writer.
+
+    Each shard keeps its own hash manifest and changed-pages list (see
+    ``PageWriter``), so concurrent shards never write the same file.
+    """
+    stem = Path(output_dir) / SHARD_DIRNAME / f"shard-{shard:05d}-of-{shards:05d}"
+    return stem.with_suffix(".hashes"), stem.with_suffix(".changed.txt")
+
+
+def iter_shard(
+    catalog_path: str | Path,
+    shard: int,
+    shards: int,
+    on_error: Callable[[int, str, ValueError], None] | None = None,
+) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """
+    Yield ``(catalog index, product id, raw product)`` for one shard, in catalog order.
+
+    ``on_error`` receives JSONL lines that are not valid JSON, which are
+    skipped (see ``iter_catalog``); without it, such a line raises.
+    """
+    path = Path(catalog_path)
+    products = iter_catalog(path, on_error) if path.suffix == ".jsonl" else iter(load_catalog(path))
+    for index, product in enumerate(products):
+        pid = product_id(product, index)
+        if shard_of(pid, shards) == shard:
+            yield index, pid, product
+
+
+class ShardRunner:
+    """
+    Generates one shard of a catalog, committing progress as it goes.
+
+    Responsibility: Run the products that hash to ``shard`` (of ``shards``)
+    through an Orchestrator and write their pages through ``writer``. Every
+    ``checkpoint_every`` products the shard commits: pages are flushed to
+    disk, one manifest line per product is appended to the shard manifest
+    and fsynced, then the checkpoint (products committed, last id, manifest
+    length) is replaced atomically. JSONL lines that are not valid JSON have
+    no product id to shard by; every shard skips them and lists their line
+    numbers in its checkpoint under ``"undecodable"``. Rows sharing a product
+    id always hash to the same shard, which quarantines all but the first
+    valid one.
+
+    A shard that is killed resumes from its checkpoint: the manifest is cut
+    back to the committed length, committed products are skipped, and any
+    products written after the last commit are simply regenerated (page
+    writes are atomic and idempotent).
+
+    With ``workers`` above one, each commit batch is generated on a process
+    pool of warm orchestrators (``Orchestrator.worker_pool``) kept for the
+    whole run, unless the orchestrator has custom nodes or observers that
+    workers cannot reproduce (``Orchestrator.local_only``).
+
+    Autonomy: Shards share nothing but the output directory, so they can run
+    as separate processes on one host or on several hosts over a shared
+    filesystem; ``merge_shards`` combines their manifests afterwards.
+    """
+
+    def __init__(
+        self,
+        orchestrator: "Orchestrator",
+        writer: "PageWriter",
+        catalog_path: str | Path,
+        shard: int,
+        shards: int,
+        checkpoint_every: int = 100,
+        pages: Sequence[str] | None = None,
+        workers: int | None = None,
+    ):
+        """
+        Prepare a shard run.
+
+        Args:
+            orchestrator: Orchestrator used to generate each product's pages
+            writer: Page writer over the shared output directory
+            catalog_path: Catalog file (.json or .jsonl) every shard reads
+            shard: This shard's index, ``0 <= shard < shards``
+            shards: Total number of shards
+            checkpoint_every: Products per commit
+            pages: Optional output filenames to generate (default: all pages)
+            workers: Worker processes per commit batch (default: generate in-process)
+        """
+        if not 0 <= shard < shards:
+            raise ValueError(f"Shard index {shard} out of range for {shards} shards")
+        self.orchestrator = orchestrator
+        self.writer = writer
+        self.catalog_path = Path(catalog_path)
+        self.shard = shard
+        self.shards = shards
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.pages = None if pages is None else sorted(pages)
+        self.workers = max(1, workers or 1)
+        self.checkpoint_path, self.manifest_path = shard_paths(writer.output_dir, shard, shards)
+        self.fingerprint = catalog_fingerprint(self.catalog_path)
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        """The shard's committed progress (a fresh checkpoint if none exists)."""
+        if not self.checkpoint_path.exists():
+            return {
+                "shard": self.shard,
+                "shards": self.shards,
+                "catalog": self.fingerprint,
+                "pages": self.pages,
+                "committed": 0,
+                "last_id": None,
+                "manifest_bytes": 0,
+                "generated": 0,
+                "quarantined": 0,
+                "undecodable": [],
+                "complete": False,
+            }
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if (
+            checkpoint["catalog"] != self.fingerprint
+            or checkpoint["shards"] != self.shards
+            or checkpoint.get("pages") != self.pages
+        ):
+            raise ValueError(
+                f"{self.checkpoint_path} belongs to a different catalog, shard count or page set; "
+                "remove it to restart the shard"
+            )
+        return checkpoint
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Process the shard to completion, resuming from its checkpoint.
+
+        Returns:
+            The final checkpoint, plus ``"resumed_from"`` (products skipped)
+        """
+        checkpoint = self.load_checkpoint()
+        resumed_from = checkpoint["committed"]
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "ab") as manifest:
+            # Drop manifest lines appended after the last commit
+            manifest.truncate(checkpoint["manifest_bytes"])
+        # Product id -> catalog index of the row that generated it
+        self._first_rows: Dict[str, int] = {}
+        with open(self.manifest_path, "r", encoding="utf-8") as manifest:
+            for line in manifest:
+                entry = json.loads(line)
+                if entry["status"] == "ok":
+                    self._first_rows[entry["id"]] = entry["index"]
+        if not resumed_from and getattr(self.writer, "change_detection", False):
+            # A fresh shard run reports its own changes; a resumed one extends them
+            self.writer.restart_changes()
+
+        # Line number -> decode error; a resumed shard re-reads the lines it already listed
+        self._undecodable = {entry["line"]: entry["error"] for entry in checkpoint.get("undecodable", [])}
+        products = iter_shard(
+            self.catalog_path,
+            self.shard,
+            self.shards,
+            on_error=lambda number, line, error: self._undecodable.setdefault(number, str(error)),
+        )
+        if resumed_from:
+            skipped = list(islice(products, resumed_from))
+            if len(skipped) < resumed_from or skipped[-1][1] != checkpoint["last_id"]:
+                raise ValueError(
+                    f"{self.checkpoint_path} does not match the catalog's shard contents; "
+                    "remove it to restart the shard"
+                )
+
+        # Custom nodes and observers only exist in this process (``local_only``)
+        in_process = self.workers == 1 or self.orchestrator.local_only()
+        pool = None if in_process else self.orchestrator.worker_pool(self.workers)
+        try:
+            while not checkpoint["complete"]:
+                batch = list(islice(products, self.checkpoint_every))
+                self._commit(checkpoint, batch, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return {**checkpoint, "resumed_from": resumed_from}
+
+    def _commit(
+        self,
+        checkpoint: Dict[str, Any],
+        batch: List[Tuple[int, str, Dict[str, Any]]],
+        pool: "Executor | None" = None,
+    ) -> None:
+        """Generate, write and durably record one batch of the shard."""
+        valid, quarantined = self.orchestrator.data_parser.validate_many(
+            [product for _, _, product in batch]
+        )
+        rejected = {entry["index"]: entry["errors"] for entry in quarantined}
+        products, unique = iter(valid), []
+        for position, (index, pid, product) in enumerate(batch):
+            if position in rejected:
+                continue
+            parsed = next(products)
+            first = self._first_rows.setdefault(pid, index)
+            if first != index:
+                rejected[position] = duplicate_entry(index, product, pid, first)["errors"]
+                continue
+            unique.append(parsed)
+        # The validated Products go straight into the workflow, skipping parse_data
+        results = iter(self._generate(unique, pool))
+
+        lines = []
+        for position, (index, pid, product) in enumerate(batch):
+            if position in rejected:
+                entry = {
+                    "index": index, "id": pid, "status": "quarantined", "errors": rejected[position],
+                }
+            else:
+                pages = next(results)
+                self.writer.write(pid, pages)
+                path = self.writer.product_dir(pid).relative_to(self.writer.output_dir)
+                entry = {
+                    "index": index, "id": pid, "status": "ok", "path": path.as_posix(), "pages": list(pages),
+                }
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.writer.flush()
+
+        with open(self.manifest_path, "ab") as manifest:
+            manifest.write("".join(lines).encode("utf-8"))
+            manifest.flush()
+            os.fsync(manifest.fileno())
+            checkpoint["manifest_bytes"] = manifest.tell()
+
+        checkpoint["committed"] += len(batch)
+        checkpoint["quarantined"] += len(rejected)
+        checkpoint["undecodable"] = [
+            {"line": number, "error": error} for number, error in sorted(self._undecodable.items())
+        ]
+        checkpoint["generated"] += len(batch) - len(rejected)
+        if batch:
+            checkpoint["last_id"] = batch[-1][1]
+        checkpoint["complete"] = len(batch) < self.checkpoint_every
+        atomic_write(self.checkpoint_path, json.dumps(checkpoint, indent=2).encode("utf-8"))
+
+    def _generate(self, products: List["Product"], pool: "Executor | None") -> List[Dict[str, Any]]:
+        """Pages of a commit batch's valid products, in order (on ``pool`` when given)."""
+        if pool is None or len(products) < 2:
+            return self.orchestrator.run_columnar(products, self.pages)
+        size = -(-len(products) // self.workers)
+        chunks = [products[start:start + size] for start in range(0, len(products), size)]
+        results: List[Dict[str, Any]] = []
+        for chunk_result in pool.map(partial(run_chunk, pages=self.pages), chunks):
+            results.extend(chunk_result)
+        return results
+
+
+def merge_shards(output_dir: str | Path) -> Dict[str, Any]:
+    """
+    Combine every shard manifest into ``<output_dir>/manifest.jsonl``.
+
+    Entries are written in catalog order. The shards' changed-pages lists
+    are concatenated into ``<output_dir>/changed_pages.txt``. All shards of
+    the run must have completed, over the same catalog (by fingerprint) and
+    page set; the shard count is read from the checkpoints.
+
+    Returns:
+        Summary with ``shards``, ``generated``, ``quarantined`` and ``changed``
+        counts, plus ``undecodable``: the catalog lines skipped as invalid JSON
+
+    Raises:
+        ValueError: If no shard checkpoints exist, some shard is missing or
+            incomplete, or the checkpoints disagree on catalog or page set
+    """
+    output_dir = Path(output_dir)
+    checkpoints = []
+    for path in sorted((output_dir / SHARD_DIRNAME).glob("shard-*.checkpoint.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoints.append(json.load(f))
+    if not checkpoints:
+        raise ValueError(f"No shard checkpoints found in {output_dir / SHARD_DIRNAME}")
+
+    shard_counts = {checkpoint["shards"] for checkpoint in checkpoints}
+    if len(shard_counts) != 1:
+        raise ValueError(f"Checkpoints from runs with different shard counts: {sorted(shard_counts)}")
+    shards = shard_counts.pop()
+    catalogs = {checkpoint["catalog"] for checkpoint in checkpoints}
+    if len(catalogs) != 1:
+        raise ValueError(f"Checkpoints from runs over different catalogs: {sorted(catalogs)}")
+    page_sets = {json.dumps(checkpoint.get("pages")) for checkpoint in checkpoints}
+    if len(page_sets) != 1:
+        raise ValueError(f"Checkpoints from runs with different page sets: {sorted(page_sets)}")
+    done = {checkpoint["shard"] for checkpoint in checkpoints if checkpoint["complete"]}
+    missing = sorted(set(range(shards)) - done)
+    if missing:
+        raise ValueError(f"Shards not complete: {missing} (of {shards})")
+
+    entries = []
+    changes: List[str] = []
+    for shard in range(shards):
+        _, manifest_path = shard_paths(output_dir, shard, shards)
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+        _, changes_path = shard_change_paths(output_dir, shard, shards)
+        if changes_path.exists():
+            with open(changes_path, "r", encoding="utf-8") as f:
+                changes.extend(line for line in f if line.strip())
+    entries.sort(key=lambda entry: entry["index"])
+    atomic_write(output_dir / MERGED_CHANGES, "".join(changes).encode("utf-8"))
+
+    atomic_write(
+        output_dir / MERGED_MANIFEST,
+        "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8"),
+    )
+    return {
+        "shards": shards,
+        "generated": sum(checkpoint["generated"] for checkpoint in checkpoints),
+        "quarantined": sum(checkpoint["quarantined"] for checkpoint in checkpoints),
+        "changed": len(changes),
+        # Every shard reads (and lists) the same undecodable lines
+        "undecodable": sorted({
+            entry["line"] for checkpoint in checkpoints for entry in checkpoint.get("undecodable", [])
+        }),
+    }
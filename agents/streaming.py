@@ -0,0 +1,71 @@
+"""Streaming Writer - Buffered JSONL output for streamed workflow results"""
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, IO
+from agents.records import json_default
+
+
+class JsonlPageWriter:
+    """
+    Writes assembled pages as JSONL with buffered bulk writes.
+
+    Each product becomes one compact JSON line of the form
+    ``{"id": <product id>, "pages": {<filename>: <page>, ...}}``. Lines are
+    accumulated in memory and flushed to the underlying stream in batches, so
+    the number of write calls is independent of the catalog size.
+
+    Usable as a context manager; pending lines are flushed on exit.
+    """
+
+    def __init__(self, destination: str | Path, buffer_size: int = 256):
+        """
+        Open the destination for writing.
+
+        Args:
+            destination: Output ``.jsonl`` path, or ``"-"`` for stdout
+            buffer_size: Number of records to accumulate before each bulk write
+        """
+        self.buffer_size = max(1, buffer_size)
+        self.records_written = 0
+        self._buffer: List[str] = []
+        if str(destination) == "-":
+            self._stream: IO[str] = sys.stdout
+            self._owns_stream = False
+        else:
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+            self._stream = open(destination, "w", encoding="utf-8")
+            self._owns_stream = True
+
+    def write(self, product_id: str, pages: Dict[str, Any]) -> None:
+        """Queue one product's pages, flushing once the buffer is full."""
+        self._buffer.append(
+            json.dumps(
+                {"id": product_id, "pages": pages},
+                ensure_ascii=False,
+                separators=(",", ":"),
+                default=json_default,
+            )
+        )
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered lines in a single call."""
+        if self._buffer:
+            self._stream.write("\n".join(self._buffer) + "\n")
+            self.records_written += len(self._buffer)
+            self._buffer.clear()
+        self._stream.flush()
+
+    def close(self) -> None:
+        """Flush pending lines and close the destination if this writer opened it."""
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+    def __enter__(self) -> "JsonlPageWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
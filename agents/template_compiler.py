@@ -0,0 +1,186 @@
+"""Template Compiler - Loads page templates from JSON and compiles them into renderers"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Iterable, Set, Tuple
+from agents.interning import intern
+
+# Default location of the page template files
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+# Read-only stand-in for missing intermediate path segments
+_EMPTY: Dict[str, Any] = {}
+
+_cache_lock = threading.Lock()
+_template_cache: Dict[Tuple[str, int], "PageTemplate"] = {}
+
+
+class _InternSite:
+    """
+    ``intern`` for one ``$intern`` marker, holding on to its latest result.
+
+    The intern registry keeps structures only while something references
+    them; a render site that yields the same structure for every product
+    would otherwise rebuild it each time the previous pages are released.
+    """
+
+    __slots__ = ("last",)
+
+    def __init__(self):
+        self.last = None
+
+    def __call__(self, value: Any) -> Any:
+        self.last = shared = intern(value)
+        return shared
+
+
+class CompiledTemplate:
+    """
+    A JSON template compiled into a single Python render function.
+
+    Template trees are plain JSON, where these object forms mark dynamic parts:
+
+    - ``{"$slot": "a.b", "default": <json>}``: the value at path ``a.b`` in the
+      render context, or ``default`` (``None`` if omitted) when missing
+    - ``{"$count": "a"}``: the length of the list at path ``a``
+    - ``{"$intern": <tree>}``: render ``tree``, then return the shared interned
+      instance equal to it (for parts that are dynamic in the template but
+      identical for every product, such as page ``meta``)
+
+    Compilation walks the tree once and emits one Python expression that
+    builds the page as a literal with each slot's path inlined as chained
+    lookups, so rendering does no tree walking or path parsing. Non-empty
+    subtrees without slots are interned once at compile time and every
+    render returns the same immutable instance instead of a fresh copy.
+    """
+
+    def __init__(self, tree: Any, name: str = "template"):
+        """Compile a template tree."""
+        self.name = name
+        self.slot_paths: List[Tuple[str, ...]] = []
+        self.constants: Dict[str, Any] = {}
+        source = f"lambda ctx: {self._compile(tree)}"
+        self.source = source
+        self.render: Callable[[Dict[str, Any]], Any] = eval(
+            compile(source, f"<template {name}>", "eval"),
+            {"_EMPTY": _EMPTY, **self.constants},
+        )
+
+    @property
+    def slot_roots(self) -> Set[str]:
+        """First path segment of every slot, i.e. the context keys the template reads."""
+        return {path[0] for path in self.slot_paths}
+
+    def render_many(self, contexts: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Render the template once per context, e.g. for a batch of products."""
+        render = self.render
+        return [render(ctx) for ctx in contexts]
+
+    def _compile(self, node: Any) -> str:
+        """Return a Python expression that builds ``node`` from ``ctx``."""
+        if node and isinstance(node, (dict, list)) and self._is_static(node):
+            name = f"_C{len(self.constants)}"
+            self.constants[name] = intern(node)
+            return name
+        if isinstance(node, dict):
+            if "$slot" in node:
+                return self._lookup(node["$slot"], self._compile(node.get("default")))
+            if "$count" in node:
+                return f"len({self._lookup(node['$count'], '()')})"
+            if "$intern" in node:
+                name = f"_I{len(self.constants)}"
+                self.constants[name] = _InternSite()
+                return f"{name}({self._compile(node['$intern'])})"
+            items = ", ".join(f"{k!r}: {self._compile(v)}" for k, v in node.items())
+            return "{" + items + "}"
+        if isinstance(node, list):
+            return "[" + ", ".join(self._compile(item) for item in node) + "]"
+        return repr(node)
+
+    @classmethod
+    def _is_static(cls, node: Any) -> bool:
+        """True if ``node`` contains no slot markers."""
+        if isinstance(node, dict):
+            if "$slot" in node or "$count" in node or "$intern" in node:
+                return False
+            return all(cls._is_static(value) for value in node.values())
+        if isinstance(node, list):
+            return all(cls._is_static(item) for item in node)
+        return True
+
+    def _lookup(self, dotted_path: str, default_expr: str) -> str:
+        """Inline chained ``.get`` lookups for a dotted slot path."""
+        path = tuple(dotted_path.split("."))
+        self.slot_paths.append(path)
+        expr = "ctx"
+        for key in path[:-1]:
+            expr += f".get({key!r}, _EMPTY)"
+        return f"{expr}.get({path[-1]!r}, {default_expr})"
+
+
+class PageTemplate:
+    """
+    One page type, as declared by a ``*_template.json`` file.
+
+    Each file holds a single top-level ``<name>_template`` object with:
+
+    - ``order``: position of the page in the generated output
+    - ``page``: key of the templated page produced by TemplateEngineAgent
+    - ``output``: filename of the final page produced by PageAssemblerAgent
+    - ``template``: tree rendered from the content blocks
+    - ``layout``: tree rendered from ``{"page": <templated page>, "questions": [...]}``
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        """Compile both stages of a page template spec."""
+        self.name = name
+        self.order = spec.get("order", 0)
+        self.page = spec["page"]
+        self.output = spec["output"]
+        self.template = CompiledTemplate(spec["template"], f"{name}.template")
+        self.layout = CompiledTemplate(spec["layout"], f"{name}.layout")
+
+
+def load_page_template(path: str | Path) -> PageTemplate:
+    """
+    Load and compile one template file, reusing the compiled result.
+
+    Compiled templates are cached per process by path and modification time,
+    so every agent instance and every run share them and edited files are
+    picked up automatically.
+    """
+    path = Path(path).resolve()
+    key = (str(path), path.stat().st_mtime_ns)
+    with _cache_lock:
+        cached = _template_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    (name, spec), = data.items()
+    compiled = PageTemplate(name, spec)
+    with _cache_lock:
+        _template_cache[key] = compiled
+    return compiled
+
+
+def load_page_templates(templates_dir: str | Path | None = None) -> List[PageTemplate]:
+    """
+    Load every ``*_template.json`` in a directory, sorted by declared order.
+
+    Adding a page type only requires dropping a new template file here.
+    """
+    directory = Path(templates_dir) if templates_dir else TEMPLATES_DIR
+    templates = [load_page_template(path) for path in directory.glob("*_template.json")]
+    return sorted(templates, key=lambda template: (template.order, template.name))
+
+
+def templates_fingerprint(templates_dir: str | Path | None = None) -> str:
+    """Content hash of every ``*_template.json`` in a directory (names and bytes)."""
+    directory = Path(templates_dir) if templates_dir else TEMPLATES_DIR
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(directory.glob("*_template.json")):
+        digest.update(path.name.encode("utf-8") + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()
@@ -1,5 +1,6 @@
 """Template Engine Agent - Maps content blocks to page-specific templates"""
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List
+from agents.template_compiler import load_page_templates
 
 
 class TemplateEngineAgent:
@@ -14,66 +15,67 @@ class TemplateEngineAgent:
     """
 
     def __init__(self, config: Dict[str, Any] | None = None):
-        """Initialize the TemplateEngine agent."""
+        """
+        Initialize the TemplateEngine agent.
+
+        Page layouts come from the ``*_template.json`` files in
+        ``config["templates_dir"]`` (default: the repo's ``templates/``),
+        compiled once and shared across agent instances.
+        """
         self.config = config or {}
+        self.page_templates = load_page_templates(self.config.get("templates_dir"))
+        # Content blocks each templated page is built from
+        self.page_blocks = {
+            template.page: tuple(sorted(template.template.slot_roots))
+            for template in self.page_templates
+        }
 
-    def execute(self, content_blocks: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(
+        self, content_blocks: Dict[str, Any], pages: Iterable[str] | None = None
+    ) -> Dict[str, Any]:
         """
         Apply content blocks to page-specific templates.
         
         Args:
             content_blocks: Content blocks from ContentBlockAgent
+            pages: Optional subset of templated page names to render (default: all)
             
         Returns:
-            Dictionary of templated pages:
+            Dictionary of templated pages, one per page template:
             - faq_page: FAQ page with questions organized by category
             - product_page: Product showcase page
             - comparison_page: Competitive comparison page
         """
-        # Extract blocks
-        benefits = content_blocks.get("benefits_block", {})
-        ingredients = content_blocks.get("ingredients_block", {})
-        usage = content_blocks.get("usage_block", {})
-        comparison = content_blocks.get("comparison_block", {})
-        faqs = content_blocks.get("faq_blocks", {})
-
-        # Template 1: FAQ Page
-        faq_page = {
-            "page_type": "faq",
-            "title": "Frequently Asked Questions",
-            "description": "Find answers to common questions about our product",
-            "sections": faqs.get("categories", {}),
+        return {
+            template.page: template.template.render(content_blocks)
+            for template in self.page_templates
+            if pages is None or template.page in pages
         }
 
-        # Template 2: Product Page
-        product_page = {
-            "page_type": "product",
-            "title": "Product Overview",
-            "benefits_section": benefits,
-            "ingredients_section": ingredients,
-            "usage_section": usage,
-            "highlights": [
-                "Premium Formula",
-                "Dermatologist Tested",
-                "Cruelty-Free",
-                "Fast-Acting Results",
-            ],
-        }
+    def execute_many(
+        self, content_blocks_batch: List[Dict[str, Any]], pages: Iterable[str] | None = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply content blocks to page templates for many products at once.
 
-        # Template 3: Comparison Page
-        comparison_page = {
-            "page_type": "comparison",
-            "title": "Why Choose Us?",
-            "comparison_data": comparison,
-            "testimonials": [
-                "Trusted by skincare professionals",
-                "Used by thousands of satisfied customers",
-                "Award-winning formula",
-            ],
-        }
+        Each compiled template renders the whole batch with one ``render_many``
+        call before the next template starts, so the result equals ``execute``
+        applied to every product.
 
-        return {
-            "faq_page": faq_page,
-            "product_page": product_page,
-            "comparison_page": comparison_page,
-        }
+        Args:
+            content_blocks_batch: Content blocks from ContentBlockAgent, one per product
+            pages: Optional subset of templated page names to render (default: all)
+
+        Returns:
+            List of templated page dicts, one per product, in input order
+        """
+        columns = [
+            (template.page, template.template.render_many(content_blocks_batch))
+            for template in self.page_templates
+            if pages is None or template.page in pages
+        ]
+        batch: List[Dict[str, Any]] = [{} for _ in content_blocks_batch]
+        for page, rendered in columns:
+            for templated, page_data in zip(batch, rendered):
+                templated[page] = page_data
+        return batch
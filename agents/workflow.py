@@ -0,0 +1,399 @@
+"""Workflow Graph - Declared DAG of agent nodes and a dependency-aware scheduler"""
+from typing import Dict, Any, List, Awaitable, Callable, Iterator, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor
+
+
+class WorkflowNode:
+    """
+    A single node of the workflow DAG.
+
+    Responsibility: Wrap one agent call together with the ``state`` keys it
+    reads (inputs) and writes (outputs), so the scheduler can derive edges
+    from data flow instead of from a hardcoded order.
+
+    The callable receives its inputs positionally, in declared order. A node
+    with a single output stores the return value under that key; a node with
+    several outputs must return a dict keyed by output name.
+
+    A node may also carry an ``async_fn`` coroutine function with the same
+    signature, used instead of ``fn`` when the graph runs under asyncio.
+
+    ``options`` are state keys passed as keyword arguments when present in
+    state; they tune a call (e.g. which pages to build) and need not exist.
+    An option that another node produces still orders that node first. A
+    node whose outputs are all already in state was satisfied by the caller
+    and is skipped.
+
+    Observers (see ``WorkflowGraph.add_observer``) are notified around each
+    call; with none attached the only cost is one empty-list check.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Sequence[str],
+        outputs: Sequence[str],
+        observers: List[Any] | None = None,
+        async_fn: Callable[..., Awaitable[Any]] | None = None,
+        options: Sequence[str] = (),
+    ):
+        """Declare a node; ``outputs`` must name at least one state key."""
+        if not outputs:
+            raise ValueError(f"Node '{name}' must declare at least one output")
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.observers = observers if observers is not None else []
+        self.async_fn = async_fn
+        self.options = tuple(options)
+
+    def compute(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the node on its inputs from state and return its outputs by key."""
+        if self.observers:
+            return self._observed_compute(state)
+        return self._outputs(self._call(self.fn, state))
+
+    async def compute_async(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Like ``compute``, awaiting ``async_fn`` when the node has one."""
+        if self.async_fn is None:
+            return self.compute(state)
+        observers = list(self.observers)
+        tokens = [observer.on_node_start(self, state) for observer in observers]
+        outputs = None
+        error = None
+        try:
+            outputs = self._outputs(await self._call(self.async_fn, state))
+            return outputs
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            for observer, token in zip(reversed(observers), reversed(tokens)):
+                observer.on_node_end(self, state, outputs, error, token)
+
+    def provided(self, state: Dict[str, Any]) -> bool:
+        """Whether every output is already in state, so the node need not run."""
+        for key in self.outputs:
+            if key not in state:
+                return False
+        return True
+
+    def _call(self, fn: Callable[..., Any], state: Dict[str, Any]) -> Any:
+        """Call ``fn`` on the node's inputs, plus whichever options state holds."""
+        args = [state[key] for key in self.inputs]
+        if self.options:
+            return fn(*args, **{key: state[key] for key in self.options if key in state})
+        return fn(*args)
+
+    def _outputs(self, result: Any) -> Dict[str, Any]:
+        """Map the callable's return value onto the declared output keys."""
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        return {key: result[key] for key in self.outputs}
+
+    def _observed_compute(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute with ``on_node_start``/``on_node_end`` notifications to every observer."""
+        observers = list(self.observers)
+        tokens = [observer.on_node_start(self, state) for observer in observers]
+        outputs = None
+        error = None
+        try:
+            outputs = self._outputs(self._call(self.fn, state))
+            return outputs
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            for observer, token in zip(reversed(observers), reversed(tokens)):
+                observer.on_node_end(self, state, outputs, error, token)
+
+    def run(self, state: Dict[str, Any]) -> None:
+        """Compute the node and write its outputs into state, unless they are already there."""
+        if not self.provided(state):
+            state.update(self.compute(state))
+
+    def __repr__(self) -> str:
+        return f"WorkflowNode({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+class WorkflowGraph:
+    """
+    Directed Acyclic Graph of workflow nodes with a dependency-aware scheduler.
+
+    Responsibility: Hold the registered nodes, derive edges from each node's
+    declared inputs and outputs, and execute them. Nodes whose inputs are all
+    available run as soon as they become ready; with an executor, independent
+    nodes (and nodes of different products) run concurrently.
+
+    Iterating the graph yields node names in a valid topological order.
+    """
+
+    def __init__(self):
+        """Create an empty graph."""
+        self.nodes: Dict[str, WorkflowNode] = {}
+        # Shared by every node, so attaching an observer applies graph-wide
+        self.observers: List[Any] = []
+        self._producers: Dict[str, str] = {}
+        self._order: List[str] | None = None
+
+    def add_node(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Sequence[str],
+        outputs: Sequence[str],
+        async_fn: Callable[..., Awaitable[Any]] | None = None,
+        options: Sequence[str] = (),
+    ) -> WorkflowNode:
+        """
+        Register a node.
+
+        Args:
+            name: Unique node name
+            fn: Callable taking the input values positionally
+            inputs: State keys the node reads
+            outputs: State keys the node writes
+            async_fn: Optional coroutine function used by ``run_async``
+            options: State keys passed as keyword arguments when present
+
+        Returns:
+            The registered WorkflowNode
+
+        Raises:
+            ValueError: If the name is taken, an output already has a producer,
+                or the node would introduce a cycle
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' is already registered")
+        node = WorkflowNode(name, fn, inputs, outputs, self.observers, async_fn, options)
+        for key in node.outputs:
+            if key in self._producers:
+                raise ValueError(
+                    f"State key '{key}' is already produced by node '{self._producers[key]}'"
+                )
+
+        self.nodes[name] = node
+        for key in node.outputs:
+            self._producers[key] = name
+        self._order = None
+        try:
+            self.topological_order()
+        except ValueError:
+            del self.nodes[name]
+            for key in node.outputs:
+                del self._producers[key]
+            self._order = None
+            raise
+        return node
+
+    def add_observer(self, observer: Any) -> None:
+        """
+        Attach an observer to every node.
+
+        Observers implement ``on_node_start(node, state) -> token`` and
+        ``on_node_end(node, state, outputs, error, token)``; the token returned
+        by the first is passed back to the second.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Any) -> None:
+        """Detach a previously attached observer."""
+        self.observers.remove(observer)
+
+    def dependencies(self, name: str) -> List[str]:
+        """Names of the nodes that produce the given node's inputs (and options)."""
+        node = self.nodes[name]
+        return [
+            self._producers[key]
+            for key in node.inputs + node.options
+            if key in self._producers
+        ]
+
+    def topological_order(self) -> List[str]:
+        """Return node names in dependency order, preserving registration order for ties."""
+        if self._order is not None:
+            return self._order
+
+        order: List[str] = []
+        visiting: set = set()
+        done: set = set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Workflow graph has a cycle through node '{name}'")
+            visiting.add(name)
+            for dependency in self.dependencies(name):
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        self._order = order
+        return order
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.topological_order())
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def run(self, state: Dict[str, Any], executor: "Executor | None" = None) -> Dict[str, Any]:
+        """
+        Execute every node for one product's state.
+
+        Args:
+            state: Shared state dict holding at least the graph's external inputs
+            executor: Optional executor; when given, ready nodes run concurrently
+
+        Returns:
+            The same state dict, populated with every node's outputs
+        """
+        return self.run_many([state], executor)[0]
+
+    def run_many(
+        self,
+        states: List[Dict[str, Any]],
+        executor: "Executor | None" = None,
+        max_in_flight: int = 64,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute every node for many products' states at once.
+
+        Each (product, node) pair is scheduled as soon as that product's inputs
+        for the node are available, so independent nodes and different
+        products overlap when an executor is supplied. At most
+        ``max_in_flight`` products are admitted at a time; the next one starts
+        when an earlier product's last node completes. Scheduling costs a
+        future per node, which only pays off when nodes wait on I/O or release
+        the GIL.
+
+        Args:
+            states: One shared state dict per product
+            executor: Optional executor; without one, nodes run sequentially
+            max_in_flight: Maximum number of products with nodes in progress
+
+        Returns:
+            The given state dicts, populated with every node's outputs
+        """
+        order = self.topological_order()
+        if executor is None:
+            for state in states:
+                for name in order:
+                    self.nodes[name].run(state)
+            return states
+
+        # Imported here: sequential runs never need the futures machinery
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        dependencies = {name: self.dependencies(name) for name in order}
+        dependents = self._dependents()
+        remaining: Dict[int, Dict[str, set]] = {}
+        running: Dict[int, int] = {}
+        in_flight: set = set()
+        scheduled: Dict[Any, Tuple[int, str]] = {}
+
+        def submit_ready(index: int) -> None:
+            pending = remaining[index]
+            ready = [n for n, deps in pending.items() if not deps]
+            while ready:
+                for name in ready:
+                    del pending[name]
+                    if self.nodes[name].provided(states[index]):
+                        # Outputs supplied by the caller: complete without running
+                        for dependent in dependents[name]:
+                            pending[dependent].discard(name)
+                    else:
+                        future = executor.submit(self.nodes[name].compute, states[index])
+                        in_flight.add(future)
+                        scheduled[future] = (index, name)
+                        running[index] += 1
+                ready = [n for n, deps in pending.items() if not deps]
+            if not running[index]:
+                del remaining[index], running[index]
+
+        admitted = 0
+
+        def admit() -> None:
+            nonlocal admitted
+            while admitted < len(states) and len(running) < max(1, max_in_flight):
+                remaining[admitted] = {name: set(deps) for name, deps in dependencies.items()}
+                running[admitted] = 0
+                submit_ready(admitted)
+                admitted += 1
+
+        admit()
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, name = scheduled.pop(future)
+                states[index].update(future.result())
+                running[index] -= 1
+                for dependent in dependents[name]:
+                    remaining[index][dependent].discard(name)
+                submit_ready(index)
+            admit()
+        return states
+
+    async def run_async(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute every node for one product's state under asyncio.
+
+        Nodes with an ``async_fn`` are awaited; every node whose inputs are
+        ready is launched at once, so independent async nodes overlap.
+
+        Args:
+            state: Shared state dict holding at least the graph's external inputs
+
+        Returns:
+            The same state dict, populated with every node's outputs
+        """
+        import asyncio
+
+        remaining = {name: set(self.dependencies(name)) for name in self.topological_order()}
+        dependents = self._dependents()
+        running: Dict[asyncio.Future, str] = {}
+
+        def launch_ready() -> None:
+            ready = [n for n, deps in remaining.items() if not deps]
+            while ready:
+                for name in ready:
+                    del remaining[name]
+                    if self.nodes[name].provided(state):
+                        # Outputs supplied by the caller: complete without running
+                        for dependent in dependents[name]:
+                            remaining[dependent].discard(name)
+                    else:
+                        running[asyncio.ensure_future(self.nodes[name].compute_async(state))] = name
+                ready = [n for n, deps in remaining.items() if not deps]
+
+        launch_ready()
+        try:
+            while running:
+                finished, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    state.update(task.result())
+                    for dependent in dependents[name]:
+                        remaining[dependent].discard(name)
+                launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+        return state
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        """Map each node to the nodes that consume its outputs."""
+        dependents: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for name in self.nodes:
+            for dependency in set(self.dependencies(name)):
+                dependents[dependency].append(name)
+        return dependents
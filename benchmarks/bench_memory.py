@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for in-flight pipeline state.
+
+Runs the workflow over a synthetic catalog and keeps every product's full
+state (``parsed_product``, ``questions``, ``content_blocks``,
+``templated_pages``, ``final_pages``) alive, as a batch holding tens of
+thousands of products in flight does. Retained heap per product is measured
+twice: with the slotted records the agents produce, and with the same state
+converted to plain nested dicts (the representation used before records).
+Results are printed as machine-readable JSON:
+
+    python -m benchmarks.bench_memory --products 5000 --output memory.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+from typing import Dict, Any, List, Callable
+
+from agents.orchestrator import Orchestrator
+from agents.interning import shared_id
+from agents.records import Record, json_default
+from benchmarks.bench_pipeline import make_catalog
+
+STATE_KEYS = ("parsed_product", "questions", "content_blocks", "templated_pages", "final_pages")
+
+
+def run_states(orchestrator: Orchestrator, catalog: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Full workflow state for every product."""
+    states = []
+    for product in catalog:
+        state = orchestrator.workflow_graph.run({"raw_product": product})
+        states.append({key: state[key] for key in STATE_KEYS})
+    return states
+
+
+def _dict_view(value: Any, memo: Dict[int, Any]) -> Any:
+    """
+    Plain dict/list copy of ``value`` that keeps object sharing intact.
+
+    Objects referenced from several places (blocks reused by templated and
+    final pages) are converted once, and interned constants are kept as is,
+    matching how the dict-based pipeline shared them.
+    """
+    if shared_id(value) is not None and not isinstance(value, Record):
+        return value
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, Record):
+        value_dict = json_default(value)
+    elif isinstance(value, (dict, list, tuple)):
+        value_dict = value
+    else:
+        return value
+    if isinstance(value_dict, dict):
+        converted = {key: _dict_view(item, memo) for key, item in value_dict.items()}
+    else:
+        converted = [_dict_view(item, memo) for item in value_dict]
+    memo[id(value)] = converted
+    return converted
+
+
+def as_dicts(states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The same states with every record replaced by its plain dict view."""
+    memo: Dict[int, Any] = {}
+    converted = [{key: _dict_view(value, memo) for key, value in state.items()} for state in states]
+    memo.clear()
+    return converted
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """Heap still allocated after ``build`` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def parse_args(argv=None):
+    """Parse benchmark options."""
+    parser = argparse.ArgumentParser(description="Benchmark retained memory of pipeline state")
+    parser.add_argument("--products", type=int, default=2000, help="Synthetic catalog size")
+    parser.add_argument("--seed", type=int, default=0, help="Catalog RNG seed")
+    parser.add_argument("--output", default="-", help="JSON report path ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Measure retained bytes per product for records and dict views."""
+    args = parse_args(argv)
+    catalog = make_catalog(args.products, args.seed)
+    orchestrator = Orchestrator()
+    orchestrator.run(catalog[0])  # warm up templates and interned constants
+
+    records = retained_bytes(lambda: run_states(orchestrator, catalog))
+    dicts = retained_bytes(lambda: as_dicts(run_states(orchestrator, catalog)))
+    report = {
+        "config": {"products": args.products, "seed": args.seed},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": {
+            "dict_bytes_per_product": round(dicts / args.products),
+            "record_bytes_per_product": round(records / args.products),
+            "reduction": round(1 - records / dicts, 4) if dicts else None,
+        },
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        sys.stdout.write(payload + "\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
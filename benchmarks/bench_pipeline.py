@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the orchestration pipeline.
+
+Generates a synthetic catalog shaped like data/glowboost_product.json, then
+times every agent stage and the end-to-end Orchestrator in single-product,
+batch and streaming modes. Results are printed as machine-readable JSON:
+
+    python -m benchmarks.bench_pipeline --products 5000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List, Callable, Tuple
+
+from agents.orchestrator import Orchestrator, run_chunk
+
+BENEFITS = [
+    "Brightening", "Fades dark spots", "Hydrating", "Reduces fine lines",
+    "Evens skin tone", "Boosts radiance", "Calms redness", "Firms skin",
+]
+INGREDIENTS = [
+    "Vitamin C", "Hyaluronic Acid", "Niacinamide", "Retinol", "Ceramides",
+    "Peptides", "Green Tea Extract", "Squalane", "Ferulic Acid", "Vitamin E",
+]
+SKIN_TYPES = ["Oily", "Combination", "Dry", "Normal", "Sensitive"]
+
+
+def make_catalog(
+    size: int,
+    seed: int = 0,
+    max_list_len: int = 6,
+    max_competitors: int = 4,
+) -> List[Dict[str, Any]]:
+    """
+    Generate a synthetic product catalog.
+
+    Args:
+        size: Number of products
+        seed: RNG seed, so runs are reproducible
+        max_list_len: Upper bound for benefits/ingredients/skin_type lengths
+        max_competitors: Upper bound for the number of competitor products
+
+    Returns:
+        List of raw product dicts shaped like data/glowboost_product.json
+    """
+    rng = random.Random(seed)
+    catalog = []
+    for index in range(size):
+        catalog.append(
+            {
+                "sku": f"SKU-{index:07d}",
+                "name": f"Product {index} {rng.choice(INGREDIENTS)} Serum",
+                "concentration": f"{rng.randint(1, 20)}% {rng.choice(INGREDIENTS)}",
+                "skin_type": rng.sample(SKIN_TYPES, rng.randint(1, min(max_list_len, len(SKIN_TYPES)))),
+                "ingredients": rng.sample(INGREDIENTS, rng.randint(0, min(max_list_len, len(INGREDIENTS)))),
+                "benefits": rng.sample(BENEFITS, rng.randint(0, min(max_list_len, len(BENEFITS)))),
+                "usage": rng.choice(["", "Apply 2-3 drops in the morning before sunscreen"]),
+                "side_effects": rng.choice(["", "Mild tingling for sensitive skin"]),
+                "price": f"₹{rng.randint(199, 2999)}",
+                "competitor_products": {
+                    f"Competitor {rng.randint(1, 500)}": rng.choice(["Similar formula", "Higher price"])
+                    for _ in range(rng.randint(0, max_competitors))
+                },
+            }
+        )
+    return catalog
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies_ns: List[int], elapsed_s: float, count: int) -> Dict[str, Any]:
+    """Throughput plus latency percentiles (milliseconds) for one measurement."""
+    ordered = sorted(latencies_ns)
+    return {
+        "count": count,
+        "elapsed_s": round(elapsed_s, 6),
+        "throughput_per_s": round(count / elapsed_s, 2) if elapsed_s else None,
+        "p50_ms": round(percentile(ordered, 0.50) / 1e6, 4) if ordered else None,
+        "p99_ms": round(percentile(ordered, 0.99) / 1e6, 4) if ordered else None,
+    }
+
+
+def peak_memory_bytes(fn: Callable[[], Any]) -> int:
+    """Peak Python heap allocation while running ``fn`` (separate pass; tracemalloc skews timing)."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_stages(orchestrator: Orchestrator, catalog: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Time each workflow node in isolation over the whole catalog."""
+    states = [{"raw_product": product} for product in catalog]
+    results = {}
+    for name in orchestrator.workflow_graph:
+        node = orchestrator.workflow_graph.nodes[name]
+        latencies = []
+        started = time.perf_counter()
+        for state in states:
+            t0 = time.perf_counter_ns()
+            node.run(state)
+            latencies.append(time.perf_counter_ns() - t0)
+        results[name] = summarize(latencies, time.perf_counter() - started, len(states))
+    return results
+
+
+def bench_single(orchestrator: Orchestrator, catalog: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """End-to-end ``Orchestrator.run`` one product at a time."""
+    latencies = []
+    started = time.perf_counter()
+    for product in catalog:
+        t0 = time.perf_counter_ns()
+        orchestrator.run(product)
+        latencies.append(time.perf_counter_ns() - t0)
+    result = summarize(latencies, time.perf_counter() - started, len(catalog))
+    result["peak_memory_bytes"] = peak_memory_bytes(
+        lambda: [orchestrator.run(product) for product in catalog]
+    )
+    return result
+
+
+def timed_chunk(chunk: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """``run_chunk`` in a worker process, plus the nanoseconds it took."""
+    t0 = time.perf_counter_ns()
+    results = run_chunk(chunk)
+    return results, time.perf_counter_ns() - t0
+
+
+def bench_batch(
+    orchestrator: Orchestrator,
+    catalog: List[Dict[str, Any]],
+    workers: int | None,
+    chunk_size: int | None = None,
+) -> Dict[str, Any]:
+    """
+    End-to-end ``Orchestrator.run_batch`` over a process pool.
+
+    Chunks are split and dispatched as ``run_batch`` does (in-process
+    ``run_columnar`` for a single worker), and each chunk is timed where it
+    runs: a product's pages are ready when its chunk is, so p50/p99 are
+    per-chunk latencies.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(catalog) or 1))
+    if not chunk_size:
+        chunk_size = max(1, -(-len(catalog) // (workers * 4)))
+    chunks = [catalog[start : start + chunk_size] for start in range(0, len(catalog), chunk_size)]
+
+    latencies = []
+    started = time.perf_counter()
+    if workers == 1:
+        for chunk in chunks:
+            t0 = time.perf_counter_ns()
+            orchestrator.run_columnar(chunk)
+            latencies.append(time.perf_counter_ns() - t0)
+    else:
+        with orchestrator.worker_pool(workers) as pool:
+            for _, elapsed_ns in pool.map(timed_chunk, chunks):
+                latencies.append(elapsed_ns)
+    result = summarize(latencies, time.perf_counter() - started, len(catalog))
+    result["workers"] = workers
+    result["chunk_size"] = chunk_size
+    result["chunks"] = len(chunks)
+    # Workers are separate processes, so report their resident high-water mark
+    result["peak_worker_rss_bytes"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    return result
+
+
+def bench_stream(orchestrator: Orchestrator, catalog: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """End-to-end ``Orchestrator.run_stream``, timing the gap between yielded products."""
+    latencies = []
+    started = time.perf_counter()
+    t0 = time.perf_counter_ns()
+    for _ in orchestrator.run_stream(iter(catalog)):
+        now = time.perf_counter_ns()
+        latencies.append(now - t0)
+        t0 = now
+    result = summarize(latencies, time.perf_counter() - started, len(catalog))
+
+    def drain():
+        for _ in orchestrator.run_stream(iter(catalog)):
+            pass
+
+    result["peak_memory_bytes"] = peak_memory_bytes(drain)
+    return result
+
+
+def parse_args(argv=None):
+    """Parse benchmark options."""
+    parser = argparse.ArgumentParser(description="Benchmark the orchestration pipeline")
+    parser.add_argument("--products", type=int, default=1000, help="Synthetic catalog size")
+    parser.add_argument("--seed", type=int, default=0, help="Catalog RNG seed")
+    parser.add_argument("--max-list-len", type=int, default=6, help="Max benefits/ingredients per product")
+    parser.add_argument("--max-competitors", type=int, default=4, help="Max competitors per product")
+    parser.add_argument(
+        "--modes", default="stages,single,batch,stream",
+        help="Comma-separated subset of: stages, single, batch, stream",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch mode")
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help="Products per batch chunk (default: ~4 chunks per worker, as run_batch)",
+    )
+    parser.add_argument("--output", default="-", help="JSON report path ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the selected benchmarks and emit a JSON report."""
+    args = parse_args(argv)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    catalog = make_catalog(args.products, args.seed, args.max_list_len, args.max_competitors)
+    orchestrator = Orchestrator()
+
+    report: Dict[str, Any] = {
+        "config": {
+            "products": args.products,
+            "seed": args.seed,
+            "max_list_len": args.max_list_len,
+            "max_competitors": args.max_competitors,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": {},
+    }
+    runners = {
+        "stages": lambda: bench_stages(orchestrator, catalog),
+        "single": lambda: bench_single(orchestrator, catalog),
+        "batch": lambda: bench_batch(orchestrator, catalog, args.workers, args.chunk_size),
+        "stream": lambda: bench_stream(orchestrator, catalog),
+    }
+    for mode in modes:
+        if mode not in runners:
+            raise SystemExit(f"Unknown benchmark mode: {mode}")
+        report["results"][mode] = runners[mode]()
+
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        sys.stdout.write(payload + "\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark and import-time budget check for the CLI.
+
+Starts fresh interpreters to import ``main``, print ``main.py --help`` and
+generate the single demo product, recording wall time per run and the
+import time reported by ``python -X importtime``. The heaviest imports of
+the CLI module are listed so regressions point at their cause. Results are
+printed as machine-readable JSON; with ``--budget-ms`` the command exits
+non-zero when importing ``main`` takes longer than the budget:
+
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 40
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """``(module, depth, cumulative_us)`` rows from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, module = line[len("import time:"):].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        rows.append((module.strip(), depth, int(cumulative_us)))
+    return rows
+
+
+def run_cold(args: List[str], cwd: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Run one fresh interpreter; return its wall time (ms) and import rows."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    return wall_ms, parse_importtime(completed.stderr)
+
+
+def import_ms(rows: List[Tuple[str, int, int]], module: str | None = None) -> float:
+    """
+    Import time in milliseconds: of one top-level ``module``, or of every
+    top-level import of the process when ``module`` is None.
+    """
+    return sum(
+        cumulative
+        for name, depth, cumulative in rows
+        if depth == 0 and (module is None or name == module)
+    ) / 1000
+
+
+def median(values: List[float]) -> float:
+    return round(sorted(values)[len(values) // 2], 2)
+
+
+def bench_scenario(args: List[str], runs: int, cwd: str) -> Dict[str, Any]:
+    """Median wall time and import times over ``runs`` cold starts."""
+    walls, imports, main_imports = [], [], []
+    for _ in range(runs):
+        wall_ms, rows = run_cold(args, cwd)
+        walls.append(wall_ms)
+        imports.append(import_ms(rows))
+        main_imports.append(import_ms(rows, "main"))
+    result = {
+        "wall_ms_median": median(walls),
+        "wall_ms_min": round(min(walls), 2),
+        "import_ms_median": median(imports),
+    }
+    if any(main_imports):
+        result["main_import_ms_median"] = median(main_imports)
+    return result
+
+
+def heaviest_imports(cwd: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Modules with the largest cumulative import time when importing ``main``."""
+    _, rows = run_cold(["-c", "import main"], cwd)
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return [
+        {"module": name, "cumulative_ms": round(cumulative / 1000, 2)}
+        for name, _, cumulative in rows[:limit]
+    ]
+
+
+def parse_args(argv=None):
+    """Parse benchmark options."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start and import time")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per scenario")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail (exit 1) if importing main takes longer than this (median, ms)",
+    )
+    parser.add_argument("--output", default="-", help="JSON report path ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Measure cold starts and enforce the optional import-time budget."""
+    args = parse_args(argv)
+    runs = max(1, args.runs)
+    with tempfile.TemporaryDirectory() as workdir:
+        main_py = str(ROOT / "main.py")
+        results = {
+            "import_main": bench_scenario(["-c", "import main"], runs, workdir),
+            "help": bench_scenario([main_py, "--help"], runs, workdir),
+            "single_product": bench_scenario([main_py, "--output-dir", workdir], runs, workdir),
+        }
+        heaviest = heaviest_imports(workdir)
+
+    import_time = results["import_main"]["main_import_ms_median"]
+    report = {
+        "config": {"runs": runs, "budget_ms": args.budget_ms},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+        "heaviest_imports": heaviest,
+        "within_budget": None if args.budget_ms is None else import_time <= args.budget_ms,
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        sys.stdout.write(payload + "\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+
+    if report["within_budget"] is False:
+        print(
+            f"import main took {import_time} ms, over the {args.budget_ms} ms budget",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
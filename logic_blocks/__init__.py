@@ -0,0 +1,61 @@
+"""Logic Blocks - Registry of the content block builders used by ContentBlockAgent"""
+import importlib
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Sequence, Tuple
+
+# Built-in block modules, in the order their blocks appear in content_blocks
+BUILTIN_MODULES = (
+    "logic_blocks.benefits_block",
+    "logic_blocks.ingredients_block",
+    "logic_blocks.usage_block",
+    "logic_blocks.comparison_block",
+    "logic_blocks.faq_blocks",
+)
+
+_REGISTRY: Dict[str, "LogicBlock"] = {}
+
+
+@dataclass(frozen=True)
+class LogicBlock:
+    """
+    One registered content block.
+
+    Each block declares the normalized product fields it reads (``"questions"``
+    for the FAQ list), so callers can build only the blocks a page set or a
+    changed field needs, and provides two builders over the same logic: one
+    per product and one over a columnar batch (``agents.columnar``).
+
+    A block may also read run-wide context, such as the competitor profiles
+    from a catalog index. It names those context keys in ``context``; when a
+    caller supplies them they are passed to the builders as keyword
+    arguments (one value per product for ``build_batch``).
+
+    Attributes:
+        name: Content block key, e.g. ``"benefits_block"``
+        fields: Parsed fields (and/or ``"questions"``) the block is built from
+        build: ``(parsed, questions) -> record`` for one product
+        build_batch: ``(columns, questions_batch) -> [record, ...]`` for a batch
+        context: Optional context keys the builders accept as keyword arguments
+    """
+
+    name: str
+    fields: Tuple[str, ...]
+    build: Callable[[Any, List[Any]], Any]
+    build_batch: Callable[[Any, Sequence[List[Any]]], List[Any]]
+    context: Tuple[str, ...] = ()
+
+
+def register_block(block: LogicBlock) -> LogicBlock:
+    """Add a block to the registry (replacing any block of the same name)."""
+    _REGISTRY[block.name] = block
+    return block
+
+
+def registered_blocks() -> Dict[str, LogicBlock]:
+    """All registered blocks by name: built-ins first, then any plugins."""
+    return dict(_REGISTRY)
+
+
+# Register the built-ins at import, so they keep their order ahead of plugins
+for _module in BUILTIN_MODULES:
+    importlib.import_module(_module)
@@ -1 +1,28 @@
-"""Benefits Logic Block""" 
+"""Benefits Logic Block - Why-choose section built from the product's benefits"""
+from typing import List, Sequence
+from agents.columnar import ProductColumns
+from agents.records import BenefitItem, BenefitsBlock, Product, Question
+from logic_blocks import LogicBlock, register_block
+
+
+def build(parsed: Product, questions: List[Question]) -> BenefitsBlock:
+    """Create the Benefits Block for one product."""
+    return BenefitsBlock(
+        f"Why Choose {parsed.product_name}?",
+        tuple(
+            BenefitItem(benefit, f"{benefit} tailored for your skin")
+            for benefit in parsed.benefits
+        ),
+    )
+
+
+def build_batch(columns: ProductColumns, questions_batch: Sequence[List[Question]]) -> List[BenefitsBlock]:
+    """Create Benefits Blocks for a columnar batch."""
+    benefits = columns.benefits
+    descriptions = list(map("{} tailored for your skin".format, benefits.values))
+    items = benefits.split(BenefitItem.from_columns(benefits.values, descriptions))
+    titles = list(map("Why Choose {}?".format, columns.product_name))
+    return BenefitsBlock.from_columns(titles, items)
+
+
+BLOCK = register_block(LogicBlock("benefits_block", ("product_name", "benefits"), build, build_batch))
@@ -1 +1,78 @@
-"""Comparison Logic Block""" 
+"""Comparison Logic Block - Competitive comparison section"""
+from typing import List, Sequence, Tuple
+from agents.columnar import ProductColumns
+from agents.interning import intern
+from agents.records import (
+    ComparisonBlock,
+    CompetitorProfile,
+    IndexedComparisonBlock,
+    Product,
+    Question,
+)
+from logic_blocks import LogicBlock, register_block
+
+# Static advantages, interned so every product shares one immutable list
+COMPARISON_ADVANTAGES = intern([
+    "Natural ingredients",
+    "Clinically tested",
+    "Cruelty-free",
+    "Fast-absorbing formula",
+])
+
+
+def build(
+    parsed: Product,
+    questions: List[Question],
+    competitors: Tuple[CompetitorProfile, ...] | None = None,
+) -> ComparisonBlock | IndexedComparisonBlock:
+    """
+    Create the Comparison Block for one product.
+
+    With ``competitors`` (profiles looked up in a catalog-wide
+    ``CompetitorIndex``) the block also carries each competitor's
+    cross-catalog profile.
+    """
+    if competitors is None:
+        return ComparisonBlock(
+            parsed.product_name,
+            tuple(parsed.competitor_products),
+            COMPARISON_ADVANTAGES,
+        )
+    return IndexedComparisonBlock(
+        parsed.product_name,
+        tuple(parsed.competitor_products),
+        COMPARISON_ADVANTAGES,
+        competitors,
+    )
+
+
+def build_batch(
+    columns: ProductColumns,
+    questions_batch: Sequence[List[Question]],
+    competitors: Sequence[Tuple[CompetitorProfile, ...]] | None = None,
+) -> List[ComparisonBlock | IndexedComparisonBlock]:
+    """Create Comparison Blocks for a columnar batch."""
+    names = columns.competitors
+    if competitors is None:
+        return ComparisonBlock.from_columns(
+            columns.product_name,
+            names.split(names.values),
+            [COMPARISON_ADVANTAGES] * len(columns),
+        )
+    return IndexedComparisonBlock.from_columns(
+        columns.product_name,
+        names.split(names.values),
+        [COMPARISON_ADVANTAGES] * len(columns),
+        competitors,
+    )
+
+
+BLOCK = register_block(
+    LogicBlock(
+        "comparison_block",
+        ("product_name", "competitor_products"),
+        build,
+        build_batch,
+        context=("competitors",),
+    )
+)
@@ -0,0 +1,85 @@
+"""FAQ Logic Block - FAQ entries grouped by category"""
+from operator import attrgetter, itemgetter
+from typing import Dict, Any, Callable, List, Sequence, Tuple
+from agents.columnar import ListColumn, ProductColumns
+from agents.interning import FrozenDict
+from agents.records import AnsweredFaqEntry, FaqBlocks, FaqEntry, Product, Question
+from logic_blocks import LogicBlock, register_block
+
+Picker = Callable[[Sequence[Any]], Tuple[Any, ...]]
+
+# Grouping plans (category -> positions) per category sequence, compiled once;
+# products normally share one sequence (the selected question bank)
+_PLANS: Dict[Tuple[str, ...], List[Tuple[str, Picker]]] = {}
+
+
+def _picker(indexes: List[int]) -> Picker:
+    """Return a function selecting ``indexes`` from a sequence as a tuple."""
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda sequence: (sequence[index],)
+    return itemgetter(*indexes)
+
+
+def _plan(categories: Tuple[str, ...]) -> List[Tuple[str, Picker]]:
+    """The compiled grouping plan for one sequence of question categories."""
+    plan = _PLANS.get(categories)
+    if plan is None:
+        positions: Dict[str, List[int]] = {}
+        for position, category in enumerate(categories):
+            positions.setdefault(category, []).append(position)
+        plan = _PLANS[categories] = [
+            (category, _picker(indexes)) for category, indexes in positions.items()
+        ]
+    return plan
+
+
+def build(parsed: Product, questions: List[Question]) -> FaqBlocks:
+    """Create the FAQ Blocks for one product, organized by category."""
+    faq_by_category = {}
+    for question in questions:
+        if question.category not in faq_by_category:
+            faq_by_category[question.category] = []
+        if question.answer is None:
+            entry = FaqEntry(question.question, question.id)
+        else:
+            entry = AnsweredFaqEntry(question.question, question.id, question.answer)
+        faq_by_category[question.category].append(entry)
+
+    return FaqBlocks(
+        FrozenDict((category, tuple(entries)) for category, entries in faq_by_category.items())
+    )
+
+
+def build_batch(columns: ProductColumns, questions_batch: Sequence[List[Question]]) -> List[FaqBlocks]:
+    """
+    Create FAQ Blocks for a batch, grouping every product's FAQs in one pass.
+
+    All questions of the batch are flattened and their entries built
+    column-wise; each product's entries are then picked by category with the
+    compiled plan for its category sequence.
+    """
+    questions = ListColumn.from_lists(questions_batch)
+    flat = questions.values
+    texts = list(map(attrgetter("question"), flat))
+    ids = list(map(attrgetter("id"), flat))
+    answers = list(map(attrgetter("answer"), flat))
+    if not any(answer is not None for answer in answers):
+        entries = FaqEntry.from_columns(texts, ids)
+    else:
+        entries = [
+            FaqEntry(text, question_id) if answer is None
+            else AnsweredFaqEntry(text, question_id, answer)
+            for text, question_id, answer in zip(texts, ids, answers)
+        ]
+
+    category_of = attrgetter("category")
+    categories_batch = []
+    for (start, end), product_questions in zip(questions.bounds(), questions_batch):
+        plan = _plan(tuple(map(category_of, product_questions)))
+        product_entries = entries[start:end]
+        categories_batch.append(FrozenDict((category, pick(product_entries)) for category, pick in plan))
+    return FaqBlocks.from_columns(categories_batch)
+
+
+BLOCK = register_block(LogicBlock("faq_blocks", ("questions",), build, build_batch))
@@ -0,0 +1,21 @@
+"""Ingredients Logic Block - Key ingredients section"""
+from typing import List, Sequence
+from agents.columnar import ProductColumns
+from agents.records import IngredientItem, IngredientsBlock, Product, Question
+from logic_blocks import LogicBlock, register_block
+
+
+def build(parsed: Product, questions: List[Question]) -> IngredientsBlock:
+    """Create the Ingredients Block for one product."""
+    return IngredientsBlock(tuple(IngredientItem(ingredient) for ingredient in parsed.ingredients))
+
+
+def build_batch(columns: ProductColumns, questions_batch: Sequence[List[Question]]) -> List[IngredientsBlock]:
+    """Create Ingredients Blocks for a columnar batch."""
+    ingredients = columns.ingredients
+    return IngredientsBlock.from_columns(
+        ingredients.split(IngredientItem.from_columns(ingredients.values))
+    )
+
+
+BLOCK = register_block(LogicBlock("ingredients_block", ("ingredients",), build, build_batch))
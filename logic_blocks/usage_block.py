@@ -1 +1,34 @@
-"""Usage Logic Block""" 
+"""Usage Logic Block - Step-by-step how-to-use section"""
+from typing import List, Sequence
+from agents.columnar import ProductColumns
+from agents.interning import intern
+from agents.records import Product, Question, UsageBlock, UsageStep
+from logic_blocks import LogicBlock, register_block
+
+# Static steps, interned so every product shares one immutable instance
+USAGE_PREP_STEPS = (
+    intern(UsageStep(1, "Cleanse your skin thoroughly")),
+    intern(UsageStep(2, "Apply a small amount of serum")),
+)
+USAGE_FINAL_STEP = intern(UsageStep(4, "Follow with your regular moisturizer"))
+DEFAULT_INSTRUCTION = "Massage gently until absorbed"
+
+
+def build(parsed: Product, questions: List[Question]) -> UsageBlock:
+    """Create the Usage Block for one product."""
+    usage = parsed.usage_instructions
+    return UsageBlock(
+        (*USAGE_PREP_STEPS, UsageStep(3, usage or DEFAULT_INSTRUCTION), USAGE_FINAL_STEP)
+    )
+
+
+def build_batch(columns: ProductColumns, questions_batch: Sequence[List[Question]]) -> List[UsageBlock]:
+    """Create Usage Blocks for a columnar batch."""
+    instructions = [usage or DEFAULT_INSTRUCTION for usage in columns.usage_instructions]
+    steps = UsageStep.from_columns([3] * len(instructions), instructions)
+    return UsageBlock.from_columns(
+        [(*USAGE_PREP_STEPS, step, USAGE_FINAL_STEP) for step in steps]
+    )
+
+
+BLOCK = register_block(LogicBlock("usage_block", ("usage_instructions",), build, build_batch))
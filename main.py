@@ -11,10 +11,14 @@ This main.py demonstrates the orchestrated multi-agent architecture:
 - Orchestrator: Coordinates all agents via DAG workflow
 """
 
+import argparse
 import json
 import os
+import sys
 from pathlib import Path
-from agents.orchestrator import Orchestrator
+
+# Agents and their dependencies are imported inside the functions that use
+# them, so --help, argument errors and each mode load only what they need
 
 # Sample product data
 PRODUCT_DATA = {
@@ -30,7 +34,692 @@ PRODUCT_DATA = {
 }
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options for single-product and batch catalog modes."""
+    parser = argparse.ArgumentParser(description="Kasparro multi-agent content generation")
+    parser.add_argument(
+        "--input",
+        help="Catalog file (.json list/object or .jsonl) to process in batch mode",
+    )
+    parser.add_argument(
+        "--output-dir", default="outputs", help="Directory for generated pages"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes for batch and shard modes"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None, help="Products per worker chunk in batch mode"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream records lazily from --input (.jsonl or '-' for stdin) to JSONL output",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="JSONL destination for stream mode ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--cache",
+        help="SQLite file for the persistent stage cache (skips unchanged stages across runs)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Rebuild and rewrite only the pages whose normalized inputs changed since the last run",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Write a Chrome trace-event JSON of per-node spans to this path (in-process runs only)",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Write Prometheus-style per-node metrics to this path (in-process runs only)",
+    )
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="Also record per-node allocated bytes (tracemalloc) in traces/metrics",
+    )
+    parser.add_argument(
+        "--quarantine",
+        help="JSONL file for malformed catalog rows in batch, stream and pipeline modes (default: <output-dir>/quarantine.jsonl)",
+    )
+    parser.add_argument(
+        "--generate",
+        choices=["stub", "openai"],
+        help="Batch mode: write FAQ answers and benefit descriptions with a generation backend (async)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Max in-flight generation batches"
+    )
+    parser.add_argument(
+        "--generation-timeout", type=float, default=30.0, help="Per-call generation timeout (seconds)"
+    )
+    parser.add_argument(
+        "--response-cache",
+        help="SQLite file caching generation responses across runs (with --generate)",
+    )
+    parser.add_argument(
+        "--response-ttl", type=float, default=None, help="Seconds before a cached response expires"
+    )
+    parser.add_argument(
+        "--generic-answers",
+        action="store_true",
+        help="Share one generated answer across products for name-only FAQ questions",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="Write compact JSON pages instead of indented"
+    )
+    parser.add_argument(
+        "--no-change-detection",
+        action="store_true",
+        help="Rewrite every page instead of skipping pages whose content hash is unchanged",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=["auto", "orjson", "json"],
+        default="auto",
+        help="JSON serializer for page files (auto uses orjson when installed)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["flat", "sharded"],
+        default="flat",
+        help="Batch mode: one directory per product, or hash-sharded <ab>/<cd>/<product> directories",
+    )
+    parser.add_argument(
+        "--archive",
+        help="Batch mode: write all pages into this single packed archive instead of page files",
+    )
+    parser.add_argument(
+        "--archive-codec",
+        choices=["none", "gzip", "zstd"],
+        default="none",
+        help="Per-page compression inside --archive (zstd needs the zstandard package)",
+    )
+    parser.add_argument(
+        "--dedupe-shared",
+        action="store_true",
+        help="Write static structures shared by every product once (shared.json) and reference them by id",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help="Run as a resident service on host:port or unix:/path.sock (POST /generate, GET /stats)",
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=64, help="Service mode: max admitted requests before rejecting"
+    )
+    parser.add_argument(
+        "--max-request-bytes",
+        type=int,
+        default=16 * 1024 * 1024,
+        help="Service mode: largest accepted request body (larger ones get 413)",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="Batch mode: generate only shard I of N (hash of product id), resuming from its checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=100, help="Shard mode: products per committed checkpoint"
+    )
+    parser.add_argument(
+        "--merge-shards",
+        action="store_true",
+        help="Combine the completed shard manifests in --output-dir into manifest.jsonl",
+    )
+    parser.add_argument(
+        "--pages",
+        type=lambda value: [page.strip() for page in value.split(",") if page.strip()],
+        default=None,
+        help="Comma-separated output pages to generate, e.g. product_page.json (default: all);"
+        " only the stages those pages depend on run",
+    )
+    parser.add_argument(
+        "--competitor-index",
+        action="store_true",
+        help="Batch/shard mode: index competitors across the catalog and add their profiles to comparison pages",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Batch mode: run each workflow stage on its own worker pool, linked by bounded queues",
+    )
+    parser.add_argument(
+        "--stage",
+        action="append",
+        default=[],
+        metavar="NAME=WORKERS[:process]",
+        help="Pipeline mode: worker pool of one stage, e.g. generate_questions=4 or assemble_pages=2:process",
+    )
+    parser.add_argument(
+        "--stage-queue", type=int, default=64, help="Pipeline mode: capacity of each stage's input queue"
+    )
+    parser.add_argument(
+        "--unordered", action="store_true", help="Pipeline mode: write products as they complete"
+    )
+    parser.add_argument(
+        "--pipeline-stats",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Pipeline mode: print live per-stage queue depth and utilization every SECONDS",
+    )
+    args = parser.parse_args(argv)
+    if args.pipeline:
+        if not args.input or args.input == "-":
+            parser.error("--pipeline requires an --input catalog file")
+        if args.stream or args.incremental or args.generate or args.shard or args.serve:
+            parser.error("--pipeline cannot be combined with --stream, --incremental, --generate, --shard or --serve")
+        args.stages = {}
+        for spec in args.stage:
+            name, _, pool = spec.partition("=")
+            workers, _, kind = pool.partition(":")
+            if not name or not workers.isdigit() or int(workers) < 1 or kind not in ("", "thread", "process"):
+                parser.error(f"--stage must look like NAME=WORKERS[:process], got {spec!r}")
+            args.stages[name] = (int(workers), kind == "process")
+    elif args.stage or args.unordered or args.pipeline_stats:
+        parser.error("--stage, --unordered and --pipeline-stats require --pipeline")
+    if args.competitor_index and (not args.input or args.stream or args.incremental):
+        parser.error("--competitor-index requires --input and cannot be combined with --stream or --incremental")
+    if args.pages is not None and (args.incremental or args.serve):
+        parser.error("--pages cannot be combined with --incremental or --serve")
+    if args.shard:
+        try:
+            args.shard_index, args.shard_count = map(int, args.shard.split("/"))
+        except ValueError:
+            parser.error("--shard must look like I/N, e.g. 0/4")
+        if not 0 <= args.shard_index < args.shard_count:
+            parser.error("--shard index must satisfy 0 <= I < N")
+        if not args.input or args.input == "-":
+            parser.error("--shard requires an --input catalog file")
+        if args.stream or args.incremental or args.generate or args.archive or args.dedupe_shared:
+            parser.error(
+                "--shard cannot be combined with --stream, --incremental, --generate, --archive or --dedupe-shared"
+            )
+    if args.serve and (args.input or args.stream or args.incremental or args.generate or args.archive):
+        parser.error("--serve cannot be combined with --input, --stream, --incremental, --generate or --archive")
+    if args.archive and (not args.input or args.incremental):
+        parser.error("--archive requires --input and cannot be combined with --incremental")
+    if args.trace or args.metrics:
+        # Spans are recorded by this process's profiler; worker processes have none
+        if args.serve or (args.workers or 1) > 1 or any(
+            processes for _, processes in getattr(args, "stages", {}).values()
+        ):
+            parser.error(
+                "--trace and --metrics cannot be combined with --serve, --workers > 1 or process stages"
+            )
+        args.workers = 1
+    return args
+
+
+SNAPSHOT_FILENAME = ".regen_state.json"
+
+
+def build_writer(args, background=True, change_paths=None):
+    """
+    Create the page writer (or packed archive writer) configured by the output options.
+
+    ``change_paths`` is an optional ``(page hashes, changed pages)`` pair for
+    writers that continue an earlier run's changed-pages list (shards).
+    """
+    if args.archive:
+        from agents.archive import ArchiveWriter
+
+        return ArchiveWriter(
+            args.archive,
+            codec=args.archive_codec,
+            backend=args.json_backend,
+            shared_refs=args.dedupe_shared,
+        )
+    from agents.output_writer import PageWriter
+
+    return PageWriter(
+        args.output_dir,
+        pretty=not args.compact,
+        backend=args.json_backend,
+        layout=args.layout,
+        background=background,
+        shared_refs=args.dedupe_shared,
+        change_detection=not args.no_change_detection,
+        hashes_path=change_paths and change_paths[0],
+        changes_path=change_paths and change_paths[1],
+        append_changes=change_paths is not None,
+    )
+
+
+def regenerate(regenerator, writer, product, pid=None):
+    """
+    Incrementally regenerate one product's pages through ``writer``.
+
+    Compares against the snapshot saved by the previous run and writes only
+    the pages whose inputs changed (or that are missing on disk).
+
+    Returns:
+        List of page filenames that were written
+    """
+    from agents.incremental import load_snapshot, save_snapshot
+
+    product_dir = writer.product_dir(pid)
+    product_dir.mkdir(parents=True, exist_ok=True)
+    snapshot_path = product_dir / SNAPSHOT_FILENAME
+    pages, changed_pages, snapshot = regenerator.run(product, load_snapshot(snapshot_path))
+
+    written = [
+        filename
+        for filename in pages
+        if filename in changed_pages or not (product_dir / filename).exists()
+    ]
+    # The snapshot is saved only once the pages it describes are on disk, so
+    # an interrupted run never leaves a snapshot ahead of its pages
+    writer.write(
+        pid,
+        {filename: pages[filename] for filename in written},
+        on_written=lambda: save_snapshot(snapshot_path, snapshot),
+    )
+    return written
+
+
+def build_orchestrator(args, competitor_index=None):
+    """Create the orchestrator, attaching a stage cache, generation backend and profiler if requested."""
+    from agents.orchestrator import Orchestrator
+
+    cache = None
+    if args.cache:
+        from agents.cache import SqliteStore, StageCache
+
+        cache = StageCache(store=SqliteStore(args.cache))
+    generation = None
+    if args.generate:
+        from agents.cache import ResponseCache
+        from agents.generation import GenerationClient, LangChainBackend, StubBackend
+
+        backend = LangChainBackend() if args.generate == "openai" else StubBackend()
+        response_cache = (
+            ResponseCache(args.response_cache, ttl=args.response_ttl)
+            if args.response_cache
+            else None
+        )
+        generation = GenerationClient(
+            backend,
+            max_concurrency=args.concurrency,
+            timeout=args.generation_timeout,
+            cache=response_cache,
+        )
+    orchestrator = Orchestrator(cache=cache, generation=generation, competitor_index=competitor_index)
+    orchestrator.question_gen.config["generic_answers"] = args.generic_answers
+    if args.pages is not None:
+        try:
+            orchestrator.page_plan(args.pages)
+        except ValueError as exc:
+            print(f"✗ {exc}", file=sys.stderr)
+            sys.exit(1)
+    if args.trace or args.metrics:
+        from agents.instrumentation import StageProfiler
+
+        orchestrator.add_observer(StageProfiler(track_allocations=args.trace_allocations))
+    return orchestrator
+
+
+def report_changes(writer):
+    """Print how many pages were rewritten versus skipped as unchanged."""
+    if getattr(writer, "change_detection", False):
+        print(
+            f"  {writer.pages_written} pages changed, {writer.pages_unchanged} unchanged"
+            f" (changed list: {writer.changes_path})"
+        )
+
+
+def report_run(orchestrator, args):
+    """Print cache and generation counters and export any per-node traces or metrics."""
+    if orchestrator.cache is not None:
+        orchestrator.cache.store.flush()
+        for stage, counters in orchestrator.cache.stats().items():
+            print(
+                f"  cache {stage}: {counters['hits']} hits, {counters['misses']} misses",
+                file=sys.stderr,
+            )
+
+    if orchestrator.competitor_index is not None:
+        stats = orchestrator.competitor_index.stats()
+        print(
+            f"  competitor index: {stats['competitors']} competitors, {stats['references']} references",
+            file=sys.stderr,
+        )
+
+    if args.generate:
+        generation = orchestrator.generation
+        if generation.cache is not None:
+            generation.cache.flush()
+        print(f"  generation: {generation.stats}", file=sys.stderr)
+
+    if not (args.trace or args.metrics):
+        return
+    from agents.instrumentation import StageProfiler
+
+    for observer in list(orchestrator.workflow_graph.observers):
+        if not isinstance(observer, StageProfiler):
+            continue
+        orchestrator.remove_observer(observer)
+        if args.trace:
+            with open(args.trace, "w", encoding="utf-8") as f:
+                json.dump(observer.to_chrome_trace(), f)
+            print(f"  trace written to {args.trace}", file=sys.stderr)
+        if args.metrics:
+            with open(args.metrics, "w", encoding="utf-8") as f:
+                f.write(observer.to_prometheus())
+            print(f"  metrics written to {args.metrics}", file=sys.stderr)
+        observer.close()
+
+
+def _stdin_ready() -> bool:
+    """True if stdin has input (or end of input) waiting, so a read will not block."""
+    import select
+
+    try:
+        return bool(select.select([sys.stdin], [], [], 0)[0])
+    except (OSError, ValueError):  # e.g. a closed stdin, or platforms without select on pipes
+        return True
+
+
+def run_stream(args):
+    """
+    Stream a JSONL catalog through the workflow with flat memory use.
+
+    Records are read lazily, validated in chunks of ``--chunk-size`` rows
+    (malformed rows and undecodable lines go to the quarantine file instead
+    of ending the stream), pushed one at a time through the generator
+    pipeline, and written as JSONL with buffered bulk writes. Progress is
+    reported on stderr so stdout can carry the JSONL output. When stdin has
+    no further input waiting, the partial chunk is processed and buffered
+    pages are flushed rather than held until more input arrives.
+    """
+    from collections import deque
+    from agents.catalog import Quarantine, iter_catalog, validate_chunks
+    from agents.data_parser import DataParserAgent
+    from agents.streaming import JsonlPageWriter
+
+    pending_ids = deque()
+    quarantine = Quarantine(args.quarantine or Path(args.output_dir) / "quarantine.jsonl")
+    source = args.input or "-"
+    ready = _stdin_ready if source == "-" else None
+
+    def tagged_products():
+        rows = iter_catalog(source, on_error=quarantine.add_undecodable)
+        for _, pid, product, _ in validate_chunks(
+            rows, DataParserAgent(), args.chunk_size or 256, quarantine, ready
+        ):
+            pending_ids.append(pid)
+            yield product
+            if ready is not None and not ready():
+                # The next read may block: emit what has been generated so far
+                writer.flush()
+
+    orchestrator = build_orchestrator(args)
+    with JsonlPageWriter(args.output) as writer:
+        for pages in orchestrator.run_stream(tagged_products(), args.pages):
+            writer.write(pending_ids.popleft(), pages)
+
+    if quarantine.count:
+        print(f"⚠ Quarantined {quarantine.count} malformed or duplicate products in {quarantine.path}", file=sys.stderr)
+    print(f"✓ Streamed pages for {writer.records_written} products", file=sys.stderr)
+    report_run(orchestrator, args)
+
+
+def run_batch(args):
+    """
+    Execute the workflow for a whole catalog across a process pool.
+
+    Rows are validated in bulk first; malformed rows are written to a
+    quarantine JSONL file instead of failing the run. Each valid product's
+    pages are written to their own subdirectory of the output directory,
+    named after the product identifier (hash-sharded with ``--layout sharded``).
+    Serialization and disk writes happen on a background writer thread.
+    """
+    from agents.catalog import Quarantine, duplicate_entry, load_catalog, product_id
+    from agents.data_parser import DataParserAgent
+    from agents.incremental import IncrementalRegenerator
+
+    catalog = load_catalog(args.input)
+    print(f"\nLoaded {len(catalog)} products from {args.input}")
+
+    valid, quarantined = DataParserAgent().validate_many(catalog)
+    competitor_index = None
+    if args.competitor_index:
+        from agents.competitors import CompetitorIndex
+
+        # Built once from the already-parsed rows, then shared by every worker
+        competitor_index = CompetitorIndex.from_products(valid)
+    orchestrator = build_orchestrator(args, competitor_index)
+    output_dir = Path(args.output_dir)
+
+    rejected = {entry["index"] for entry in quarantined}
+    entries = []
+    first_rows = {}
+    for index, product in enumerate(catalog):
+        if index in rejected:
+            continue
+        pid = product_id(product, index)
+        first = first_rows.setdefault(pid, index)
+        if first != index:
+            # Same sku, id or name: both would write the same directory
+            quarantined.append(duplicate_entry(index, product, pid, first))
+            continue
+        entries.append((pid, product))
+    if quarantined:
+        quarantine = Quarantine(args.quarantine or output_dir / "quarantine.jsonl")
+        quarantine.add(sorted(quarantined, key=lambda entry: entry["index"]))
+        print(f"⚠ Quarantined {quarantine.count} malformed or duplicate products in {quarantine.path}")
+    products = [product for _, product in entries]
+
+    if args.incremental:
+        # Delta runs recompute little, so they stay in-process
+        regenerator = IncrementalRegenerator(orchestrator)
+        written = 0
+        with build_writer(args) as writer:
+            for pid, product in entries:
+                written += len(regenerate(regenerator, writer, product, pid))
+        print(f"✓ Incremental run rewrote {written} pages for {len(products)} products")
+        report_run(orchestrator, args)
+        return
+
+    if args.generate:
+        # Generation is I/O-bound: many products in flight on one event loop
+        import asyncio
+
+        results = asyncio.run(orchestrator.run_many_async(products, pages=args.pages))
+    else:
+        results = orchestrator.run_batch(
+            products, workers=args.workers, chunk_size=args.chunk_size, pages=args.pages
+        )
+
+    with build_writer(args) as writer:
+        for (pid, _), pages in zip(entries, results):
+            writer.write(pid, pages)
+
+    print(f"✓ Generated pages for {len(results)} products in {args.archive or f'{output_dir}/'}")
+    report_changes(writer)
+    report_run(orchestrator, args)
+
+
+def run_pipeline(args):
+    """
+    Execute the workflow for a catalog as a staged pipeline with bounded memory.
+
+    Rows are read lazily (``.jsonl``) and validated in chunks; malformed rows
+    are quarantined as in batch mode. Each workflow node runs on its own
+    thread or process pool sized by ``--stage``, and bounded queues between
+    stages make slow stages hold back the reader instead of buffering the
+    catalog. Per-stage statistics show which stage is the bottleneck.
+    """
+    import threading
+    from itertools import count
+    from agents.catalog import Quarantine, iter_catalog, load_catalog, validate_chunks
+    from agents.data_parser import DataParserAgent
+    from agents.pipeline import StageConfig, StagedPipeline
+
+    competitor_index = None
+    if args.competitor_index:
+        from agents.competitors import index_catalog
+
+        # One streamed pass over the catalog before the pipeline starts
+        competitor_index = index_catalog(args.input, DataParserAgent())
+    orchestrator = build_orchestrator(args, competitor_index)
+    try:
+        pipeline = StagedPipeline(
+            orchestrator,
+            {name: StageConfig(workers, processes) for name, (workers, processes) in args.stages.items()},
+            queue_size=args.stage_queue,
+            ordered=not args.unordered,
+        )
+    except ValueError as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    quarantine = Quarantine(args.quarantine or output_dir / "quarantine.jsonl")
+    # Pipeline index (position among valid rows) -> product id, for rows in flight
+    ids = {}
+    positions = count()
+
+    def valid_products():
+        path = Path(args.input)
+        rows = (
+            iter_catalog(path, on_error=quarantine.add_undecodable)
+            if path.suffix == ".jsonl"
+            else iter(load_catalog(path))
+        )
+        for _, pid, _, product in validate_chunks(rows, DataParserAgent(), args.stage_queue, quarantine):
+            ids[next(positions)] = pid
+            # Already validated: the pipeline's parse stage passes it through
+            yield product
+
+    done = threading.Event()
+
+    def report_stats():
+        while not done.wait(args.pipeline_stats):
+            stats = pipeline.stats()
+            stages = "  ".join(
+                f"{stage['stage']}[q={stage['queue_depth']} u={stage['utilization']:.0%}]"
+                for stage in stats["stages"]
+            )
+            print(f"  {stats['products']} products ({stats['products_per_s']}/s)  {stages}", file=sys.stderr)
+
+    if args.pipeline_stats:
+        threading.Thread(target=report_stats, daemon=True).start()
+    try:
+        with build_writer(args) as writer:
+            for index, pages in pipeline.run(valid_products(), args.pages):
+                writer.write(ids.pop(index), pages)
+    finally:
+        done.set()
+
+    stats = pipeline.stats()
+    if quarantine.count:
+        print(f"⚠ Quarantined {quarantine.count} malformed or duplicate products in {quarantine.path}")
+    print(f"✓ Pipelined pages for {stats['products']} products in {args.archive or f'{output_dir}/'}")
+    print(f"  {stats['products_per_s']} products/s; bottleneck: {stats['bottleneck']}")
+    for stage in stats["stages"]:
+        print(
+            f"  {stage['stage']:<22} {stage['workers']} {stage['kind']:<7}"
+            f" utilization {stage['utilization']:.0%}, mean {stage['mean_ms']} ms"
+        )
+    report_changes(writer)
+    report_run(orchestrator, args)
+
+
+def run_shard(args):
+    """
+    Generate one hash-partitioned shard of a catalog with resumable checkpoints.
+
+    Shards can run as separate processes or hosts over a shared output
+    directory; a killed shard picks up after its last committed product.
+    """
+    from agents.sharding import ShardRunner, shard_change_paths
+
+    competitor_index = None
+    if args.competitor_index:
+        from agents.competitors import index_catalog
+        from agents.data_parser import DataParserAgent
+
+        # Every shard indexes the whole catalog, so profiles match a single-run index
+        competitor_index = index_catalog(args.input, DataParserAgent())
+    orchestrator = build_orchestrator(args, competitor_index)
+    change_paths = shard_change_paths(args.output_dir, args.shard_index, args.shard_count)
+    with build_writer(args, change_paths=change_paths) as writer:
+        result = ShardRunner(
+            orchestrator,
+            writer,
+            args.input,
+            args.shard_index,
+            args.shard_count,
+            checkpoint_every=args.checkpoint_every,
+            pages=args.pages,
+            workers=args.workers,
+        ).run()
+    if result["resumed_from"]:
+        print(f"  resumed after {result['resumed_from']} committed products")
+    print(
+        f"✓ Shard {args.shard}: generated {result['generated']} products"
+        f" ({result['quarantined']} quarantined) in {args.output_dir}/"
+    )
+    if result.get("undecodable"):
+        print(f"⚠ Skipped {len(result['undecodable'])} catalog lines that are not valid JSON")
+    report_changes(writer)
+    report_run(orchestrator, args)
+
+
+def run_merge(args):
+    """Combine completed shard manifests into <output-dir>/manifest.jsonl."""
+    from agents.sharding import MERGED_CHANGES, MERGED_MANIFEST, merge_shards
+
+    try:
+        summary = merge_shards(args.output_dir)
+    except ValueError as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"✓ Merged {summary['shards']} shards: {summary['generated']} products"
+        f" ({summary['quarantined']} quarantined) in {Path(args.output_dir) / MERGED_MANIFEST}"
+    )
+    print(f"  {summary['changed']} changed pages listed in {Path(args.output_dir) / MERGED_CHANGES}")
+    if summary["undecodable"]:
+        lines = ", ".join(map(str, summary["undecodable"]))
+        print(f"⚠ Skipped {len(summary['undecodable'])} catalog lines that are not valid JSON: {lines}")
+
+
+def run_service(args):
+    """
+    Serve on-demand generation from warm worker orchestrators until interrupted.
+
+    Products are POSTed as JSON to ``/generate`` and their pages streamed back
+    as NDJSON; ``/stats`` reports latency and throughput counters.
+    """
+    from agents.service import GenerationService, make_server
+
+    service = GenerationService(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        chunk_size=args.chunk_size or 16,
+        cache_path=args.cache,
+        max_request_bytes=args.max_request_bytes,
+    )
+    server = make_server(service, args.serve)
+    print(f"✓ Serving on {args.serve} with {service.workers} warm workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        print(f"  stats: {json.dumps(service.stats.snapshot())}", file=sys.stderr)
+
+
+def main(argv=None):
     """
     Execute the multi-agent orchestration workflow.
     
@@ -40,13 +729,47 @@ def main():
     3. Create content blocks (ContentBlockAgent)
     4. Apply page templates (TemplateEngineAgent)
     5. Assemble final pages (PageAssemblerAgent)
+
+    With ``--input``, runs the same workflow over a whole catalog in batch mode;
+    with ``--stream``, records are streamed lazily from JSONL to JSONL; with
+    ``--serve``, runs as a resident generation service.
     """
+    args = parse_args(argv)
+
+    if args.serve:
+        run_service(args)
+        return
+
+    if args.stream:
+        run_stream(args)
+        return
+
     print("\n" + "="*60)
     print("🤖 KASPARRO MULTI-AGENT ORCHESTRATION SYSTEM")
     print("="*60)
 
+    if args.merge_shards:
+        run_merge(args)
+        print()
+        return
+
+    if args.shard:
+        run_shard(args)
+        print()
+        return
+
+    if args.pipeline:
+        run_pipeline(args)
+        print()
+        return
+
+    if args.input:
+        run_batch(args)
+        print()
+        return
+
     # Initialize the Orchestrator (which manages all agents)
-    orchestrator = Orchestrator()
+    orchestrator = build_orchestrator(args)
     print("\n✓ Orchestrator initialized with 5 autonomous agents")
     print("  - DataParserAgent")
     print("  - QuestionGeneratorAgent")
@@ -59,20 +782,33 @@ def main():
     print("Executing multi-agent workflow via Directed Acyclic Graph...")
     print("-"*60)
     
-    pages = orchestrator.run(PRODUCT_DATA)
-    
-    print("\n✓ Workflow completed successfully!")
-
-    # Save output files
-    output_dir = Path("outputs")
-    output_dir.mkdir(exist_ok=True)
-
-    print("\nSaving generated pages:")
-    for filename, page_data in pages.items():
-        filepath = output_dir / filename
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(page_data, f, indent=2, ensure_ascii=False)
-        print(f"  ✓ {filepath}")
+    output_dir = Path(args.output_dir)
+    writer = build_writer(args, background=False)
+
+    if args.incremental:
+        from agents.incremental import IncrementalRegenerator
+
+        written = regenerate(IncrementalRegenerator(orchestrator), writer, PRODUCT_DATA)
+        print("\n✓ Incremental workflow completed successfully!")
+        print("\nRewritten pages:")
+        for filename in written:
+            print(f"  ✓ {output_dir / filename}")
+        if not written:
+            print("  (none - all pages up to date)")
+        report_run(orchestrator, args)
+    else:
+        pages = orchestrator.run(PRODUCT_DATA, args.pages)
+
+        print("\n✓ Workflow completed successfully!")
+        report_run(orchestrator, args)
+
+        # Save output files
+        print("\nSaving generated pages:")
+        writer.write(None, pages)
+        for filename in pages:
+            print(f"  ✓ {output_dir / filename}")
+    writer.close()
+    report_changes(writer)
 
     print("\n" + "="*60)
     print("✓ Multi-agent system execution complete!")
@@ -0,0 +1,55 @@
+"""Catalog rows: products sharing an id are quarantined instead of overwriting each other"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from agents.output_writer import PageWriter
+from main import PRODUCT_DATA
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "main.py"
+
+
+def _catalog(path: Path) -> Path:
+    rows = [
+        {**PRODUCT_DATA, "sku": "A-1", "name": "First Serum"},
+        {**PRODUCT_DATA, "sku": "B-2", "name": "Second Serum"},
+        {**PRODUCT_DATA, "sku": "A-1", "name": "Impostor Serum"},
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def _quarantined(path: Path) -> list:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("mode", [[], ["--pipeline"], ["--shard", "0/1"]])
+def test_duplicate_ids_are_quarantined(tmp_path, mode):
+    catalog = _catalog(tmp_path / "catalog.jsonl")
+    output = tmp_path / "out"
+    subprocess.run(
+        [sys.executable, str(MAIN), "--input", str(catalog), "--output-dir", str(output), *mode],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    product = json.loads((output / "A-1" / "product_page.json").read_text(encoding="utf-8"))
+    assert "First Serum" in json.dumps(product)
+    if mode and mode[0] == "--shard":
+        entries = [
+            json.loads(line)
+            for line in (output / ".shards" / "shard-00000-of-00001.manifest.jsonl").read_text().splitlines()
+        ]
+        errors = [entry["errors"] for entry in entries if entry["status"] == "quarantined"]
+    else:
+        errors = [entry["errors"] for entry in _quarantined(output / "quarantine.jsonl")]
+    assert [error[0]["type"] for error in errors] == ["duplicate_id"]
+
+
+def test_page_writer_rejects_a_second_write_of_one_id(tmp_path):
+    with PageWriter(tmp_path, background=False) as writer:
+        writer.write("A-1", {"page.json": {}})
+        with pytest.raises(ValueError, match="Duplicate product id"):
+            writer.write("A-1", {"page.json": {}})
@@ -0,0 +1,21 @@
+"""Competitor index: built from the valid rows of a catalog file"""
+import json
+
+from agents.competitors import index_catalog
+from agents.data_parser import DataParserAgent
+from main import PRODUCT_DATA
+
+
+def test_index_catalog_skips_undecodable_and_malformed_rows(tmp_path):
+    catalog = tmp_path / "catalog.jsonl"
+    rows = [
+        json.dumps({**PRODUCT_DATA, "name": "Serum A", "competitor_products": {"RivalGlow": "Cheaper"}}),
+        '{"name": "truncated',
+        json.dumps({"name": 5}),
+        json.dumps({**PRODUCT_DATA, "name": "Serum B", "competitor_products": {"RivalGlow": "Cheaper"}}),
+    ]
+    catalog.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    index = index_catalog(catalog, DataParserAgent())
+    assert index.referencing("RivalGlow") == ("Serum A", "Serum B")
+    assert index.stats() == {"competitors": 1, "references": 2}
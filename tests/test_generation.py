@@ -0,0 +1,21 @@
+"""Generation backends: the interface every backend implements"""
+import asyncio
+
+import pytest
+
+from agents.generation import GenerationBackend, StubBackend
+
+
+def test_backend_without_generate_batch_cannot_be_created():
+    class Incomplete(GenerationBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="generate_batch"):
+        Incomplete()
+
+
+def test_stub_backend_is_deterministic():
+    backend = StubBackend()
+    first = asyncio.run(backend.generate_batch(["Context: a", "Context: b"]))
+    assert first == asyncio.run(backend.generate_batch(["Context: a", "Context: b"]))
+    assert first[0].startswith("a [stub:")
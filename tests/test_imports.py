@@ -0,0 +1,38 @@
+"""Start-up: importing the CLI must not load the agents or their heavy dependencies"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_startup import import_ms, median, run_cold
+
+ROOT = Path(__file__).resolve().parent.parent
+LAZY = ("agents", "pydantic", "asyncio")
+# About three times the ~25 ms main takes today, leaving room for slow CI
+# hosts; importing the agents and pydantic eagerly (~90 ms) breaks it
+IMPORT_BUDGET_MS = 75
+
+
+def test_import_main_loads_no_agents_pydantic_or_asyncio():
+    # A fresh interpreter: this test process may already have imported them
+    script = (
+        "import json, sys\n"
+        "import main\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    loaded = [
+        module
+        for module in json.loads(result.stdout)
+        if module.split(".")[0] in LAZY
+    ]
+    assert loaded == []
+
+
+def test_import_main_stays_within_the_cold_start_budget():
+    with tempfile.TemporaryDirectory() as workdir:
+        times = [import_ms(run_cold(["-c", "import main"], workdir)[1], "main") for _ in range(3)]
+    assert median(times) < IMPORT_BUDGET_MS, f"import main took {times} ms"
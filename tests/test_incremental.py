@@ -0,0 +1,44 @@
+"""Incremental regeneration: snapshots taken with other templates rebuild every page"""
+import shutil
+from pathlib import Path
+
+from agents.incremental import IncrementalRegenerator
+from agents.orchestrator import Orchestrator
+from agents.page_assembler import PageAssemblerAgent
+from agents.template_engine import TemplateEngineAgent
+from main import PRODUCT_DATA
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+
+
+def _orchestrator(templates_dir: Path | None = None) -> Orchestrator:
+    orchestrator = Orchestrator()
+    if templates_dir is not None:
+        config = {"templates_dir": str(templates_dir)}
+        orchestrator.template_engine = TemplateEngineAgent(config)
+        orchestrator.page_assembler = PageAssemblerAgent(config)
+    return orchestrator
+
+
+def test_unchanged_product_reports_no_changed_pages():
+    regenerator = IncrementalRegenerator(_orchestrator())
+    _, _, snapshot = regenerator.run(PRODUCT_DATA)
+    _, changed, _ = regenerator.run(PRODUCT_DATA, snapshot)
+    assert changed == set()
+
+
+def test_template_edit_regenerates_every_page(tmp_path):
+    pages, _, snapshot = IncrementalRegenerator(_orchestrator()).run(PRODUCT_DATA)
+
+    templates = shutil.copytree(TEMPLATES, tmp_path / "templates")
+    faq = templates / "faq_template.json"
+    faq.write_text(
+        faq.read_text(encoding="utf-8").replace('"version": "1.0"', '"version": "2.0"'),
+        encoding="utf-8",
+    )
+    regenerator = IncrementalRegenerator(_orchestrator(templates))
+    new_pages, changed, new_snapshot = regenerator.run(PRODUCT_DATA, snapshot)
+
+    assert changed == set(pages)
+    assert new_pages["faq.json"] != pages["faq.json"]
+    assert new_snapshot["pipeline"] != snapshot["pipeline"]
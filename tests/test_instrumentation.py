@@ -0,0 +1,40 @@
+"""Profiling exports: traces and metrics written by the CLI"""
+import json
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+from agents.instrumentation import StageProfiler
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "main.py"
+
+
+def test_metrics_include_allocations_recorded_before_close(tmp_path):
+    metrics, trace = tmp_path / "m.prom", tmp_path / "t.json"
+    subprocess.run(
+        [
+            sys.executable, str(MAIN), "--output-dir", str(tmp_path / "out"),
+            "--metrics", str(metrics), "--trace", str(trace), "--trace-allocations",
+        ],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    assert 'kasparro_node_alloc_bytes_total{node="parse_data"}' in metrics.read_text(encoding="utf-8")
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert events and all("alloc_bytes" in event["args"] for event in events)
+
+
+def test_close_stops_only_an_owned_tracemalloc_session():
+    profiler = StageProfiler(track_allocations=True)
+    assert tracemalloc.is_tracing()
+    profiler.close()
+    assert not tracemalloc.is_tracing()
+    assert "alloc_bytes_total" in profiler.to_prometheus()
+
+    tracemalloc.start()
+    try:
+        StageProfiler(track_allocations=True).close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,38 @@
+"""Interning: the registry keeps shared structures only while they are in use"""
+import gc
+
+from agents import interning
+from agents.competitors import CompetitorIndex
+from agents.data_parser import DataParserAgent
+from agents.output_writer import PageWriter
+from main import PRODUCT_DATA
+
+
+def test_rebuilt_competitor_indexes_do_not_grow_the_registry():
+    parser = DataParserAgent()
+
+    def build(generation: int) -> CompetitorIndex:
+        product = parser.execute({
+            **PRODUCT_DATA, "competitor_products": {f"Rival {generation}": "Cheaper"},
+        })
+        return CompetitorIndex.from_products([product])
+
+    build(0)
+    gc.collect()
+    before = len(interning._by_json)
+    for generation in range(1, 50):
+        index = build(generation)
+        ref = interning.shared_id(index.profiles[f"Rival {generation}"])
+        assert interning.shared_value(ref) is index.profiles[f"Rival {generation}"]
+    del index
+    gc.collect()
+    assert len(interning._by_json) == before
+    assert len(interning._ids) == len(interning._by_id)
+
+
+def test_shared_table_outlives_the_pages_it_was_collected_from(tmp_path):
+    with PageWriter(tmp_path, shared_refs=True) as writer:
+        writer.write("p1", {"page.json": {"meta": interning.intern({"title": "Only here"})}})
+        gc.collect()
+    shared = (tmp_path / PageWriter.SHARED_FILENAME).read_text(encoding="utf-8")
+    assert "Only here" in shared
@@ -0,0 +1,30 @@
+"""Batch runs: worker processes reproduce the parent orchestrator or are not used"""
+import pytest
+
+from agents.orchestrator import Orchestrator
+from agents.question_generator import QuestionGeneratorAgent
+from main import PRODUCT_DATA
+
+PRODUCTS = [
+    {**PRODUCT_DATA, "name": f"Product {index} Serum", "price": f"${100 + index}"}
+    for index in range(12)
+]
+
+
+def test_workers_rebuild_reconfigured_agents():
+    orchestrator = Orchestrator()
+    orchestrator.question_gen = QuestionGeneratorAgent({"num_questions": 5})
+    expected = [orchestrator.run(product) for product in PRODUCTS]
+    assert orchestrator.run_batch(PRODUCTS, workers=2) == expected
+
+
+def test_custom_nodes_keep_batch_runs_in_process():
+    orchestrator = Orchestrator()
+    orchestrator.register_node(
+        "page_count", len, inputs=["final_pages"], outputs=["page_count"]
+    )
+    assert orchestrator.local_only() == ["node 'page_count'"]
+    expected = [orchestrator.run(product) for product in PRODUCTS]
+    assert orchestrator.run_batch(PRODUCTS, workers=2) == expected
+    with pytest.raises(ValueError, match="page_count"):
+        orchestrator.worker_pool(2)
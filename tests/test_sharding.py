@@ -0,0 +1,137 @@
+"""Sharded runs: a killed shard resumes from its checkpoint and merges like a single run"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "main.py"
+PRODUCTS = 2000
+BAD_ROWS = [
+    {"name": 5, "sku": "BAD1"},
+    {"name": "x", "benefits": "notalist", "sku": "BAD2"},
+]
+
+
+def _catalog(path: Path) -> Path:
+    rows = [
+        {
+            "sku": f"SKU-{index:07d}",
+            "name": f"Product {index} Serum",
+            "concentration": f"{index % 20}% Vitamin C",
+            "skin_type": ["Oily", "Dry"][: 1 + index % 2],
+            "ingredients": ["Vitamin C", "Squalane", "Ceramides"][: 1 + index % 3],
+            "benefits": ["Brightening", "Hydrating"],
+            "usage": "Apply 2-3 drops in the morning",
+            "side_effects": "",
+            "price": f"${100 + index}",
+            "competitor_products": {f"Competitor {index % 7}": "Similar formula"},
+        }
+        for index in range(PRODUCTS)
+    ]
+    rows[10:10] = BAD_ROWS
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def _main(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(MAIN), *args], capture_output=True, text=True, check=True, cwd=ROOT
+    )
+
+
+def _checkpoint(output: Path, shard: int, shards: int) -> dict | None:
+    path = output / ".shards" / f"shard-{shard:05d}-of-{shards:05d}.checkpoint.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _pages(directory: Path) -> dict:
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in sorted(directory.glob("*/*.json"))
+        if not path.parent.name.startswith(".")
+    }
+
+
+def test_killed_shard_resumes_and_merges_like_a_single_run(tmp_path):
+    catalog = _catalog(tmp_path / "catalog.jsonl")
+    sharded = tmp_path / "sharded"
+    shard_args = ["--input", str(catalog), "--output-dir", str(sharded), "--checkpoint-every", "1"]
+
+    # Shard 0 commits (and fsyncs) after every product; kill it part way through
+    process = subprocess.Popen(
+        [sys.executable, str(MAIN), *shard_args, "--shard", "0/2"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        checkpoint = _checkpoint(sharded, 0, 2)
+        if checkpoint is not None and checkpoint["committed"] >= 50:
+            break
+        time.sleep(0.005)
+    os.kill(process.pid, signal.SIGKILL)
+    process.wait()
+    killed = _checkpoint(sharded, 0, 2)
+    if killed["complete"]:
+        pytest.skip("shard 0 completed before it could be killed")
+
+    resumed = _main(*shard_args, "--shard", "0/2")
+    assert "resumed after" in resumed.stdout
+    _main(*shard_args, "--shard", "1/2", "--workers", "2")
+    _main("--merge-shards", "--output-dir", str(sharded))
+
+    single = tmp_path / "single"
+    _main("--input", str(catalog), "--output-dir", str(single), "--workers", "1")
+
+    assert _pages(sharded) == _pages(single)
+    entries = [
+        json.loads(line)
+        for line in (sharded / "manifest.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert [entry["index"] for entry in entries] == list(range(PRODUCTS + len(BAD_ROWS)))
+    assert sum(entry["status"] == "quarantined" for entry in entries) == len(BAD_ROWS)
+    assert len({entry["id"] for entry in entries}) == len(entries)
+
+
+def test_merge_rejects_shards_of_different_catalogs(tmp_path):
+    catalog = _catalog(tmp_path / "catalog.jsonl")
+    output = tmp_path / "out"
+    for shard in ("0/2", "1/2"):
+        _main("--input", str(catalog), "--output-dir", str(output), "--shard", shard)
+
+    path = output / ".shards" / "shard-00001-of-00002.checkpoint.json"
+    checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    checkpoint["catalog"] = "0:" + "0" * 32
+    path.write_text(json.dumps(checkpoint), encoding="utf-8")
+
+    merge = subprocess.run(
+        [sys.executable, str(MAIN), "--merge-shards", "--output-dir", str(output)],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    assert merge.returncode == 1
+    assert "different catalogs" in merge.stderr
+
+
+def test_undecodable_lines_are_skipped_and_reported(tmp_path):
+    catalog = tmp_path / "catalog.jsonl"
+    rows = _catalog(tmp_path / "full.jsonl").read_text(encoding="utf-8").splitlines()[:40]
+    rows[5:5] = ['{"name": "truncated', "not json at all"]
+    catalog.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    output = tmp_path / "out"
+    for shard in ("0/2", "1/2"):
+        _main("--input", str(catalog), "--output-dir", str(output), "--shard", shard)
+
+    for shard in (0, 1):
+        assert [entry["line"] for entry in _checkpoint(output, shard, 2)["undecodable"]] == [6, 7]
+    merge = _main("--merge-shards", "--output-dir", str(output))
+    assert "Skipped 2 catalog lines that are not valid JSON: 6, 7" in merge.stdout
+    entries = (output / "manifest.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(entries) == len(rows) - 2
@@ -0,0 +1,44 @@
+"""Stream mode: pages for rows read from a slow stdin are emitted without waiting for a full chunk"""
+import json
+import select
+import subprocess
+import sys
+from pathlib import Path
+
+from agents.catalog import Quarantine, validate_chunks
+from agents.data_parser import DataParserAgent
+from main import PRODUCT_DATA
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "main.py"
+
+
+def test_validate_chunks_yields_a_partial_chunk_when_input_stalls(tmp_path):
+    consumed = []
+
+    def rows():
+        for index in range(5):
+            consumed.append(index)
+            yield {**PRODUCT_DATA, "sku": f"S-{index}"}
+
+    quarantine = Quarantine(tmp_path / "quarantine.jsonl")
+    stream = validate_chunks(rows(), DataParserAgent(), 256, quarantine, ready=lambda: len(consumed) % 2 == 1)
+    assert next(stream)[1] == "S-0"
+    assert consumed == [0, 1]
+
+
+def test_stream_from_stdin_emits_each_product_before_input_ends(tmp_path):
+    process = subprocess.Popen(
+        [sys.executable, str(MAIN), "--stream", "--output-dir", str(tmp_path)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=ROOT,
+    )
+    try:
+        for index in range(2):
+            process.stdin.write(json.dumps({**PRODUCT_DATA, "sku": f"S-{index}"}) + "\n")
+            process.stdin.flush()
+            assert select.select([process.stdout], [], [], 30)[0], "no output while stdin stays open"
+            assert json.loads(process.stdout.readline())["id"] == f"S-{index}"
+    finally:
+        process.stdin.close()
+        process.stdout.close()
+        process.wait()